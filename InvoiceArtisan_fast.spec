@@ -0,0 +1,86 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Faster-starting variant of InvoiceArtisan.spec
+#
+# - src is analysed as code (pathex) instead of shipped as data files, so its
+#   modules are bundled as precompiled bytecode rather than compiled from
+#   source on every launch
+# - one-dir build (COLLECT): nothing is unpacked to a temp folder at startup
+# - no UPX: compressed DLLs must be decompressed on every launch
+# - heavy packages the app doesn't use are excluded (NumPy is optional; totals
+#   fall back to Decimal arithmetic without it)
+#
+# Needs PyInstaller 6.6 or newer (Analysis optimize=).
+# Build with:  pyinstaller --clean InvoiceArtisan_fast.spec   (or: python build_exe.py --fast)
+
+import os
+import sys
+
+from PyInstaller.utils.hooks import collect_submodules
+
+sys.path.insert(0, os.path.join(SPECPATH, 'src'))
+
+# core, gui and utils import some of their modules lazily, which analysis can't follow
+hiddenimports = collect_submodules('core') + collect_submodules('gui') + collect_submodules('utils')
+
+a = Analysis(
+    ['scripts\\launch_gui.py'],
+    pathex=['src'],
+    binaries=[],
+    datas=[('assets', 'assets'), ('config', 'config')],
+    hiddenimports=hiddenimports + [
+        'PIL.ImageTk',
+        'dateutil.parser',
+    ],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[
+        'numpy',
+        'pandas',
+        'scipy',
+        'matplotlib',
+        'IPython',
+        'pytest',
+        'setuptools',
+        'pip',
+        'distutils',
+        'lib2to3',
+        'pydoc_data',
+        'test',
+        'tkinter.test',
+    ],
+    noarchive=False,
+    # Strip asserts from the bundled bytecode (docstrings are kept for third-party code)
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='InvoiceArtisan',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['assets\\logos\\MaazLogo.PNG'],
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='InvoiceArtisan',
+)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+PDF extraction benchmark for InvoiceArtisan
+Runs read_pdf and pdf_to_yaml over a synthetic corpus with known contents,
+recording pages/sec, peak memory and field-level precision/recall
+
+Usage:
+    python benchmarks/bench_extraction.py                # 24 invoices across all templates
+    python benchmarks/bench_extraction.py --quick
+    python benchmarks/bench_extraction.py --corpus corpus_dir --count 200
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from harness import (add_common_arguments, finish, peak_memory, quiet, run_metadata,
+                     summarize_times, time_call)
+from corpus import DEFAULT_SEED, MAX_ITEMS, build_corpus, load_corpus
+
+from PyPDF2 import PdfReader
+
+from core.invoice_store import load_yaml
+from core.pdf_reader import read_pdf
+from core.pdf_to_yaml import pdf_to_yaml
+
+DEFAULT_COUNT = 24
+QUICK_COUNT = 6
+
+# Scalar fields scored individually; line items are scored as a whole
+FIELDS = (
+    ('invoice', 'number'), ('invoice', 'date'), ('invoice', 'due_date'),
+    ('company', 'name'), ('company', 'email'),
+    ('client', 'name'), ('client', 'email'),
+    ('tax_rate',), ('notes',), ('terms',),
+)
+
+
+def _lookup(data, path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _normalize(value):
+    """Comparable form of a field value, or None when the field is empty"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return round(float(value), 4)
+    text = ' '.join(str(value).split())
+    return text or None
+
+
+def _item_key(item):
+    # Extraction reports the item name as its description
+    name = item.get('name') or item.get('description')
+    return (_normalize(name), _normalize(item.get('quantity')), _normalize(item.get('rate')))
+
+
+def score_invoice(truth, extracted, counts):
+    """Add one invoice's true/false positives and false negatives to ``counts``.
+
+    A wrong value counts as a false positive and, since the true value was
+    not found, as a false negative too. Items match on name, quantity and rate.
+    """
+    extracted = extracted or {}
+    for path in FIELDS:
+        tally = counts.setdefault('.'.join(path), [0, 0, 0])
+        expected, found = _normalize(_lookup(truth, path)), _normalize(_lookup(extracted, path))
+        if found is None:
+            tally[2] += expected is not None
+        elif found == expected:
+            tally[0] += 1
+        else:
+            tally[1] += 1
+            tally[2] += expected is not None
+
+    expected = Counter(_item_key(item) for item in truth.get('items') or [])
+    found = Counter(_item_key(item) for item in extracted.get('items') or [] if isinstance(item, dict))
+    matched = sum((expected & found).values())
+    tally = counts.setdefault('items', [0, 0, 0])
+    tally[0] += matched
+    tally[1] += sum(found.values()) - matched
+    tally[2] += sum(expected.values()) - matched
+
+
+def precision_recall(counts):
+    """Precision and recall per field plus micro-averaged 'overall' (0 when undefined)"""
+    totals = [sum(tally[i] for tally in counts.values()) for i in range(3)]
+    scores = {}
+    for name, (tp, fp, fn) in list(counts.items()) + [('overall', totals)]:
+        scores[name] = {'precision': tp / (tp + fp) if tp + fp else 0.0,
+                        'recall': tp / (tp + fn) if tp + fn else 0.0}
+    return scores
+
+
+def text_recall(corpus, texts):
+    """Share of ground-truth values that appear verbatim in the raw extracted text"""
+    found = total = 0
+    for (_, truth, _), text in zip(corpus, texts):
+        text = ' '.join(text.split())
+        values = [_lookup(truth, path) for path in FIELDS if isinstance(_lookup(truth, path), str)]
+        values += [item['name'] for item in truth.get('items', [])]
+        for value in values:
+            total += 1
+            found += ' '.join(value.split()) in text
+    return found / total if total else 0.0
+
+
+def read_case(args, corpus, pages):
+    """Benchmark read_pdf over the corpus"""
+    texts = []
+
+    def run():
+        texts.clear()
+        for pdf_path, _, _ in corpus:
+            # read_pdf prints the text instead of returning it
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                read_pdf(str(pdf_path))
+            texts.append(output.getvalue())
+
+    result = summarize_times(time_call(run, args.repeat, args.budget))
+    result['metrics'] = {'pages_per_second': round(pages / result['wall_seconds'], 1)}
+    result['accuracy'] = {'text_recall': round(text_recall(corpus, texts), 4)}
+    if not args.no_memory:
+        result['peak_bytes'] = peak_memory(run)
+    return result
+
+
+def convert_case(args, corpus, pages, output_dir):
+    """Benchmark pdf_to_yaml over the corpus and score what it extracts"""
+    failures = []
+
+    def run():
+        failures.clear()
+        for pdf_path, _, _ in corpus:
+            try:
+                with quiet():
+                    pdf_to_yaml(str(pdf_path), str(Path(output_dir) / f"{pdf_path.stem}.yaml"))
+            except SystemExit:
+                # pdf_to_yaml exits on errors after printing them
+                failures.append(pdf_path)
+
+    result = summarize_times(time_call(run, args.repeat, args.budget))
+
+    counts, by_template = {}, {}
+    for pdf_path, truth, template_id in corpus:
+        output = Path(output_dir) / f"{pdf_path.stem}.yaml"
+        extracted = load_yaml(str(output)) if pdf_path not in failures and output.exists() else None
+        score_invoice(truth, extracted, counts)
+        score_invoice(truth, extracted, by_template.setdefault(template_id, {}))
+
+    scores = precision_recall(counts)
+    result['fields'] = scores
+    result['metrics'] = {'pages_per_second': round(pages / result['wall_seconds'], 1),
+                         'failed': len(failures)}
+    accuracy = {f"{name}.{kind}": round(value, 4)
+                for name, values in scores.items() for kind, value in values.items()}
+    for template_id, template_counts in sorted(by_template.items()):
+        overall = precision_recall(template_counts)['overall']
+        accuracy[f"template/{template_id}.recall"] = round(overall['recall'], 4)
+    result['accuracy'] = accuracy
+    if not args.no_memory:
+        result['peak_bytes'] = peak_memory(run)
+    return result
+
+
+def print_fields(scores):
+    width = max(len(name) for name in scores)
+    print(f"\n  {'Field':<{width}}  {'precision':>9}  {'recall':>7}")
+    for name, values in scores.items():
+        print(f"  {name:<{width}}  {values['precision']:>9.3f}  {values['recall']:>7.3f}")
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction and PDF-to-YAML accuracy")
+    add_common_arguments(parser, 'extraction')
+    parser.add_argument('--quick', action='store_true', help=f"Only {QUICK_COUNT} invoices")
+    parser.add_argument('--count', type=int, help=f"Invoices in the corpus (default: {DEFAULT_COUNT})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--max-items', type=int, default=MAX_ITEMS, help='Most line items per invoice')
+    parser.add_argument('--corpus', help='Keep the corpus in this directory, reusing it if it already exists')
+    parser.add_argument('--budget', type=float, default=60.0,
+                        help='Seconds after which a case stops repeating')
+    args = parser.parse_args(argv)
+    count = args.count or (QUICK_COUNT if args.quick else DEFAULT_COUNT)
+
+    run = run_metadata('extraction')
+    run['corpus'] = {'count': count, 'seed': args.seed, 'max_items': args.max_items}
+    cases = run['cases'] = {}
+    with tempfile.TemporaryDirectory(prefix='invoice_extract_') as work_dir:
+        corpus_dir = Path(args.corpus) if args.corpus else Path(work_dir) / 'corpus'
+        corpus = load_corpus(corpus_dir) if args.corpus else []
+        if len(corpus) != count:
+            print(f"Rendering {count} invoices into {corpus_dir}...", flush=True)
+            corpus = build_corpus(corpus_dir, count, args.seed, args.max_items)
+        pages = sum(len(PdfReader(str(pdf_path)).pages) for pdf_path, _, _ in corpus)
+        run['corpus']['pages'] = pages
+
+        print("Running read_pdf...", flush=True)
+        cases['read_pdf'] = read_case(args, corpus, pages)
+        print("Running pdf_to_yaml...", flush=True)
+        output_dir = Path(work_dir) / 'yaml'
+        output_dir.mkdir()
+        cases['pdf_to_yaml'] = convert_case(args, corpus, pages, output_dir)
+
+    print_fields(cases['pdf_to_yaml']['fields'])
+    return finish(args, run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
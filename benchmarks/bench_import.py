@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Line-item import benchmark for InvoiceArtisan
+Measures import_pasted_items and import_item_file over generated timesheets
+of increasing size, recording wall time, rows/sec and peak memory
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --quick
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from harness import (add_common_arguments, finish, peak_memory, run_metadata,
+                     summarize_times, time_call)
+
+from core.item_import import import_item_file, import_pasted_items
+
+ROW_COUNTS = (1000, 10000, 100000)
+QUICK_ROW_COUNTS = (1000, 10000)
+CHUNK_SIZE = 2500
+
+
+def make_rows(count, delimiter='\t'):
+    """Timesheet text with a header row and `count` item rows"""
+    lines = [delimiter.join(('Name', 'Description', 'Quantity', 'Rate'))]
+    lines += [delimiter.join((f"Dev {i % 50}", 'Sprint work', str(i % 8 + 1), '85.50')) for i in range(count)]
+    return "\n".join(lines)
+
+
+def import_case(args, count, load):
+    """Benchmark one import of `count` rows; `load` returns an ImportResult"""
+    def run():
+        result = load()
+        if len(result.items) != count or result.errors:
+            raise RuntimeError(f"imported {len(result.items)} of {count} rows, {len(result.errors)} errors")
+
+    result = summarize_times(time_call(run, args.repeat, args.budget))
+    result['metrics'] = {'rows_per_second': round(count / result['wall_seconds'])}
+    if not args.no_memory:
+        result['peak_bytes'] = peak_memory(run)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bulk line-item import")
+    add_common_arguments(parser, 'import')
+    parser.add_argument('--quick', action='store_true', help=f"Only row counts {QUICK_ROW_COUNTS}")
+    parser.add_argument('--rows', type=int, nargs='+', help='Row counts to benchmark')
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help='Seconds after which a case stops repeating')
+    args = parser.parse_args(argv)
+
+    row_counts = args.rows or (QUICK_ROW_COUNTS if args.quick else ROW_COUNTS)
+
+    run = run_metadata('import')
+    cases = run['cases'] = {}
+    with tempfile.TemporaryDirectory(prefix='invoice_import_') as work_dir:
+        for count in row_counts:
+            text = make_rows(count)
+            print(f"Running paste/{count}...", flush=True)
+            cases[f"paste/{count}"] = import_case(
+                args, count, lambda: import_pasted_items(text, chunk_size=CHUNK_SIZE))
+
+            path = Path(work_dir) / f"items_{count}.csv"
+            path.write_text(make_rows(count, ','), encoding='utf-8')
+            print(f"Running csv/{count}...", flush=True)
+            cases[f"csv/{count}"] = import_case(
+                args, count, lambda: import_item_file(path, chunk_size=CHUNK_SIZE))
+
+    print()
+    return finish(args, run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
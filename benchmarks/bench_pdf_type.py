@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+PDF type detection benchmark for InvoiceArtisan
+Classifies digital invoices and image-only (scanned) copies of them with
+each detection strategy of scripts/check_pdf_type.py, recording pages/sec
+and a confusion matrix
+
+Usage:
+    python benchmarks/bench_pdf_type.py
+    python benchmarks/bench_pdf_type.py --quick --dpi 150
+"""
+
+import argparse
+import importlib.util
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+from harness import (PROJECT_ROOT, add_common_arguments, finish, peak_memory, run_metadata,
+                     summarize_times, time_call)
+
+DEFAULT_COUNT = 12
+QUICK_COUNT = 4
+DEFAULT_DPI = 100
+
+DIGITAL = 'Digital'
+SCANNED = 'Scanned'
+ERROR = 'Error'
+
+
+def rasterize(pdf_path, output_path, dpi=DEFAULT_DPI):
+    """Image-only copy of a PDF, like a scan: each page becomes one embedded bitmap"""
+    import fitz
+    with fitz.open(str(pdf_path)) as doc, fitz.open() as scanned:
+        for page in doc:
+            pixmap = page.get_pixmap(dpi=dpi)
+            copy = scanned.new_page(width=page.rect.width, height=page.rect.height)
+            copy.insert_image(copy.rect, pixmap=pixmap)
+        scanned.save(str(output_path))
+
+
+def load_checker():
+    """scripts/check_pdf_type.py as a module (it warns on import, which is noise here)"""
+    sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        import check_pdf_type
+    return check_pdf_type
+
+
+def strategies(checker):
+    """Detection strategies by name: callables taking a processor and returning a PDF type"""
+    import fitz
+    from PyPDF2 import PdfReader
+
+    def pymupdf_text(processor):
+        # Text quality alone, skipping the block and image layout passes
+        with fitz.open(processor.pdf_options.file_path) as doc:
+            return processor.classify([processor.text_score(page.get_text("text").strip()) for page in doc])
+
+    def pypdf2_text(processor):
+        reader = PdfReader(processor.pdf_options.file_path)
+        return processor.classify([processor.text_score((page.extract_text() or '').strip())
+                                   for page in reader.pages])
+
+    found = {
+        'pymupdf': lambda processor: processor.detect_pdf_type(),
+        'pymupdf_text': pymupdf_text,
+        'pypdf2_text': pypdf2_text,
+    }
+    if checker.PDFPLUMBER_AVAILABLE:
+        found['pdfplumber'] = lambda processor: processor.classify(processor.pdfplumber_page_scores())
+    return found
+
+
+def confusion_matrix(labels, predictions):
+    """Counts keyed 'actual->predicted'"""
+    matrix = {}
+    for actual, predicted in zip(labels, predictions):
+        key = f"{actual}->{predicted}"
+        matrix[key] = matrix.get(key, 0) + 1
+    return matrix
+
+
+def scores(labels, predictions):
+    """Overall accuracy and per-class recall and precision"""
+    result = {'accuracy': sum(a == p for a, p in zip(labels, predictions)) / len(labels) if labels else 0.0}
+    for kind in (DIGITAL, SCANNED):
+        actual = [p for a, p in zip(labels, predictions) if a == kind]
+        predicted = [a for a, p in zip(labels, predictions) if p == kind]
+        result[f"{kind.lower()}.recall"] = actual.count(kind) / len(actual) if actual else 0.0
+        result[f"{kind.lower()}.precision"] = predicted.count(kind) / len(predicted) if predicted else 0.0
+    return {name: round(value, 4) for name, value in result.items()}
+
+
+def strategy_case(args, checker, detect, samples, pages):
+    """Benchmark one detection strategy over every sample"""
+    predictions = []
+
+    def run():
+        predictions.clear()
+        for path, _ in samples:
+            processor = checker.CheckPdfTypeProcessor(checker.CheckPdfTypeOptions(str(path)))
+            try:
+                predictions.append(detect(processor))
+            except Exception:
+                predictions.append(ERROR)
+
+    result = summarize_times(time_call(run, args.repeat, args.budget))
+    labels = [label for _, label in samples]
+    result['confusion'] = confusion_matrix(labels, predictions)
+    result['accuracy'] = scores(labels, predictions)
+    result['metrics'] = {'pages_per_second': round(pages / result['wall_seconds'], 1),
+                         'accuracy': result['accuracy']['accuracy']}
+    if not args.no_memory:
+        result['peak_bytes'] = peak_memory(run)
+    return result
+
+
+def print_confusion(cases):
+    classes = (DIGITAL, SCANNED, ERROR)
+    for name, result in cases.items():
+        matrix = result['confusion']
+        print(f"\n  {name}: actual \\ predicted")
+        print("  " + " " * 10 + "".join(f"{kind:>10}" for kind in classes))
+        for actual in (DIGITAL, SCANNED):
+            print(f"  {actual:<10}" + "".join(f"{matrix.get(f'{actual}->{kind}', 0):>10}" for kind in classes))
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark digital/scanned PDF type detection")
+    add_common_arguments(parser, 'pdf_type')
+    parser.add_argument('--quick', action='store_true', help=f"Only {QUICK_COUNT} invoices of each kind")
+    parser.add_argument('--count', type=int, help=f"Invoices of each kind (default: {DEFAULT_COUNT})")
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI, help='Resolution of the scanned copies')
+    parser.add_argument('--strategies', nargs='+', help='Strategies to run (default: all available)')
+    parser.add_argument('--budget', type=float, default=60.0,
+                        help='Seconds after which a case stops repeating')
+    args = parser.parse_args(argv)
+
+    if not importlib.util.find_spec('fitz'):
+        print("PyMuPDF is required for this benchmark (pip install pymupdf)")
+        return 1
+    import fitz
+    from corpus import build_corpus
+
+    checker = load_checker()
+    available = strategies(checker)
+    selected = args.strategies or list(available)
+    unknown = set(selected) - set(available)
+    if unknown:
+        parser.error(f"unknown or unavailable strategies: {', '.join(sorted(unknown))}")
+    count = args.count or (QUICK_COUNT if args.quick else DEFAULT_COUNT)
+
+    run = run_metadata('pdf_type')
+    run['dataset'] = {'per_kind': count, 'dpi': args.dpi}
+    cases = run['cases'] = {}
+    with tempfile.TemporaryDirectory(prefix='invoice_pdf_type_') as work_dir:
+        print(f"Rendering {count} digital invoices and scanned copies...", flush=True)
+        samples = []
+        for pdf_path, _, _ in build_corpus(Path(work_dir) / 'digital', count):
+            scanned_path = Path(work_dir) / f"{pdf_path.stem}_scanned.pdf"
+            rasterize(pdf_path, scanned_path, args.dpi)
+            samples += [(pdf_path, DIGITAL), (scanned_path, SCANNED)]
+        pages = 0
+        for path, _ in samples:
+            with fitz.open(str(path)) as doc:
+                pages += doc.page_count
+        run['dataset']['pages'] = pages
+
+        for name in selected:
+            print(f"Running {name}...", flush=True)
+            cases[f"strategy/{name}"] = strategy_case(args, checker, available[name], samples, pages)
+
+    print_confusion(cases)
+    return finish(args, run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Invoice rendering benchmark for InvoiceArtisan
+Measures generate_invoice across item counts, templates, notes/terms sizes
+and batch worker counts, recording wall time, per-phase time and peak memory
+
+Usage:
+    python benchmarks/bench_render.py               # full suite
+    python benchmarks/bench_render.py --quick       # small sizes, for quick checks
+    python benchmarks/bench_render.py --save-baseline
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from harness import (add_common_arguments, finish, peak_memory, quiet, run_metadata,
+                     summarize_times, time_call)
+
+from core.batch import BatchJob, run_batch
+from core.invoice_generator import generate_invoice
+from utils.file_utils import write_yaml_atomic
+from utils.instrumentation import MemorySink, collecting
+from utils.template_manager import get_template_manager
+
+ITEM_COUNTS = (1, 100, 10000, 100000)
+QUICK_ITEM_COUNTS = (1, 100, 1000)
+TEXT_SIZES = {'none': 0, 'short': 1, 'long': 200}
+BATCH_INVOICES = 16
+BATCH_ITEMS = 50
+DEFAULT_TEMPLATE = 'modern_blue'
+
+NOTES_PARAGRAPH = "Thank you for your business. Please reference the invoice number with your payment."
+TERMS_PARAGRAPH = "Payment is due within 30 days of the invoice date. Late payments may incur additional charges."
+
+
+def make_invoice(item_count, text_size=1):
+    """Sample invoice with ``item_count`` items and notes/terms of ``text_size`` paragraphs"""
+    data = get_template_manager().get_template_preview_data()
+    data['items'] = [
+        {'name': f"Service {i % 40}", 'description': "Development and consulting hours",
+         'quantity': float(i % 8 + 1), 'rate': 85.5 + i % 7}
+        for i in range(item_count)
+    ]
+    data['notes'] = "\n".join([NOTES_PARAGRAPH] * text_size)
+    data['terms'] = "\n".join([TERMS_PARAGRAPH] * text_size)
+    return data
+
+
+def render_case(args, data, template_id, output_dir):
+    """Benchmark one generate_invoice configuration"""
+    output_pdf = os.path.join(output_dir, 'invoice.pdf')
+
+    def render():
+        # generate_invoice reports validation and success on stdout
+        with quiet():
+            generate_invoice(data, output_pdf, template_id)
+
+    with collecting(MemorySink()) as spans:
+        result = summarize_times(time_call(render, args.repeat, args.budget))
+    result['phases'] = {name.split('.', 1)[1]: stats['p50'] for name, stats in spans.summary().items()
+                        if '.' in name}
+    result['metrics'] = {'pdf_kb': round(os.path.getsize(output_pdf) / 1024, 1)}
+    if not args.no_memory:
+        result['peak_bytes'] = peak_memory(render)
+    return result
+
+
+def batch_case(args, paths, workers, output_dir):
+    """Benchmark batch generation of the same invoice files with a given worker count"""
+    phases = []
+
+    def run():
+        jobs = [BatchJob(path, os.path.join(output_dir, f"{Path(path).stem}.pdf"), DEFAULT_TEMPLATE)
+                for path in paths]
+        with quiet():
+            stats = run_batch(jobs, max_workers=workers, collect_spans=True)
+        if stats['failed']:
+            raise RuntimeError(f"{stats['failed']} invoices failed to generate")
+        phases.append(stats['phases'])
+
+    result = summarize_times(time_call(run, args.repeat, args.budget))
+    result['metrics'] = {'invoices_per_second': round(len(paths) / result['wall_seconds'], 2)}
+    # Per-invoice phase percentiles from the last run, as seen inside the workers
+    result['phase_percentiles'] = phases[-1]
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark invoice PDF rendering")
+    add_common_arguments(parser, 'render')
+    parser.add_argument('--quick', action='store_true',
+                        help=f"Only item counts {QUICK_ITEM_COUNTS}, one text size and 1-2 workers")
+    parser.add_argument('--items', type=int, nargs='+', help='Item counts to benchmark')
+    parser.add_argument('--workers', type=int, nargs='+', help='Batch worker counts to benchmark')
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help='Seconds after which a case stops repeating')
+    parser.add_argument('--skip', nargs='+', default=[], choices=['items', 'templates', 'text', 'workers'],
+                        help='Sweeps to leave out')
+    args = parser.parse_args(argv)
+
+    item_counts = args.items or (QUICK_ITEM_COUNTS if args.quick else ITEM_COUNTS)
+    cpu_count = os.cpu_count() or 1
+    workers = args.workers or sorted({1, 2} if args.quick else {1, 2, 4, cpu_count})
+    text_sizes = {'short': 1} if args.quick else TEXT_SIZES
+    templates = list(get_template_manager().templates)
+
+    run = run_metadata('render')
+    cases = run['cases'] = {}
+    with tempfile.TemporaryDirectory(prefix='invoice_bench_') as output_dir:
+        def record(name, measure):
+            print(f"Running {name}...", flush=True)
+            cases[name] = measure()
+
+        if 'items' not in args.skip:
+            for count in item_counts:
+                record(f"items/{count}", lambda: render_case(args, make_invoice(count), DEFAULT_TEMPLATE, output_dir))
+
+        if 'templates' not in args.skip:
+            data = make_invoice(100)
+            for template_id in templates:
+                record(f"template/{template_id}", lambda: render_case(args, data, template_id, output_dir))
+
+        if 'text' not in args.skip:
+            for label, paragraphs in text_sizes.items():
+                record(f"notes_terms/{label}",
+                       lambda: render_case(args, make_invoice(100, paragraphs), DEFAULT_TEMPLATE, output_dir))
+
+        if 'workers' not in args.skip:
+            data = make_invoice(BATCH_ITEMS)
+            paths = []
+            for i in range(BATCH_INVOICES):
+                data['invoice']['number'] = f"BENCH-{i:03d}"
+                path = os.path.join(output_dir, f"invoice_{i:03d}.yaml")
+                write_yaml_atomic(path, data)
+                paths.append(path)
+            for count in workers:
+                record(f"workers/{count}", lambda: batch_case(args, paths, count, output_dir))
+
+    print()
+    return finish(args, run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for InvoiceArtisan
+Measures import time of the main modules and time to first window, for the
+development layout and for frozen (PyInstaller) executables
+
+Each measurement runs in a fresh process. The "sources" layout imports a
+copy of src without bytecode caches, as the one-file build does when it
+ships src as data files; "bytecode" is a normal development run with warm
+__pycache__ directories.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --frozen dist/InvoiceArtisan.exe dist/InvoiceArtisan/InvoiceArtisan.exe
+"""
+
+import argparse
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from harness import PROJECT_ROOT, add_common_arguments, finish, run_metadata, summarize_times
+
+MODULES = ('core.invoice_generator', 'gui.main_window')
+TOP_IMPORTS = 15
+WINDOW_TIMEOUT = 60
+
+FIRST_PAINT = re.compile(r'time to first paint: ([\d.]+) ms')
+
+
+def timed_run(command, env=None, timeout=WINDOW_TIMEOUT):
+    """Run a command to completion; returns (seconds, CompletedProcess)"""
+    start = time.perf_counter()
+    completed = subprocess.run(command, env=env, capture_output=True, text=True, timeout=timeout)
+    return time.perf_counter() - start, completed
+
+
+def python_env(src_dir):
+    env = dict(os.environ, PYTHONPATH=str(src_dir))
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    return env
+
+
+def parse_importtime(stderr, limit=TOP_IMPORTS):
+    """Slowest imports by self time from ``python -X importtime`` output, in ms"""
+    imports = []
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)', line)
+        if match:
+            imports.append((match.group(4), int(match.group(1)) / 1000, int(match.group(2)) / 1000))
+    imports.sort(key=lambda entry: entry[1], reverse=True)
+    return [{'module': name, 'self_ms': self_ms, 'cumulative_ms': cumulative_ms}
+            for name, self_ms, cumulative_ms in imports[:limit]]
+
+
+def import_case(args, module, src_dir, cold):
+    """Time ``import module`` in fresh interpreters, net of bare interpreter startup"""
+    env = python_env(src_dir)
+    flags = ['-B'] if cold else []
+    baseline, imports = [], []
+    for _ in range(max(1, args.repeat)):
+        seconds, _ = timed_run([sys.executable, *flags, '-c', 'pass'], env)
+        baseline.append(seconds)
+        seconds, completed = timed_run([sys.executable, *flags, '-c', f'import {module}'], env)
+        if completed.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+        imports.append(seconds)
+    result = summarize_times(imports)
+    result['metrics'] = {'interpreter_ms': round(min(baseline) * 1000, 1),
+                         'import_ms': round((result['wall_seconds'] - min(baseline)) * 1000, 1)}
+    if not cold:
+        _, completed = timed_run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], env)
+        result['top_imports'] = parse_importtime(completed.stderr)
+    return result
+
+
+def window_case(args, command, env=None):
+    """Time launching the GUI until its first window has painted and closed.
+
+    Returns None when no window can be opened here (e.g. no display).
+    """
+    times, first_paint = [], []
+    for _ in range(max(1, args.repeat)):
+        try:
+            seconds, completed = timed_run(command + ['--profile-startup', '--exit-after-startup'], env)
+        except subprocess.TimeoutExpired:
+            return None
+        if completed.returncode != 0:
+            return None
+        times.append(seconds)
+        match = FIRST_PAINT.search(completed.stderr)
+        if match:
+            first_paint.append(float(match.group(1)))
+    result = summarize_times(times)
+    if first_paint:
+        # Measured inside the launcher; excludes interpreter start and (frozen) unpacking
+        result['metrics'] = {'first_paint_ms': sorted(first_paint)[len(first_paint) // 2]}
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark import time and time to first window")
+    add_common_arguments(parser, 'startup')
+    parser.add_argument('--modules', nargs='+', default=list(MODULES), help='Modules whose import is timed')
+    parser.add_argument('--frozen', nargs='+', default=[], metavar='EXE',
+                        help='Frozen executables to time to first window (built with InvoiceArtisan*.spec)')
+    parser.add_argument('--no-window', action='store_true', help='Skip the time-to-first-window cases')
+    args = parser.parse_args(argv)
+    # Startup is measured in separate processes; tracemalloc can't see them
+    args.no_memory = True
+
+    run = run_metadata('startup')
+    cases = run['cases'] = {}
+    src_dir = PROJECT_ROOT / 'src'
+    with tempfile.TemporaryDirectory(prefix='invoice_startup_') as work_dir:
+        # Source-only copy: with -B nothing gets cached, so every run compiles src again
+        sources_dir = Path(work_dir) / 'src'
+        shutil.copytree(src_dir, sources_dir, ignore=shutil.ignore_patterns('__pycache__'))
+        # Warm the development bytecode caches first
+        subprocess.run([sys.executable, '-c', '; '.join(f'import {m}' for m in args.modules)],
+                       env=python_env(src_dir), capture_output=True)
+
+        for module in args.modules:
+            for layout, directory, cold in (('bytecode', src_dir, False), ('sources', sources_dir, True)):
+                name = f"import/{module}/{layout}"
+                print(f"Running {name}...", flush=True)
+                cases[name] = import_case(args, module, directory, cold)
+
+    if not args.no_window:
+        launchers = [('window/dev', [sys.executable, str(PROJECT_ROOT / 'scripts' / 'launch_gui.py')])]
+        launchers += [(f"window/frozen/{Path(exe).parent.name}/{Path(exe).name}", [str(Path(exe).resolve())])
+                      for exe in args.frozen]
+        for name, command in launchers:
+            print(f"Running {name}...", flush=True)
+            result = window_case(args, command)
+            if result is None:
+                print(f"  Skipped {name}: the window could not be opened (no display?)")
+            else:
+                cases[name] = result
+
+    for name, result in cases.items():
+        if result.get('top_imports'):
+            print(f"\nSlowest imports for {name} (self ms):")
+            for entry in result['top_imports'][:5]:
+                print(f"  {entry['module']:<40} {entry['self_ms']:>8.1f}")
+    print()
+    return finish(args, run)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
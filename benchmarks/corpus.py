@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Synthetic invoice corpus for the InvoiceArtisan extraction benchmarks
+Renders seeded random invoices through generate_invoice across every
+template and keeps each one's data as ground truth next to its PDF
+
+Usage:
+    python benchmarks/corpus.py corpus_dir --count 50
+"""
+
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from harness import quiet
+
+from core.invoice_generator import generate_invoice
+from core.invoice_store import load_yaml
+from utils.file_utils import write_yaml_atomic
+from utils.template_manager import get_template_manager
+
+DEFAULT_SEED = 1234
+MAX_ITEMS = 40
+
+COMPANIES = ["Northwind Traders", "Blue Harbor Labs", "Quantum Ledger LLC", "Oakridge Design Studio",
+             "Meridian Analytics", "Copperleaf Consulting"]
+CLIENTS = ["Astera Software", "Globex Corporation", "Initech Systems", "Umbrella Health",
+           "Stark Logistics", "Wayne Media Group", "Acme Robotics"]
+STREETS = ["Market Street", "Harbor Road", "Maple Avenue", "Westlake Blvd", "King Street"]
+CITIES = [("Springfield", "IL", "62701"), ("Westlake Village", "CA", "91362"),
+          ("Austin", "TX", "73301"), ("Portland", "OR", "97201")]
+SERVICES = ["IT Enabled Services", "Software Development", "Code Review", "Cloud Hosting",
+            "Data Migration", "UX Research", "Technical Writing", "Support Retainer"]
+DETAILS = ["Monthly engagement", "Sprint deliverables", "Hours as per timesheet",
+           "Fixed scope work", ""]
+NOTES = ["Thank you for your business!", "Please include the invoice number with your payment.",
+         "Questions about this invoice? Reply to the billing address above."]
+TERMS = ["Payment due within 30 days.", "Net 15. Late payments incur a 1.5% monthly charge.",
+         "Payment by bank transfer only."]
+
+
+def _party(rng, name):
+    city, state, zip_code = rng.choice(CITIES)
+    domain = name.lower().split()[0]
+    return {
+        'name': name,
+        'address': f"{rng.randint(10, 999)} {rng.choice(STREETS)}",
+        'city': city,
+        'state': state,
+        'zip': zip_code,
+        'country': 'United States',
+        'email': f"billing@{domain}.com",
+        'phone': f"+1-555-{rng.randint(1000, 9999)}",
+    }
+
+
+def make_invoice_data(rng, index, max_items=MAX_ITEMS):
+    """One random invoice; every field is known, so extraction can be scored against it"""
+    issued = date(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+    return {
+        'invoice': {
+            'number': f"INV-{1000 + index}",
+            'date': issued.isoformat(),
+            'due_date': (issued + timedelta(days=rng.choice([15, 30, 45]))).isoformat(),
+            'month': issued.strftime('%B'),
+        },
+        'company': _party(rng, rng.choice(COMPANIES)),
+        'client': _party(rng, rng.choice(CLIENTS)),
+        'items': [
+            {'name': rng.choice(SERVICES), 'description': rng.choice(DETAILS),
+             'quantity': float(rng.randint(1, 40)), 'rate': round(rng.uniform(20, 2500), 2)}
+            for _ in range(rng.randint(1, max_items))
+        ],
+        'tax_rate': rng.choice([0.0, 0.05, 0.08, 0.1]),
+        'notes': rng.choice(NOTES),
+        'terms': rng.choice(TERMS),
+    }
+
+
+def build_corpus(directory, count, seed=DEFAULT_SEED, max_items=MAX_ITEMS, templates=None):
+    """Render ``count`` invoices into ``directory`` as NNNN.pdf plus NNNN.yaml ground truth.
+
+    Templates are used in turn, so every template is covered once ``count``
+    reaches the number of templates.
+
+    Returns:
+        List of (pdf path, ground truth dict, template id)
+    """
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    templates = templates or list(get_template_manager().templates)
+    corpus = []
+    for index in range(count):
+        template_id = templates[index % len(templates)]
+        data = make_invoice_data(rng, index, max_items)
+        pdf_path = directory / f"{index:04d}.pdf"
+        write_yaml_atomic(str(pdf_path.with_suffix('.yaml')), dict(data, template=template_id))
+        with quiet():
+            generate_invoice(data, str(pdf_path), template_id)
+        corpus.append((pdf_path, data, template_id))
+    return corpus
+
+
+def load_corpus(directory):
+    """Corpus previously written by build_corpus"""
+    corpus = []
+    for truth_path in sorted(Path(directory).glob('*.yaml')):
+        pdf_path = truth_path.with_suffix('.pdf')
+        if pdf_path.exists():
+            data = load_yaml(str(truth_path))
+            corpus.append((pdf_path, data, data.pop('template', None)))
+    return corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic invoice corpus with ground truth")
+    parser.add_argument('directory', help='Where to write the PDFs and ground-truth YAML files')
+    parser.add_argument('--count', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--max-items', type=int, default=MAX_ITEMS)
+    args = parser.parse_args(argv)
+    corpus = build_corpus(args.directory, args.count, args.seed, args.max_items)
+    print(f"Wrote {len(corpus)} invoices to {args.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
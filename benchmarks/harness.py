@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the InvoiceArtisan benchmark scripts
+Timing and peak-memory measurement, a JSON run history and baseline
+regression checks
+"""
+
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCHMARKS_DIR.parent
+RESULTS_DIR = BENCHMARKS_DIR / 'results'
+BASELINES_DIR = BENCHMARKS_DIR / 'baselines'
+
+sys.path.insert(0, str(PROJECT_ROOT / 'src'))
+
+from utils.file_utils import write_atomic
+
+# Runs kept in each history file
+HISTORY_LIMIT = 200
+
+# Default regression thresholds: relative slowdown / growth, and an absolute
+# floor in seconds below which timing differences are treated as noise
+TIME_TOLERANCE = 0.15
+MEMORY_TOLERANCE = 0.10
+MIN_SECONDS = 0.005
+# Absolute drop allowed in accuracy scores (precision, recall, ...) in [0, 1]
+ACCURACY_TOLERANCE = 0.01
+
+
+def run_metadata(suite):
+    """Describe the machine and source revision a run was made on"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'suite': suite,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    """Discard stdout while benchmarking, including output from worker processes"""
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    try:
+        with open(os.devnull, 'w') as devnull:
+            os.dup2(devnull.fileno(), 1)
+            with contextlib.redirect_stdout(devnull):
+                yield
+    finally:
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+
+
+def time_call(func, repeat=3, budget_seconds=30.0):
+    """Call ``func`` up to ``repeat`` times and return the wall time of each call.
+
+    Stops early once ``budget_seconds`` have been spent, so very slow cases
+    run once instead of ``repeat`` times.
+    """
+    times = []
+    started = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        if time.perf_counter() - started >= budget_seconds:
+            break
+    return times
+
+
+def peak_memory(func):
+    """Peak bytes allocated by Python while running ``func`` (in its own run; tracing slows it down)"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def summarize_times(times):
+    return {
+        'wall_seconds': statistics.median(times),
+        'wall_min': min(times),
+        'runs': len(times),
+    }
+
+
+def load_json(path, default=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    write_atomic(path, lambda file: json.dump(data, file, indent=2, sort_keys=True))
+
+
+def append_history(path, run, limit=HISTORY_LIMIT):
+    """Append a run to a JSON history file, keeping the newest ``limit`` runs"""
+    history = load_json(path, [])
+    if not isinstance(history, list):
+        history = []
+    history.append(run)
+    write_json(path, history[-limit:])
+
+
+def find_regressions(cases, baseline_cases, time_tolerance=TIME_TOLERANCE,
+                     memory_tolerance=MEMORY_TOLERANCE, min_seconds=MIN_SECONDS,
+                     accuracy_tolerance=ACCURACY_TOLERANCE):
+    """Compare case results with a baseline run.
+
+    A case regresses when its median wall time grows by more than
+    ``time_tolerance`` (and by at least ``min_seconds``), its peak memory
+    grows by more than ``memory_tolerance``, or any of its ``accuracy``
+    scores drops by more than ``accuracy_tolerance``. Cases missing from
+    either side are skipped.
+
+    Returns:
+        List of human-readable regression descriptions
+    """
+    regressions = []
+    for name, result in cases.items():
+        base = baseline_cases.get(name)
+        if not base:
+            continue
+        now, before = result.get('wall_seconds'), base.get('wall_seconds')
+        if now is not None and before:
+            if now > before * (1 + time_tolerance) and now - before >= min_seconds:
+                regressions.append(f"{name}: wall time {before * 1000:.1f} ms -> {now * 1000:.1f} ms "
+                                   f"(+{(now / before - 1) * 100:.0f}%)")
+        now, before = result.get('peak_bytes'), base.get('peak_bytes')
+        if now is not None and before:
+            if now > before * (1 + memory_tolerance):
+                regressions.append(f"{name}: peak memory {before / 1e6:.1f} MB -> {now / 1e6:.1f} MB "
+                                   f"(+{(now / before - 1) * 100:.0f}%)")
+        for score, before in base.get('accuracy', {}).items():
+            now = result.get('accuracy', {}).get(score)
+            if now is not None and now < before - accuracy_tolerance:
+                regressions.append(f"{name}: {score} {before:.3f} -> {now:.3f}")
+    return regressions
+
+
+def print_cases(cases):
+    """Print one line per case with wall time, peak memory and any extra metrics"""
+    width = max((len(name) for name in cases), default=10)
+    for name, result in cases.items():
+        line = f"  {name:<{width}}  {result['wall_seconds'] * 1000:>10.1f} ms"
+        if result.get('peak_bytes') is not None:
+            line += f"  {result['peak_bytes'] / 1e6:>8.1f} MB"
+        for key, value in result.get('metrics', {}).items():
+            line += f"  {key}={value:.3g}" if isinstance(value, float) else f"  {key}={value}"
+        print(line)
+
+
+def add_common_arguments(parser, suite):
+    """Arguments shared by every benchmark script"""
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (median is reported)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the peak-memory run of each case')
+    parser.add_argument('--history', default=str(RESULTS_DIR / f'{suite}_history.json'),
+                        help='JSON file the run is appended to')
+    parser.add_argument('--baseline', default=str(BASELINES_DIR / f'{suite}.json'),
+                        help='Baseline run to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE,
+                        help='Allowed relative wall-time growth before a case counts as a regression')
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE,
+                        help='Allowed relative peak-memory growth before a case counts as a regression')
+    parser.add_argument('--accuracy-tolerance', type=float, default=ACCURACY_TOLERANCE,
+                        help='Allowed absolute drop in accuracy scores before a case counts as a regression')
+
+
+def finish(args, run):
+    """Record a run, compare it with the baseline and return the process exit code"""
+    print_cases(run['cases'])
+    append_history(args.history, run)
+    print(f"\nAppended run to {args.history}")
+
+    exit_code = 0
+    baseline = load_json(args.baseline)
+    if baseline:
+        regressions = find_regressions(run['cases'], baseline.get('cases', {}),
+                                       args.time_tolerance, args.memory_tolerance,
+                                       accuracy_tolerance=args.accuracy_tolerance)
+        if regressions:
+            print(f"\nRegressions against baseline {baseline.get('commit') or args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            exit_code = 1
+        else:
+            print(f"No regressions against baseline {baseline.get('commit') or args.baseline}")
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+
+    if args.save_baseline:
+        write_json(args.baseline, run)
+        print(f"Saved baseline to {args.baseline}")
+    return exit_code
@@ -11,6 +11,11 @@ import subprocess
 import shutil
 from pathlib import Path
 
+# Spec for the one-dir build that ships precompiled modules (see the spec's header)
+FAST_SPEC = "InvoiceArtisan_fast.spec"
+# Analysis(optimize=...) in the fast spec was added in PyInstaller 6.6
+FAST_SPEC_MIN_PYINSTALLER = (6, 6)
+
 def check_dependencies():
     """Check if required packages are installed"""
     print("Checking dependencies...")
@@ -77,19 +82,28 @@ def clean_build_dirs():
             except Exception as e:
                 print(f"⚠️  Warning: Could not remove {cache_dir}: {e}")
 
-def build_executable(debug=False):
+def build_executable(debug=False, fast=False):
     """Build the executable using PyInstaller"""
     print("\n🔨 Building InvoiceArtisan executable...")
     if debug:
         print("🔍 Debug mode: Console will be enabled to see errors")
     
     # Check if spec file exists
-    spec_file = Path("InvoiceArtisan.spec")
+    spec_file = Path(FAST_SPEC if fast else "InvoiceArtisan.spec")
     if not spec_file.exists():
-        print("❌ InvoiceArtisan.spec not found!")
-        print("   Please ensure InvoiceArtisan.spec exists in the root directory")
+        print(f"❌ {spec_file} not found!")
+        print(f"   Please ensure {spec_file} exists in the root directory")
         return False
     
+    if fast:
+        import PyInstaller
+        version = tuple(int(part) for part in PyInstaller.__version__.split('.')[:2] if part.isdigit())
+        if version < FAST_SPEC_MIN_PYINSTALLER:
+            print(f"❌ {spec_file} needs PyInstaller {'.'.join(map(str, FAST_SPEC_MIN_PYINSTALLER))} or newer "
+                  f"(found {PyInstaller.__version__})")
+            print("   Please run: pip install --upgrade pyinstaller")
+            return False
+    
     print(f"📋 Using spec file: {spec_file}")
     
     # For debug builds, temporarily modify console setting
@@ -100,7 +114,7 @@ def build_executable(debug=False):
         
         # Temporarily enable console
         modified_spec = spec_content.replace('console=False', 'console=True')
-        debug_spec = spec_file.parent / "InvoiceArtisan_debug.spec"
+        debug_spec = spec_file.parent / f"{spec_file.stem}_debug.spec"
         with open(debug_spec, 'w', encoding='utf-8') as f:
             f.write(modified_spec)
         build_spec = debug_spec
@@ -126,10 +140,13 @@ def build_executable(debug=False):
         print("❌ Build failed!")
         return False
 
-def verify_build():
+def verify_build(fast=False):
     """Verify the build output"""
     print("\nVerifying build output...")
     dist_dir = Path("dist")
+    if fast:
+        # One-dir build: the executable sits next to its libraries
+        dist_dir = dist_dir / "InvoiceArtisan"
     exe_path = dist_dir / "InvoiceArtisan.exe"
     
     if exe_path.exists():
@@ -201,6 +218,8 @@ def main():
     
     # Check for debug flag
     debug_mode = '--debug' in sys.argv or '-d' in sys.argv
+    # Faster-starting one-dir build with precompiled modules
+    fast_mode = '--fast' in sys.argv
     
     # Check dependencies
     if not check_dependencies():
@@ -211,16 +230,17 @@ def main():
     clean_build_dirs()
     
     # Build executable
-    if build_executable(debug=debug_mode):
+    if build_executable(debug=debug_mode, fast=fast_mode):
         # Verify build
-        if verify_build():
+        if verify_build(fast=fast_mode):
             # Create installation info
             create_installer_info()
             
             print("\n" + "=" * 50)
             print("🎉 Build completed successfully!")
             print("=" * 50)
-            exe_path = os.path.abspath('dist/InvoiceArtisan.exe')
+            exe_path = os.path.abspath('dist/InvoiceArtisan/InvoiceArtisan.exe' if fast_mode
+                                       else 'dist/InvoiceArtisan.exe')
             print(f"📁 Executable location: {exe_path}")
             print("\n📋 Next steps:")
             print("1. Test the executable by double-clicking it")
@@ -25,6 +25,15 @@ class CheckPdfTypeProcessor:
         DIGITAL = "Digital"
         SCANNED = "Scanned"
 
+    # Page score = TEXT_WEIGHT * text score + DENSITY_WEIGHT * text density
+    # - image term; pages averaging DIGITAL_THRESHOLD or more are digital
+    TEXT_WEIGHT = 0.8
+    DENSITY_WEIGHT = 0.1
+    IMAGE_PENALTY = 0.3
+    IMAGE_FREE_BONUS = 0.3
+    IMAGE_RATIO_NEUTRAL = 0.1
+    DIGITAL_THRESHOLD = 0.5
+
     def __init__(self, pdf_options: CheckPdfTypeOptions):
         self.pdf_options = pdf_options
 
@@ -60,69 +69,81 @@ class CheckPdfTypeProcessor:
             return True
         return False
 
+    def text_score(self, text: str) -> float:
+        """Score extracted page text by amount, 0 for junk"""
+        if self.is_junk_text(text):
+            return 0.0
+        if len(text) > 200:
+            return 0.7
+        if len(text) > 50:
+            return 0.4  # moderate amount of good text
+        return 0.2  # minimal valid text, still better than junk
+
+    def page_score(self, page) -> float:
+        """Score one PyMuPDF page between 0 (scanned) and 1 (digital)"""
+        text = page.get_text("text").strip()
+        text_blocks = page.get_text("blocks")
+        bbox = page.rect
+
+        # --- Text quality check ---
+        text_score = self.text_score(text)
+
+        # --- Text density ---
+        text_area = sum(fitz.Rect(b[:4]).get_area() for b in text_blocks if b[4].strip())
+        page_area = bbox.get_area()
+        text_density = text_area / page_area if page_area else 0
+        density_score = min(text_density, 1.0)
+
+        # --- Image area ---
+        image_area = 0.0
+        image_blocks = [b for b in page.get_text("dict")["blocks"] if b["type"] == 1]  # type 1 = image
+        for img_block in image_blocks:
+            rect = fitz.Rect(img_block["bbox"])
+            img_area = rect.get_area()
+            image_area += img_area
+
+        image_ratio = image_area / page_area if page_area else 0
+        if image_ratio == 0.0:
+            image_penalty = -self.IMAGE_FREE_BONUS  # small reward for image-free pages
+        elif image_ratio < self.IMAGE_RATIO_NEUTRAL:
+            image_penalty = 0.0   # neutral
+        else:
+            image_penalty = self.IMAGE_PENALTY   # penalize significant image content
+
+        # --- Page-level score ---
+        page_score = (self.TEXT_WEIGHT * text_score + self.DENSITY_WEIGHT * density_score) - image_penalty
+        return max(0, min(page_score, 1))
+
+    def pymupdf_page_scores(self) -> list:
+        with fitz.open(self.pdf_options.file_path) as doc:
+            return [self.page_score(doc[pageno]) for pageno in range(doc.page_count)]
+
+    def pdfplumber_page_scores(self) -> list:
+        """1 for pages whose pdfplumber text is long and not junk, else 0"""
+        page_scores = []
+        with pdfplumber.open(self.pdf_options.file_path) as pdf:
+            for page in pdf.pages:
+                fallback_text = page.extract_text()
+                if fallback_text and len(fallback_text.strip()) > 200 and not self.is_junk_text(fallback_text):
+                    page_scores.append(1.0)
+                else:
+                    page_scores.append(0.0)
+        return page_scores
+
+    def classify(self, page_scores: list) -> str:
+        avg_score = sum(page_scores) / len(page_scores) if page_scores else 0
+        return self.PdfType.DIGITAL if avg_score >= self.DIGITAL_THRESHOLD else self.PdfType.SCANNED
+
     def detect_pdf_type(self) -> str:
         try:
-            page_scores = []
-            with fitz.open(self.pdf_options.file_path) as doc:
-                for pageno in range(doc.page_count):
-                    page = doc[pageno]
-                    text = page.get_text("text").strip()
-                    images = page.get_images(full=True)
-                    text_blocks = page.get_text("blocks")
-                    bbox = page.rect
-
-                    # --- Text quality check ---
-                    junk = self.is_junk_text(text)
-                    text_len = len(text)
-                    if junk:
-                        text_score = 0.0
-                    elif text_len > 200:
-                        text_score = 0.7
-                    elif text_len > 50:
-                        text_score = 0.4  # moderate amount of good text
-                    else:
-                        text_score = 0.2  # minimal valid text, still better than junk
-
-                    # --- Text density ---
-                    text_area = sum(fitz.Rect(b[:4]).get_area() for b in text_blocks if b[4].strip())
-                    page_area = bbox.get_area()
-                    text_density = text_area / page_area if page_area else 0
-                    density_score = min(text_density, 1.0)
-
-                    # --- Image area ---
-                    image_area = 0.0
-                    image_blocks = [b for b in page.get_text("dict")["blocks"] if b["type"] == 1]  # type 1 = image
-                    for img_block in image_blocks:
-                        rect = fitz.Rect(img_block["bbox"])
-                        img_area = rect.get_area()
-                        image_area += img_area
-
-                    image_ratio = image_area / page_area if page_area else 0
-                    if image_ratio == 0.0:
-                        image_penalty = -0.3  # small reward for image-free pages
-                    elif image_ratio < 0.1:
-                        image_penalty = 0.0   # neutral
-                    else:
-                        image_penalty = 0.3   # penalize significant image content
-
-                    # --- Page-level score ---
-                    page_score = (0.8 * text_score + 0.1 * density_score) - image_penalty
-                    page_score = max(0, min(page_score, 1))
-                    page_scores.append(page_score)
+            page_scores = self.pymupdf_page_scores()
 
             # --- Fallback with pdfplumber if needed and available ---
             if (len(page_scores) == 0 or sum(page_scores) == 0) and PDFPLUMBER_AVAILABLE:
-                with pdfplumber.open(self.pdf_options.file_path) as pdf:
-                    for page in pdf.pages:
-                        fallback_text = page.extract_text()
-                        if fallback_text and len(fallback_text.strip()) > 200 and not self.is_junk_text(fallback_text):
-                            page_scores.append(1.0)
-                        else:
-                            page_scores.append(0.0)
+                page_scores += self.pdfplumber_page_scores()
 
             # --- Final decision ---
-            avg_score = sum(page_scores) / len(page_scores) if page_scores else 0
-            return self.PdfType.DIGITAL if avg_score >= 0.5 else self.PdfType.SCANNED
+            return self.classify(page_scores)
 
         except Exception as e:
             raise RuntimeError(f"Error processing PDF: {e}")
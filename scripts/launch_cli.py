@@ -8,10 +8,21 @@ Launches command-line operations for invoice generation
 import sys
 import os
 import argparse
+import time
+from contextlib import ExitStack
 
 # Add the src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+def iso_date(text):
+    """argparse type for YYYY-MM-DD options; keeps the text as given"""
+    from core.reports import parse_report_date
+    try:
+        parse_report_date(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return text
+
 def main():
     """Launch InvoiceArtisan CLI operations"""
     parser = argparse.ArgumentParser(
@@ -20,20 +31,30 @@ def main():
         epilog="""
 Examples:
   python launch_cli.py generate invoice.yaml          # Generate PDF from YAML
+  python launch_cli.py generate big/*.yaml --memprofile memory.txt
+  python launch_cli.py batch output/invoices --profile profiles --profile-aggregate
+  python launch_cli.py generate jobs/*.yaml --run-report runs.jsonl --retries 1
+  python launch_cli.py batch output/invoices --workers 4 --metrics-port 9464
   python launch_cli.py read invoice.pdf               # Read PDF content
   python launch_cli.py convert invoice.pdf            # Convert PDF to YAML
+  python launch_cli.py index output/invoices          # Index invoice YAML files in SQLite
+  python launch_cli.py search --client Astera --from 2025-01-01
+  python launch_cli.py report output/invoices --kind aging -o aging.csv
         """
     )
     
     parser.add_argument(
         'action',
-        choices=['generate', 'read', 'convert'],
+        choices=['generate', 'batch', 'read', 'convert', 'index', 'search', 'report'],
         help='Action to perform'
     )
     
     parser.add_argument(
-        'file',
-        help='Input file (YAML for generate, PDF for read/convert)'
+        'files',
+        nargs='*',
+        metavar='file',
+        help='Input file (YAML for generate, PDF for read/convert, directory for batch/index/report); '
+             'generate and convert accept several'
     )
     
     parser.add_argument(
@@ -41,13 +62,213 @@ Examples:
         help='Output file path (optional)'
     )
     
+    parser.add_argument('--deterministic', action='store_true', default=None,
+                        help='Reproducible PDFs for generate/batch: fixed timestamps and document ID '
+                             '(default: pdf.output.deterministic in app_config.yaml)')
+    
+    store_group = parser.add_argument_group('invoice store (index/search)')
+    store_group.add_argument('--db', help='Invoice database path (default: output/invoices.db)')
+    store_group.add_argument('--number', help='Invoice number to look up')
+    store_group.add_argument('--client', help='Client name prefix')
+    store_group.add_argument('--from', dest='date_from', type=iso_date, help='Earliest invoice date (YYYY-MM-DD)')
+    store_group.add_argument('--to', dest='date_to', type=iso_date, help='Latest invoice date (YYYY-MM-DD)')
+    store_group.add_argument('--due-before', type=iso_date, help='Latest due date (YYYY-MM-DD)')
+    
+    report_group = parser.add_argument_group('reports')
+    report_group.add_argument('--kind', choices=['aging', 'revenue'], default='aging',
+                              help='Report to produce (default: aging)')
+    report_group.add_argument('--format', dest='report_format', choices=['csv', 'json'],
+                              help='Report format (default: from --output extension, else csv)')
+    report_group.add_argument('--as-of', type=iso_date, help='Aging reference date (YYYY-MM-DD, default: today)')
+    report_group.add_argument('--report-cache', metavar='FILE',
+                              help='Parsed-invoice cache file (default: one per directory under output/temp/report_cache)')
+    
+    batch_group = parser.add_argument_group('batch generation')
+    batch_group.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    batch_group.add_argument('--template', default='modern_blue', help='Template id for generate/batch (default: modern_blue)')
+    batch_group.add_argument('--assign-numbers', action='store_true',
+                             help='Give invoices without a number the next one from the shared sequence '
+                                  'and save it to their YAML file')
+    
+    metrics_group = parser.add_argument_group('metrics')
+    metrics_group.add_argument('--metrics-port', type=int,
+                               help='Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running')
+    metrics_group.add_argument('--metrics-dump', help='Write a JSON metrics snapshot to this file periodically')
+    metrics_group.add_argument('--metrics-interval', type=float, default=15.0,
+                               help='Seconds between JSON metrics snapshots (default: 15)')
+    
+    parser.add_argument('--timings', action='store_true',
+                        help='Print per-phase timing percentiles to stderr when done')
+    
+    memory_group = parser.add_argument_group('memory profiling (generate/convert)')
+    memory_group.add_argument('--memprofile', nargs='?', const='memprofile.txt', metavar='REPORT',
+                              help='Trace allocations per phase of each invoice and write a text report '
+                                   '(default: memprofile.txt). Much slower than a normal run')
+    memory_group.add_argument('--memprofile-top', type=int, default=10, metavar='N',
+                              help='Allocation sites listed per phase (default: 10)')
+    
+    run_report_group = parser.add_argument_group('run report (generate/convert/batch)')
+    run_report_group.add_argument('--run-report', metavar='JSONL',
+                                  help='Append one JSON record per invoice (input hash, output size and pages, '
+                                       'phase timings, worker, retries, error class) to this file')
+    run_report_group.add_argument('--retries', type=int, default=0,
+                                  help='Retry each failed invoice up to this many times (default: 0)')
+    
+    cpu_group = parser.add_argument_group('CPU profiling')
+    cpu_group.add_argument('--profile', metavar='DIR',
+                           help='Run under cProfile and write .prof (pstats) and .collapsed (flamegraph) files '
+                                'to a new timestamped subdirectory of DIR: one pair per invoice for '
+                                'generate/convert/batch, else one per run')
+    cpu_group.add_argument('--profile-aggregate', action='store_true',
+                           help="Also merge this run's per-invoice profiles into aggregate.prof/.collapsed")
+    
     args = parser.parse_args()
     
+    args.file = args.files[0] if args.files else None
+    if args.action != 'search' and not args.file:
+        parser.error(f"the '{args.action}' action requires a file argument")
+    if len(args.files) > 1 and args.action not in ('generate', 'convert'):
+        parser.error(f"the '{args.action}' action takes a single file argument")
+    if len(args.files) > 1 and args.output:
+        parser.error("--output can only be used with a single input file")
+    if args.memprofile and args.action not in ('generate', 'convert'):
+        parser.error("--memprofile applies to the generate and convert actions")
+    if args.profile_aggregate and not args.profile:
+        parser.error("--profile-aggregate requires --profile DIR")
+    if args.deterministic and args.action not in ('generate', 'batch'):
+        parser.error("--deterministic applies to the generate and batch actions")
+    if args.run_report and args.action not in ('generate', 'convert', 'batch'):
+        parser.error("--run-report applies to the generate, convert and batch actions")
+    
+    if args.metrics_port is not None or args.metrics_dump:
+        from utils.metrics import start_metrics
+        # Batch workers are separate processes; they share their metrics through this directory
+        start_metrics(port=args.metrics_port, dump_path=args.metrics_dump, interval=args.metrics_interval,
+                      multiprocess_dir=os.path.join('output', 'temp', 'metrics'))
+        if args.metrics_port is not None:
+            print(f"📈 Metrics at http://127.0.0.1:{args.metrics_port}/metrics", file=sys.stderr)
+    
+    spans = None
+    if args.timings:
+        from utils.instrumentation import MemorySink, add_sink
+        spans = MemorySink()
+        add_sink(spans)
+    
+    memory = None
+    if args.memprofile:
+        from utils.memprofile import MemoryProfiler
+        memory = MemoryProfiler(top=args.memprofile_top)
+    
+    profile_dir = None
+    if args.profile:
+        from utils import profiling
+        # A fresh subdirectory per run, so the aggregate only covers this run
+        profile_dir = profiling.new_run_directory(args.profile)
+    
+    def profiled(index, path):
+        """Memory and CPU profiling of one input, as requested on the command line"""
+        stack = ExitStack()
+        if memory is not None:
+            stack.enter_context(memory.profile(path))
+        if profile_dir is not None:
+            stack.enter_context(profiling.profiled(profile_dir / profiling.profile_name(index, path)))
+        return stack
+    
+    report = None
+    if args.run_report:
+        from utils.run_report import RunReport, job_record, worker_id
+        report = RunReport(args.run_report)
+    failures = []
+    
+    def run_job(index, path, work):
+        """Run ``work(path)`` -> (output path, report fields) with profiling, retries and reporting.
+        
+        Failures are reported and counted rather than raised, so one bad
+        input doesn't stop the rest.
+        """
+        from utils.instrumentation import MemorySink, collecting
+        for attempt in range(args.retries + 1):
+            sink = MemorySink(current_thread_only=True) if report else None
+            output, fields, error = None, {}, None
+            started = time.perf_counter()
+            try:
+                with profiled(index, path), collecting(*([sink] if sink else [])):
+                    output, fields = work(path)
+            except (Exception, SystemExit) as e:
+                # pdf_to_yaml reports its own errors and calls sys.exit
+                error = e
+            seconds = time.perf_counter() - started
+            if error is None or attempt == args.retries:
+                break
+        if report is not None:
+            report.write(job_record(args.action, path, output, seconds,
+                                    sink.samples, error, retries=attempt, worker=worker_id(), **fields))
+        if error is not None:
+            failures.append(path)
+            print(f"❌ {path}: {error}", file=sys.stderr)
+        return output
+    
+    # Actions without per-invoice work are profiled as a whole
+    action_profile = ExitStack()
+    if profile_dir is not None and args.action not in ('generate', 'convert', 'batch'):
+        action_profile.enter_context(profiling.profiled(profile_dir / args.action))
+    
     try:
         if args.action == 'generate':
+            from pathlib import Path
             from core.invoice_generator import generate_invoice
-            generate_invoice(args.file)
-            print(f"✅ Invoice generated successfully!")
+            from core.invoice_store import load_yaml
+            
+            def generate(path):
+                output_pdf = args.output or str(Path(path).with_suffix('.pdf'))
+                data = load_yaml(path)
+                if not isinstance(data, dict):
+                    raise ValueError(f"{path} does not contain invoice data")
+                client = data.get('client')
+                generate_invoice(data, output_pdf, args.template, deterministic=args.deterministic)
+                return output_pdf, {'template': args.template,
+                                    'client': client.get('name') if isinstance(client, dict) else None}
+            
+            for index, path in enumerate(args.files):
+                output_pdf = run_job(index, path, generate)
+                if output_pdf:
+                    print(f"✅ Invoice generated successfully: {output_pdf}")
+            
+        elif args.action == 'batch':
+            from pathlib import Path
+            from core.batch import BatchJob, run_batch
+            from core.invoice_store import YAML_EXTENSIONS
+            paths = sorted(p for p in Path(args.file).rglob('*') if p.suffix.lower() in YAML_EXTENSIONS)
+            jobs = [BatchJob(path, template_id=args.template) for path in paths]
+            for job in jobs:
+                job.deterministic = args.deterministic
+                job.assign_number = args.assign_numbers
+            if profile_dir is not None:
+                # Each worker profiles its own jobs
+                for index, job in enumerate(jobs):
+                    job.profile_path = str(profile_dir.resolve() / profiling.profile_name(index, job.yaml_path))
+            
+            def on_update(job):
+                if job.status == 'failed':
+                    print(f"❌ {job.yaml_path}: {job.error}", file=sys.stderr)
+            
+            stats = run_batch(jobs, max_workers=args.workers, on_update=on_update,
+                              collect_spans=spans is not None or report is not None, retries=args.retries)
+            if spans is not None:
+                # Spans were recorded in the worker processes
+                for job in jobs:
+                    spans.merge(job.spans or {})
+            if report is not None:
+                for job in jobs:
+                    if job.status in ('done', 'failed'):
+                        report.write(job_record('batch', job.yaml_path, job.output_pdf, job.seconds, job.spans,
+                                                job.error, job.error_type, job.retries, job.worker,
+                                                template=job.template_id, client=job.client,
+                                                assigned_number=job.number))
+            if stats['failed']:
+                failures.append(args.file)
+            print(f"✅ Generated {stats['done']} invoices ({stats['failed']} failed) "
+                  f"in {stats['elapsed']:.1f}s ({stats['per_second']:.1f} invoices/s)")
             
         elif args.action == 'read':
             from core.pdf_reader import read_pdf
@@ -57,9 +278,73 @@ Examples:
             
         elif args.action == 'convert':
             from core.pdf_to_yaml import pdf_to_yaml
-            output_file = args.output or args.file.replace('.pdf', '.yaml')
-            pdf_to_yaml(args.file, output_file)
-            print(f"✅ PDF converted to YAML: {output_file}")
+            for index, path in enumerate(args.files):
+                output_file = run_job(index, path, lambda path: (pdf_to_yaml(path, args.output), {}))
+                if output_file:
+                    print(f"✅ PDF converted to YAML: {output_file}")
+            
+        elif args.action == 'index':
+            from core.invoice_store import InvoiceStore, DEFAULT_DB_PATH
+            with InvoiceStore(args.db or DEFAULT_DB_PATH) as store:
+                stats = store.import_directory(args.file)
+                removed = store.remove_missing()
+                print(f"✅ Indexed {stats['imported']} invoices "
+                      f"({stats['unchanged']} unchanged, {stats['skipped']} skipped, "
+                      f"{stats['orphan_pdfs']} PDFs without YAML, {removed} removed). "
+                      f"Total: {store.count()}")
+            
+        elif args.action == 'search':
+            from core.invoice_store import InvoiceStore, DEFAULT_DB_PATH
+            with InvoiceStore(args.db or DEFAULT_DB_PATH) as store:
+                matches = 0
+                for row in store.iter_invoices(number=args.number, client=args.client,
+                                               date_from=args.date_from, date_to=args.date_to,
+                                               due_to=args.due_before):
+                    matches += 1
+                    print(f"{row['number']:<20} {row['date']:<10} due {row['due_date']:<10} "
+                          f"{row['client']:<30} ${row['total_cents'] / 100:>12,.2f}  {row['yaml_path'] or ''}")
+                print(f"🔎 {matches} matching invoices")
+            
+        elif args.action == 'report':
+            from core.reports import InvoiceLedger, aging_report, revenue_report, write_report
+            ledger = InvoiceLedger(args.report_cache)
+            stats = ledger.scan(args.file)
+            if args.kind == 'aging':
+                rows = aging_report(ledger, as_of=args.as_of)
+            else:
+                rows = revenue_report(ledger)
+            
+            report_format = args.report_format
+            if not report_format:
+                report_format = 'json' if args.output and args.output.lower().endswith('.json') else 'csv'
+            write_report(rows, args.output or sys.stdout, report_format)
+            print(f"✅ {args.kind.capitalize()} report over {len(ledger)} invoices "
+                  f"({stats['parsed']} parsed, {stats['cached']} from cache)"
+                  + (f": {args.output}" if args.output else ""), file=sys.stderr)
+        
+        action_profile.close()
+        
+        if spans is not None:
+            from utils.instrumentation import format_summary
+            print(format_summary(spans.summary()), file=sys.stderr)
+        
+        if memory is not None:
+            memory.write(args.memprofile)
+            print(f"🧠 Memory profile written to {args.memprofile}", file=sys.stderr)
+        
+        if profile_dir is not None:
+            if args.profile_aggregate:
+                merged = profiling.aggregate_directory(profile_dir)
+                if merged:
+                    print(f"🔥 Aggregate profile: {merged[0]} ({merged[1].name} for flamegraphs)", file=sys.stderr)
+            print(f"🔥 CPU profiles written to {profile_dir}", file=sys.stderr)
+        
+        if report is not None:
+            report.close()
+            print(f"📝 {report.count} job records appended to {report.path}", file=sys.stderr)
+        
+        if failures:
+            sys.exit(1)
             
     except ImportError as e:
         print(f"Error: {e}")
@@ -3,8 +3,24 @@ Core functionality for InvoiceArtisan
 Contains PDF generation, reading, and conversion utilities
 """
 
-from .invoice_generator import generate_invoice
-from .pdf_reader import read_pdf
-from .pdf_to_yaml import pdf_to_yaml
+import importlib
+
+# Public functions and the submodules that define them. They are imported on
+# first use so that importing a light module such as core.totals does not
+# load ReportLab and PyPDF2.
+_LAZY_EXPORTS = {
+    'generate_invoice': 'invoice_generator',
+    'read_pdf': 'pdf_reader',
+    'pdf_to_yaml': 'pdf_to_yaml',
+}
 
 __all__ = ['generate_invoice', 'read_pdf', 'pdf_to_yaml']
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Batch PDF generation for InvoiceArtisan
+Renders many invoice YAML files on a bounded pool of worker processes,
+reporting per-invoice status as each one finishes
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import (CancelledError, FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .invoice_generator import generate_invoice
+    from .invoice_store import load_yaml
+    from .number_allocator import InvoiceNumberAllocator
+except ImportError:
+    # Running as a standalone script
+    from invoice_generator import generate_invoice
+    from invoice_store import load_yaml
+    from number_allocator import InvoiceNumberAllocator
+
+try:
+    from ..utils.instrumentation import MemorySink, collecting
+    from ..utils import metrics
+    from ..utils.profiling import profiled
+    from ..utils.run_report import root_error, worker_id
+    from ..utils.file_utils import write_yaml_atomic
+except ImportError:
+    # Imported as top-level 'core' with src on the path
+    from utils.instrumentation import MemorySink, collecting
+    from utils import metrics
+    from utils.profiling import profiled
+    from utils.run_report import root_error, worker_id
+    from utils.file_utils import write_yaml_atomic
+
+# Jobs handed to the pool ahead of the running ones, per worker
+QUEUE_DEPTH = 2
+
+STATUS_PENDING = 'pending'
+STATUS_QUEUED = 'queued'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+
+
+class BatchJob:
+    """One invoice in a batch run and its outcome"""
+
+    def __init__(self, yaml_path: str, output_pdf: Optional[str] = None, template_id: str = "modern_blue"):
+        self.yaml_path = str(yaml_path)
+        self.output_pdf = str(output_pdf) if output_pdf else str(Path(yaml_path).with_suffix('.pdf'))
+        self.template_id = template_id
+        self.status = STATUS_PENDING
+        self.error: Optional[str] = None
+        self.error_type: Optional[str] = None
+        self.seconds: Optional[float] = None
+        self.spans: Optional[Dict[str, List[float]]] = None
+        # Host:pid of the worker that ran the last attempt, and the invoice's client
+        self.worker: Optional[str] = None
+        self.client: Optional[str] = None
+        self.retries = 0
+        # Set to profile the job; the worker writes <profile_path>.prof/.collapsed
+        self.profile_path: Optional[str] = None
+        # Byte-for-byte reproducible PDF; None uses the app config setting
+        self.deterministic: Optional[bool] = None
+        # Give an invoice without a number the next allocated one, saved to its YAML file
+        self.assign_number = False
+        self.number: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f"BatchJob({Path(self.yaml_path).name!r}, status={self.status!r})"
+
+
+class JobError(Exception):
+    """A job that failed in a worker, with what the worker knew about the attempt.
+
+    Exception chains don't survive the trip back from a worker process, so
+    the worker resolves the underlying error class before raising this.
+    """
+
+    def __init__(self, message: str, error_type: str, seconds: float, worker: str,
+                 spans: Optional[Dict[str, List[float]]] = None, client: Optional[str] = None):
+        # Everything goes through args so the exception pickles intact
+        super().__init__(message, error_type, seconds, worker, spans, client)
+        self.message = message
+        self.error_type = error_type
+        self.seconds = seconds
+        self.worker = worker
+        self.spans = spans
+        self.client = client
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _client_name(data) -> Optional[str]:
+    client = data.get('client') if isinstance(data, dict) else None
+    return client.get('name') if isinstance(client, dict) else None
+
+
+# One allocator per worker process, so numbers are drawn from blocks reserved in bulk
+_allocator: Optional[InvoiceNumberAllocator] = None
+_allocator_lock = threading.Lock()
+
+
+def _worker_allocator() -> InvoiceNumberAllocator:
+    global _allocator
+    with _allocator_lock:
+        if _allocator is None:
+            _allocator = InvoiceNumberAllocator()
+        return _allocator
+
+
+def assign_invoice_number(data: Dict, yaml_path: str) -> Optional[str]:
+    """Number an invoice that has none yet and save it; returns the new number, if any"""
+    invoice = data.get('invoice')
+    if not isinstance(invoice, dict) or str(invoice.get('number') or '').strip():
+        return None
+    invoice['number'] = _worker_allocator().next_number(invoice.get('date'))
+    write_yaml_atomic(yaml_path, data)
+    return invoice['number']
+
+
+def generate_job(yaml_path: str, output_pdf: str, template_id: str, collect_spans: bool = False,
+                 profile_path: Optional[str] = None, deterministic: Optional[bool] = None,
+                 assign_number: bool = False
+                 ) -> Tuple[float, Optional[Dict[str, List[float]]], Dict[str, Optional[str]]]:
+    """Render one invoice file to PDF in a worker, optionally under cProfile.
+
+    With ``assign_number`` an invoice without a number first gets one from
+    the shared sequence database (see assign_invoice_number).
+
+    Returns:
+        (seconds taken, span durations by name if ``collect_spans`` else None,
+        {'worker': host:pid, 'client': client name, 'number': the assigned number or None})
+
+    Raises:
+        JobError: if the job failed, carrying the same details
+    """
+    start = time.perf_counter()
+    # Thread pools run several jobs in one process, so only collect this thread's spans
+    sink = MemorySink(current_thread_only=True) if collect_spans else None
+    data = number = None
+    try:
+        with collecting(*([sink] if sink else [])), (profiled(profile_path) if profile_path else nullcontext()):
+            data = load_yaml(yaml_path)
+            if not isinstance(data, dict):
+                raise ValueError(f"{yaml_path} does not contain invoice data")
+            if assign_number:
+                number = assign_invoice_number(data, yaml_path)
+            Path(output_pdf).parent.mkdir(parents=True, exist_ok=True)
+            generate_invoice(data, output_pdf, template_id, deterministic=deterministic)
+    except Exception as e:
+        raise JobError(str(e), type(root_error(e)).__name__, time.perf_counter() - start, worker_id(),
+                       sink.samples if sink else None, _client_name(data)) from e
+    return (time.perf_counter() - start, sink.samples if sink else None,
+            {'worker': worker_id(), 'client': _client_name(data), 'number': number})
+
+
+def run_batch(jobs: Iterable[BatchJob], max_workers: Optional[int] = None, use_processes: bool = True,
+              on_update: Optional[Callable[[BatchJob], None]] = None, cancel_event=None,
+              collect_spans: bool = False, retries: int = 0) -> Dict[str, float]:
+    """Generate PDFs for a list of jobs on a bounded worker pool.
+
+    At most ``max_workers * QUEUE_DEPTH`` jobs are handed to the pool at a
+    time, so cancelling takes effect quickly and huge batches don't queue
+    every job up front. ``on_update`` is called (from the calling thread)
+    whenever a job changes status. With ``collect_spans`` each job records
+    its generate_invoice phase timings in ``job.spans``. Failed jobs are
+    resubmitted up to ``retries`` times, counted in ``job.retries``.
+
+    Returns:
+        Counts of 'done', 'failed' and 'cancelled' jobs, plus 'elapsed'
+        seconds and 'per_second' throughput. With ``collect_spans``, 'phases'
+        maps each span name to its count, total and p50/p95/p99 seconds.
+    """
+    jobs: List[BatchJob] = list(jobs)
+    stats = {'done': 0, 'failed': 0, 'cancelled': 0, 'elapsed': 0.0, 'per_second': 0.0}
+    if collect_spans:
+        stats['phases'] = {}
+    if not jobs:
+        return stats
+
+    def notify(job):
+        if job.status in (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED):
+            metrics.BATCH_JOBS.inc(status=job.status)
+            metrics.BATCH_QUEUE_DEPTH.dec()
+        if on_update:
+            on_update(job)
+
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if use_processes:
+        # Spawned workers don't inherit GUI threads or open database handles
+        executor = ProcessPoolExecutor(max_workers=max_workers,
+                                       mp_context=multiprocessing.get_context('spawn'))
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="InvoiceBatch")
+
+    start = time.perf_counter()
+    metrics.BATCH_QUEUE_DEPTH.inc(len(jobs))
+    pending = iter(jobs)
+    in_flight = {}
+
+    def submit(job):
+        in_flight[executor.submit(generate_job, job.yaml_path, job.output_pdf, job.template_id,
+                                  collect_spans, job.profile_path, job.deterministic, job.assign_number)] = job
+
+    def submit_next():
+        job = next(pending, None)
+        if job is None:
+            return
+        job.status = STATUS_QUEUED
+        submit(job)
+        notify(job)
+
+    with executor:
+        for _ in range(max_workers * QUEUE_DEPTH):
+            submit_next()
+
+        cancelled = False
+        while in_flight:
+            done, _ = wait(in_flight, timeout=0.2, return_when=FIRST_COMPLETED)
+            if cancel_event is not None and cancel_event.is_set() and not cancelled:
+                cancelled = True
+                for future in in_flight:
+                    future.cancel()
+
+            for future in done:
+                job = in_flight.pop(future)
+                try:
+                    job.seconds, job.spans, info = future.result()
+                    job.worker, job.client, job.number = info['worker'], info['client'], info['number']
+                    job.status = STATUS_DONE
+                    job.error = job.error_type = None
+                except CancelledError:
+                    job.status = STATUS_CANCELLED
+                except Exception as e:
+                    job.status = STATUS_FAILED
+                    job.error = str(e)
+                    if isinstance(e, JobError):
+                        job.error_type = e.error_type
+                        job.seconds, job.spans, job.worker, job.client = e.seconds, e.spans, e.worker, e.client
+                    else:
+                        # The pool itself failed, e.g. a worker process died
+                        job.error_type = type(root_error(e)).__name__
+                    if job.retries < retries and not cancelled:
+                        # Same slot in the pool, so the queue depth stays bounded
+                        job.retries += 1
+                        submit(job)
+                        continue
+                stats[job.status] += 1
+                notify(job)
+                if not cancelled:
+                    submit_next()
+
+    # Jobs never handed to the pool
+    for job in pending:
+        job.status = STATUS_CANCELLED
+        stats['cancelled'] += 1
+        notify(job)
+
+    stats['elapsed'] = time.perf_counter() - start
+    stats['per_second'] = stats['done'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    if collect_spans:
+        spans = MemorySink()
+        for job in jobs:
+            if job.spans:
+                spans.merge(job.spans)
+        stats['phases'] = spans.summary()
+    return stats
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 
+import os
 import yaml
 import sys
+import time
 from datetime import datetime
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
@@ -11,6 +13,25 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from dateutil import parser
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
+from reportlab.pdfbase import pdfmetrics
+
+try:
+    from .totals import compute_totals
+    from .line_items import LineItems
+except ImportError:
+    # Running as a standalone script
+    from totals import compute_totals
+    from line_items import LineItems
+
+try:
+    from ..utils.instrumentation import phases
+    from ..utils import metrics
+    from ..utils.config import get_config_value
+except ImportError:
+    # Imported as top-level 'core' with src on the path
+    from utils.instrumentation import phases
+    from utils import metrics
+    from utils.config import get_config_value
 
 # Define custom colors for a more elegant look
 DARK_BLUE = colors.HexColor('#2c3e50')  # Dark blue for headers
@@ -19,6 +40,29 @@ HIGHLIGHT_COLOR = colors.HexColor('#3498db')  # Accent color
 LIGHT_GRAY = colors.HexColor('#f8f9fa')  # Light gray for alternating rows
 MEDIUM_GRAY = colors.HexColor('#e9ecef')  # Medium gray for borders
 
+# Standard PDF font families used in place of fonts that are not registered with ReportLab
+FONT_SUBSTITUTES = {
+    'arial': 'Helvetica',
+    'verdana': 'Helvetica',
+    'roboto': 'Helvetica',
+    'georgia': 'Times',
+}
+
+def resolve_font(font_name, default='Helvetica'):
+    """Map a template font name to one ReportLab can render"""
+    if not font_name:
+        return default
+    if font_name in pdfmetrics.standardFonts or font_name in pdfmetrics.getRegisteredFontNames():
+        return font_name
+    family, _, style = font_name.partition('-')
+    substitute = FONT_SUBSTITUTES.get(family.lower())
+    if substitute is None:
+        return default
+    if not style:
+        return 'Times-Roman' if substitute == 'Times' else substitute
+    candidate = f"{substitute}-{style.capitalize()}"
+    return candidate if candidate in pdfmetrics.standardFonts else default
+
 # Custom horizontal line separator
 class HRFlowable(Flowable):
     def __init__(self, width, thickness=1, color=MEDIUM_GRAY, space_before=0, space_after=0):
@@ -38,23 +82,53 @@ class HRFlowable(Flowable):
         y = self.space_before + self.thickness / 2
         self.canv.line(0, y, self.width, y)
 
+class GenerationCancelled(Exception):
+    """Raised when invoice generation is cancelled through its cancel_event"""
+
 def load_invoice_data(yaml_file):
     with open(yaml_file, 'r') as file:
         return yaml.safe_load(file)
 
 def calculate_totals(items):
-    subtotal = sum(item['quantity'] * item['rate'] for item in items)
-    return subtotal
+    return compute_totals(items).subtotal
 
 def format_currency(amount):
     return f"${amount:,.2f}"
 
-def generate_invoice(data, output_pdf, template_id="modern_blue"):
-    """Generate a PDF invoice from the provided data using the specified template."""
+def generate_invoice(data, output_pdf, template_id="modern_blue", totals=None,
+                     progress=None, cancel_event=None, deterministic=None):
+    """Generate a PDF invoice from the provided data using the specified template.
+    
+    Precomputed totals (from compute_totals) can be passed in to avoid recomputing
+    line amounts that the caller already has; they are ignored unless they were
+    computed from the same item values and tax rate. ``progress`` is called as
+    progress(fraction, message) while rendering, and setting ``cancel_event``
+    (a threading.Event) stops generation with GenerationCancelled.
+    
+    With ``deterministic`` the PDF gets fixed timestamps and document ID, so the
+    same invoice always produces the same bytes (for hashing and dedup). It
+    defaults to the pdf.output.deterministic setting in app_config.yaml.
+    """
+    def report(fraction, message):
+        if cancel_event is not None and cancel_event.is_set():
+            raise GenerationCancelled(f"Generation of {output_pdf} was cancelled")
+        if progress is not None:
+            progress(fraction, message)
+    
+    # Per-phase timing spans (no-ops unless an instrumentation sink is installed)
+    timing = phases('generate_invoice', template=template_id)
+    started = time.perf_counter()
     try:
+        report(0.0, "Validating invoice data")
+        
         # Import template manager
+        timing.enter('template_lookup')
         try:
-            from ..utils.template_manager import get_template_manager
+            try:
+                from ..utils.template_manager import get_template_manager
+            except ImportError:
+                # Imported as top-level 'core' with src on the path
+                from utils.template_manager import get_template_manager
             template_manager = get_template_manager()
             template = template_manager.get_template(template_id)
         except ImportError:
@@ -63,6 +137,7 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
             print("Warning: Template manager not available, using default styling")
         
         # Validate input data
+        timing.enter('validate')
         if not isinstance(data, dict):
             raise ValueError(f"Expected dict for invoice data, got {type(data)}")
             
@@ -96,12 +171,12 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
             if field not in data['client']:
                 raise ValueError(f"Missing client field '{field}'")
         
-        # Check items
-        if not isinstance(data['items'], list) or len(data['items']) == 0:
+        # Check items (a LineItems container is already typed and validated)
+        if not isinstance(data['items'], (list, LineItems)) or len(data['items']) == 0:
             raise ValueError("Items should be a non-empty list")
             
         # Check that each item in the list is a dictionary with required fields
-        for i, item in enumerate(data['items']):
+        for i, item in enumerate(data['items'] if isinstance(data['items'], list) else ()):
             if not isinstance(item, dict):
                 raise ValueError(f"Item {i+1} should be a dict, got {type(item)}")
             if 'quantity' not in item or 'rate' not in item:
@@ -109,10 +184,13 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
         
         print(f"Data validation passed. Invoice: {data['invoice']['number']}")
         
+        report(0.05, "Building layout")
+        
         # Apply template styling
+        timing.enter('styles')
         if template:
             template_colors = template.get('colors', {})
-            template_fonts = template.get('fonts', {})
+            template_fonts = {role: resolve_font(font) for role, font in template.get('fonts', {}).items()}
             template_spacing = template.get('spacing', {})
         else:
             # Fallback to default colors
@@ -136,14 +214,19 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
                 'item_padding': 6
             }
         
-        # Create document with template-based margins
+        if deterministic is None:
+            deterministic = get_config_value('pdf', 'output', 'deterministic', default=False)
+        
+        # Create document with template-based margins. ReportLab's invariant mode
+        # replaces the creation time and random document ID with fixed values
         doc = SimpleDocTemplate(
             output_pdf,
             pagesize=letter,
             rightMargin=0.6*inch,
             leftMargin=0.6*inch,
             topMargin=0.6*inch,
-            bottomMargin=0.6*inch
+            bottomMargin=0.6*inch,
+            invariant=1 if deterministic else None
         )
         
         styles = getSampleStyleSheet()
@@ -161,6 +244,7 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
         )
         
         # Create a table for the header with logo and invoice title
+        timing.enter('logo')
         # Try to find the logo in different possible locations
         import os
         base_paths = []
@@ -211,6 +295,7 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
             ))
         
         # Enhanced invoice title style using template
+        timing.enter('header')
         invoice_title_style = ParagraphStyle(
             'InvoiceTitle',
             parent=styles['Heading1'],
@@ -364,8 +449,19 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
             ]
         ]
         
+        report(0.1, "Building items table")
+        timing.enter('items_table')
+        
+        # Line amounts and totals are computed once and reused for every row
+        if totals is None or not totals.matches(data['items'], data['tax_rate']):
+            totals = compute_totals(data['items'], data['tax_rate'])
+        
         # Add items with alternating row colors
-        for idx, item in enumerate(data['items'], 1):
+        item_count = len(data['items'])
+        for idx, (item, amount) in enumerate(zip(data['items'], totals.amounts), 1):
+            if idx % 1000 == 0:
+                report(0.1 + 0.3 * idx / item_count, f"Building items table ({idx:,}/{item_count:,})")
+            
             # Handle item name and description separation
             item_text = item.get('name', '')
             description_text = item.get('description', '')
@@ -381,7 +477,6 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
             else:
                 item_cell = f"<b>{item_text}</b>"
                 
-            amount = item['quantity'] * item['rate']
             table_data.append([
                 str(idx),
                 Paragraph(item_cell, item_style),
@@ -390,10 +485,9 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
                 format_currency(amount)
             ])
         
-        # Calculate totals
-        subtotal = calculate_totals(data['items'])
-        tax = subtotal * data['tax_rate']
-        total = subtotal + tax
+        subtotal = totals.subtotal
+        tax = totals.tax
+        total = totals.total
         
         # Add a blank row before totals for better spacing
         table_data.append(['', '', '', '', ''])
@@ -478,6 +572,7 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
         
         elements.append(table)
         
+        timing.enter('notes_terms')
         # Notes with improved styling but less spacing - only show if it contains more than a thank you message
         if data.get('notes') and not any(thank_phrase in data['notes'].lower() for thank_phrase in ['thank', 'thanks', 'thank you', 'business']):
             elements.append(Spacer(1, template_spacing.get('section_margin', 15)))
@@ -565,15 +660,42 @@ def generate_invoice(data, output_pdf, template_id="modern_blue"):
         
         elements.append(Paragraph("Thank you for your business!", footer_style))
         
+        # Layout takes the remaining 60%; report after each placed flowable. Long tables
+        # are placed once per page, so budget roughly one extra flowable per 20 rows.
+        report(0.4, "Rendering pages")
+        timing.enter('build')
+        total_flowables = len(elements) + item_count // 20
+        placed = [0]
+        
+        def after_flowable(flowable):
+            placed[0] += 1
+            report(0.4 + 0.6 * min(placed[0] / total_flowables, 1.0), f"Rendering page {doc.page}")
+        
+        doc.afterFlowable = after_flowable
         doc.build(elements)
+        if progress is not None:
+            progress(1.0, "Done")
+        
+        metrics.INVOICES_RENDERED.inc(template=template_id)
+        metrics.RENDER_SECONDS.observe(time.perf_counter() - started, template=template_id)
+        if isinstance(output_pdf, (str, os.PathLike)):
+            metrics.PDF_BYTES_WRITTEN.inc(os.path.getsize(output_pdf))
+        elif hasattr(output_pdf, 'tell'):
+            # In-memory output (e.g. live preview)
+            metrics.PDF_BYTES_WRITTEN.inc(output_pdf.tell())
         print(f"Successfully generated invoice: {output_pdf}")
         return output_pdf
         
+    except GenerationCancelled:
+        raise
     except Exception as e:
+        metrics.RENDER_FAILURES.inc(template=template_id)
         # Re-raise with more context instead of returning None
         import traceback
         error_msg = f"PDF generation failed: {str(e)}\n\nFull traceback:\n{traceback.format_exc()}"
         raise RuntimeError(error_msg) from e
+    finally:
+        timing.close()
 
 def main():
     if len(sys.argv) != 2:
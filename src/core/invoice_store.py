@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed invoice repository for InvoiceArtisan
+Indexes invoices by number, client and dates so lookups don't scan YAML files
+"""
+
+import os
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import yaml
+from dateutil import parser as date_parser
+
+try:
+    from .totals import compute_totals
+except ImportError:
+    # Running as a standalone script
+    from totals import compute_totals
+
+DEFAULT_DB_PATH = os.path.join('output', 'invoices.db')
+
+YAML_EXTENSIONS = ('.yaml', '.yml')
+
+# Rows fetched per round trip when streaming query results
+FETCH_SIZE = 500
+
+# Bumped when stored rows need rebuilding from their YAML files (kept in PRAGMA user_version)
+SCHEMA_VERSION = 2
+
+# Fallback date for dateutil: a parsed year of 1 means the text had no year
+_NO_DATE = datetime(1, 1, 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoices (
+    id INTEGER PRIMARY KEY,
+    number TEXT NOT NULL,
+    client TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL DEFAULT '',
+    due_date TEXT NOT NULL DEFAULT '',
+    month TEXT NOT NULL DEFAULT '',
+    item_count INTEGER NOT NULL DEFAULT 0,
+    subtotal_cents INTEGER NOT NULL DEFAULT 0,
+    tax_cents INTEGER NOT NULL DEFAULT 0,
+    total_cents INTEGER NOT NULL DEFAULT 0,
+    yaml_path TEXT UNIQUE,
+    pdf_path TEXT,
+    source_mtime REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_invoices_number ON invoices(number);
+DROP INDEX IF EXISTS idx_invoices_client;
+-- NOCASE so the case-insensitive client prefix search (LIKE) can use the index
+CREATE INDEX IF NOT EXISTS idx_invoices_client_nocase ON invoices(client COLLATE NOCASE, date);
+CREATE INDEX IF NOT EXISTS idx_invoices_date ON invoices(date);
+CREATE INDEX IF NOT EXISTS idx_invoices_due_date ON invoices(due_date);
+"""
+
+_COLUMNS = ('number', 'client', 'date', 'due_date', 'month', 'item_count',
+            'subtotal_cents', 'tax_cents', 'total_cents', 'yaml_path', 'pdf_path', 'source_mtime')
+
+
+def load_yaml(path):
+    """Parse a YAML file, using the C loader when PyYAML was built with it"""
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as file:
+        return yaml.load(file, Loader=loader)
+
+
+def _cents(amount) -> int:
+    return int(amount.scaleb(2))
+
+
+def iso_date(value) -> str:
+    """Normalise an invoice date to 'YYYY-MM-DD' so stored dates sort and compare correctly.
+
+    ISO dates are taken as they are; other spellings ("10/01/2025",
+    "10 Jan 2025") go through dateutil, reading slashed dates day first like
+    pdf_to_yaml does. Text that is not a full date is kept unchanged.
+    """
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value if value is not None else '').strip()
+    if not text:
+        return ''
+    try:
+        return datetime.fromisoformat(text).date().isoformat()
+    except ValueError:
+        pass
+    try:
+        parsed = date_parser.parse(text, dayfirst=True, default=_NO_DATE)
+    except (ValueError, OverflowError):
+        return text
+    return parsed.date().isoformat() if parsed.year != _NO_DATE.year else text
+
+
+def invoice_record(data: Dict[str, Any], yaml_path: Optional[str] = None,
+                   pdf_path: Optional[str] = None, source_mtime: float = 0.0) -> Dict[str, Any]:
+    """Build the indexed summary row for an invoice data dict"""
+    invoice = data.get('invoice') or {}
+    client = data.get('client') or {}
+    items = data.get('items') or []
+    totals = compute_totals(items, data.get('tax_rate') or 0)
+    return {
+        'number': str(invoice.get('number', '')),
+        'client': str(client.get('name', '')),
+        'date': iso_date(invoice.get('date', '')),
+        'due_date': iso_date(invoice.get('due_date', '')),
+        'month': str(invoice.get('month', '')),
+        'item_count': len(items),
+        'subtotal_cents': _cents(totals.subtotal),
+        'tax_cents': _cents(totals.tax),
+        'total_cents': _cents(totals.total),
+        'yaml_path': yaml_path,
+        'pdf_path': pdf_path,
+        'source_mtime': source_mtime,
+    }
+
+
+class InvoiceStore:
+    """Repository of invoice summaries stored in SQLite"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """Open (and create if needed) the invoice database"""
+        self.db_path = str(db_path)
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(_SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Make rows written by an older version be rebuilt by the next import"""
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            # Older rows may hold non-ISO dates; a zero mtime makes import_directory re-read them
+            self.connection.execute("UPDATE invoices SET source_mtime = 0")
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.connection.commit()
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Writing
+
+    def upsert(self, record: Dict[str, Any]) -> None:
+        """Insert or replace an invoice summary row (keyed by YAML path when present)"""
+        self._upsert_many([record])
+        self.connection.commit()
+
+    def add_invoice(self, data: Dict[str, Any], yaml_path: Optional[str] = None,
+                    pdf_path: Optional[str] = None) -> None:
+        """Index an in-memory invoice, e.g. right after it has been saved or generated"""
+        mtime = os.path.getmtime(yaml_path) if yaml_path and os.path.exists(yaml_path) else 0.0
+        self.upsert(invoice_record(data, yaml_path, pdf_path, mtime))
+
+    def _upsert_many(self, records) -> None:
+        placeholders = ', '.join('?' for _ in _COLUMNS)
+        updates = ', '.join(f"{c} = excluded.{c}" for c in _COLUMNS if c != 'yaml_path')
+        self.connection.executemany(
+            f"INSERT INTO invoices ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(yaml_path) DO UPDATE SET {updates}",
+            ([record[c] for c in _COLUMNS] for record in records)
+        )
+
+    def import_directory(self, directory: str, recursive: bool = True, batch_size: int = 200) -> Dict[str, int]:
+        """Bulk import invoice YAML files (and their sibling PDFs) from a directory.
+
+        Files whose modification time matches the stored row are skipped, so
+        re-importing a folder only parses new or changed invoices.
+
+        Returns:
+            Counts of 'imported', 'unchanged', 'skipped' (not invoices or
+            unreadable) and 'orphan_pdfs' (PDFs with no YAML next to them)
+        """
+        known = {row['yaml_path']: row['source_mtime'] for row in
+                 self.connection.execute("SELECT yaml_path, source_mtime FROM invoices WHERE yaml_path IS NOT NULL")}
+        stats = {'imported': 0, 'unchanged': 0, 'skipped': 0, 'orphan_pdfs': 0}
+        batch = []
+        yaml_stems = set()
+        pdf_files = []
+
+        root = Path(directory)
+        paths = root.rglob('*') if recursive else root.glob('*')
+        for path in sorted(paths):
+            suffix = path.suffix.lower()
+            if suffix == '.pdf':
+                pdf_files.append(path)
+                continue
+            if suffix not in YAML_EXTENSIONS or not path.is_file():
+                continue
+
+            yaml_stems.add(path.with_suffix(''))
+            yaml_path = str(path.resolve())
+            mtime = path.stat().st_mtime
+            if known.get(yaml_path) == mtime:
+                stats['unchanged'] += 1
+                continue
+
+            try:
+                data = load_yaml(path)
+            except (OSError, yaml.YAMLError) as e:
+                print(f"Warning: Could not read {path}: {e}")
+                stats['skipped'] += 1
+                continue
+            if not isinstance(data, dict) or not isinstance(data.get('invoice'), dict):
+                stats['skipped'] += 1
+                continue
+
+            pdf_path = path.with_suffix('.pdf')
+            try:
+                record = invoice_record(data, yaml_path, str(pdf_path.resolve()) if pdf_path.exists() else None, mtime)
+            except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+                print(f"Warning: Invalid invoice data in {path}: {e}")
+                stats['skipped'] += 1
+                continue
+            batch.append(record)
+            stats['imported'] += 1
+
+            if len(batch) >= batch_size:
+                self._upsert_many(batch)
+                batch = []
+
+        if batch:
+            self._upsert_many(batch)
+        self.connection.commit()
+
+        stats['orphan_pdfs'] = sum(1 for pdf in pdf_files if pdf.with_suffix('') not in yaml_stems)
+        return stats
+
+    def remove_missing(self) -> int:
+        """Drop rows whose YAML file no longer exists and return how many were removed"""
+        missing = [(row['id'],) for row in
+                   self.connection.execute("SELECT id, yaml_path FROM invoices WHERE yaml_path IS NOT NULL")
+                   if not os.path.exists(row['yaml_path'])]
+        self.connection.executemany("DELETE FROM invoices WHERE id = ?", missing)
+        self.connection.commit()
+        return len(missing)
+
+    # Querying
+
+    def iter_invoices(self, number: Optional[str] = None, client: Optional[str] = None,
+                      date_from: Optional[str] = None, date_to: Optional[str] = None,
+                      due_from: Optional[str] = None, due_to: Optional[str] = None,
+                      order_by: str = 'date') -> Iterator[Dict[str, Any]]:
+        """Stream invoice summaries matching the given filters.
+
+        Dates are ISO 'YYYY-MM-DD' strings and ranges are inclusive. Client
+        matches are case-insensitive prefixes, served by the NOCASE client index. Rows are fetched in chunks so
+        large result sets never have to fit in memory.
+        """
+        if order_by not in ('date', 'due_date', 'number', 'client', 'total_cents'):
+            raise ValueError(f"Cannot order invoices by '{order_by}'")
+
+        clauses = []
+        params = []
+        if number:
+            clauses.append("number = ?")
+            params.append(number)
+        if client:
+            clauses.append("client LIKE ? ESCAPE '\\'")
+            params.append(client.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        for column, operator, value in (('date', '>=', date_from), ('date', '<=', date_to),
+                                        ('due_date', '>=', due_from), ('due_date', '<=', due_to)):
+            if value:
+                clauses.append(f"{column} {operator} ?")
+                params.append(str(value))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self.connection.execute(f"SELECT * FROM invoices {where} ORDER BY {order_by}, id", params)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(row)
+
+    def get_by_number(self, number: str) -> Optional[Dict[str, Any]]:
+        """Get the summary row for an invoice number"""
+        return next(self.iter_invoices(number=number), None)
+
+    def load_invoice(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load the full invoice data for a summary row from its YAML file"""
+        if not record.get('yaml_path'):
+            return None
+        return load_yaml(record['yaml_path'])
+
+    def count(self) -> int:
+        """Number of indexed invoices"""
+        return self.connection.execute("SELECT COUNT(*) FROM invoices").fetchone()[0]
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Bulk line-item import for InvoiceArtisan
+Streams rows from CSV/TSV files, pasted spreadsheet text or XLSX workbooks
+and validates them into a LineItems container in chunks
+"""
+
+import csv
+import importlib.util
+import io
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from .line_items import LineItems
+except ImportError:
+    # Running as a standalone script
+    from line_items import LineItems
+
+# openpyxl is optional; it is only imported when a workbook is read
+OPENPYXL_AVAILABLE = importlib.util.find_spec('openpyxl') is not None
+
+CHUNK_SIZE = 1000
+
+# Header spellings accepted for each item field (compared lower-cased, without punctuation)
+COLUMN_ALIASES = {
+    'name': ('name', 'item', 'item name', 'task', 'service', 'product'),
+    'description': ('description', 'desc', 'details', 'notes'),
+    'quantity': ('quantity', 'qty', 'hours', 'hrs', 'units'),
+    'rate': ('rate', 'price', 'unit price', 'hourly rate', 'cost'),
+    'unit': ('unit', 'uom'),
+}
+REQUIRED_COLUMNS = ('name', 'quantity', 'rate')
+
+# Column order assumed for rows without a header, by row width
+POSITIONAL_LAYOUTS = {
+    3: ('name', 'quantity', 'rate'),
+    4: ('name', 'description', 'quantity', 'rate'),
+    5: ('name', 'description', 'quantity', 'rate', 'unit'),
+}
+
+_ALIAS_LOOKUP = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+_HEADER_CLEANUP = re.compile(r'[^a-z ]+')
+_NUMBER_CLEANUP = str.maketrans('', '', '$€£ \u00a0')
+# "1,200" or "1,200.50": commas group thousands
+_THOUSANDS_COMMAS = re.compile(r'-?\d{1,3}(,\d{3})+(\.\d*)?')
+# "1,5", "12,50" or "1.234,56": a final comma followed by 1-2 digits is the decimal separator
+_DECIMAL_COMMA = re.compile(r'-?(\d{1,3}(\.\d{3})+|\d+),\d{1,2}')
+
+
+class ItemImportError(ValueError):
+    """Raised when rows cannot be mapped to item fields at all"""
+
+
+class ImportResult:
+    """Items read by an import plus the rows that were rejected"""
+
+    def __init__(self) -> None:
+        self.items = LineItems()
+        self.errors: List[Tuple[int, str]] = []
+        self.rows = 0
+
+    def __repr__(self) -> str:
+        return f"ImportResult(items={len(self.items)}, errors={len(self.errors)})"
+
+
+def _header_field(cell) -> Optional[str]:
+    key = _HEADER_CLEANUP.sub('', str(cell or '').lower()).strip()
+    return _ALIAS_LOOKUP.get(' '.join(key.split()))
+
+
+def parse_number(value) -> float:
+    """Parse a quantity or rate cell, allowing currency symbols and thousands separators
+
+    Commas are read as thousands separators when they group digits in threes
+    and as the decimal separator when a single one is followed by 1-2 digits.
+    Any other use of commas is ambiguous and raises ValueError.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).translate(_NUMBER_CLEANUP)
+    if text.startswith('(') and text.endswith(')'):
+        # Accounting notation for negatives
+        text = '-' + text[1:-1]
+    if ',' in text:
+        if _THOUSANDS_COMMAS.fullmatch(text):
+            text = text.replace(',', '')
+        elif _DECIMAL_COMMA.fullmatch(text):
+            text = text.replace('.', '').replace(',', '.')
+        else:
+            raise ValueError(f"ambiguous number {value!r}")
+    return float(text)
+
+
+def detect_columns(first_row: Sequence[Any]) -> Tuple[Dict[str, int], bool]:
+    """Work out which column holds each item field.
+
+    Returns:
+        (field -> column index, whether the first row is a header)
+    """
+    columns = {}
+    for index, cell in enumerate(first_row):
+        field = _header_field(cell)
+        if field and field not in columns:
+            columns[field] = index
+    if all(field in columns for field in REQUIRED_COLUMNS):
+        return columns, True
+
+    layout = POSITIONAL_LAYOUTS.get(len(first_row))
+    if layout is None:
+        missing = ', '.join(field for field in REQUIRED_COLUMNS if field not in columns)
+        raise ItemImportError(f"Could not find the {missing} column(s); add a header row "
+                              f"with {', '.join(REQUIRED_COLUMNS)}")
+    return {field: index for index, field in enumerate(layout)}, False
+
+
+def compile_row_validator(columns: Dict[str, int]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """Build a function converting one row to an item dict for a fixed column layout.
+
+    Column positions are resolved once here, so validating each row is just
+    indexing and number parsing. The returned function raises ValueError
+    with a readable message for invalid rows.
+    """
+    name_at = columns['name']
+    quantity_at = columns['quantity']
+    rate_at = columns['rate']
+    description_at = columns.get('description')
+    unit_at = columns.get('unit')
+    width = max(columns.values()) + 1
+
+    def validate(row: Sequence[Any]) -> Dict[str, Any]:
+        if len(row) < width:
+            row = list(row) + [''] * (width - len(row))
+        name = str(row[name_at] or '').strip()
+        if not name:
+            raise ValueError("missing item name")
+        try:
+            quantity = parse_number(row[quantity_at])
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid quantity {row[quantity_at]!r}")
+        try:
+            rate = parse_number(row[rate_at])
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid rate {row[rate_at]!r}")
+        item = {
+            'name': name,
+            'description': str(row[description_at] or '').strip() if description_at is not None else '',
+            'quantity': quantity,
+            'rate': rate,
+        }
+        if unit_at is not None and row[unit_at]:
+            item['unit'] = str(row[unit_at]).strip()
+        return item
+
+    return validate
+
+
+def import_rows(rows: Iterable[Sequence[Any]], chunk_size: int = CHUNK_SIZE,
+                progress: Optional[Callable[[int], None]] = None) -> ImportResult:
+    """Validate rows into items, appending them to the result a chunk at a time.
+
+    The first non-blank row decides the column layout (see detect_columns).
+    Invalid rows are collected in ``result.errors`` as (row number, message)
+    rather than stopping the import. ``progress(rows_read)`` is called after
+    each chunk and may raise to abort.
+    """
+    result = ImportResult()
+    validate = None
+    chunk = []
+    for line_number, row in enumerate(rows, start=1):
+        if not any(str(cell).strip() for cell in row if cell is not None):
+            continue
+        if validate is None:
+            columns, has_header = detect_columns(row)
+            validate = compile_row_validator(columns)
+            if has_header:
+                continue
+        result.rows += 1
+        try:
+            chunk.append(validate(row))
+        except ValueError as e:
+            result.errors.append((line_number, str(e)))
+        if len(chunk) >= chunk_size:
+            result.items.extend(chunk)
+            chunk = []
+            if progress:
+                progress(result.rows)
+    result.items.extend(chunk)
+    if progress:
+        progress(result.rows)
+    return result
+
+
+def iter_text_rows(text_file, sample_size: int = 4096) -> Iterator[List[str]]:
+    """Rows of a seekable delimited text stream, sniffing comma, tab or semicolon separators"""
+    sample = text_file.read(sample_size)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=',\t;')
+    except csv.Error:
+        dialect = csv.excel_tab if '\t' in sample else csv.excel
+    text_file.seek(0)
+    yield from csv.reader(text_file, dialect)
+
+
+def iter_xlsx_rows(path) -> Iterator[Sequence[Any]]:
+    """Rows of the first worksheet of an XLSX workbook (requires openpyxl)"""
+    if not OPENPYXL_AVAILABLE:
+        raise ItemImportError("Reading Excel files requires openpyxl (pip install openpyxl)")
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield ['' if cell is None else cell for cell in row]
+    finally:
+        workbook.close()
+
+
+def import_item_file(path, chunk_size: int = CHUNK_SIZE,
+                     progress: Optional[Callable[[int], None]] = None) -> ImportResult:
+    """Import line items from a .csv/.tsv/.txt or .xlsx file"""
+    suffix = Path(path).suffix.lower()
+    if suffix in ('.xlsx', '.xlsm'):
+        return import_rows(iter_xlsx_rows(path), chunk_size, progress)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+        return import_rows(iter_text_rows(file), chunk_size, progress)
+
+
+def import_pasted_items(text: str, chunk_size: int = CHUNK_SIZE,
+                        progress: Optional[Callable[[int], None]] = None) -> ImportResult:
+    """Import line items from clipboard text copied out of a spreadsheet or CSV file"""
+    return import_rows(iter_text_rows(io.StringIO(text)), chunk_size, progress)
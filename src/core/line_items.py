@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Compact columnar storage for invoice line items
+Keeps quantity, rate and amount in typed arrays and interns repeated strings
+"""
+
+import sys
+from array import array
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import yaml
+
+try:
+    from .totals import line_amount
+except ImportError:
+    # Running as a standalone script
+    from totals import line_amount
+
+_TEXT_COLUMNS = ('name', 'description', 'unit')
+_NUMBER_COLUMNS = ('quantity', 'rate')
+_ARRAY_COLUMNS = ('quantity', 'rate', 'amount_cents', 'name_id', 'description_id', 'unit_id', 'flags')
+_KNOWN_KEYS = frozenset(_TEXT_COLUMNS + _NUMBER_COLUMNS)
+
+# Bits of the per-row flags column: which numbers were ints and which text keys were present
+_INT_FLAGS = {'quantity': 1, 'rate': 2}
+_PRESENT_FLAGS = {'name': 4, 'description': 8, 'unit': 16}
+
+
+class LineItems:
+    """Columnar container for invoice line items.
+
+    Quantities and rates are stored as doubles, line amounts as integer cents
+    (computed once with the exact Decimal rules from totals.py), and name,
+    description and unit as 32-bit indexes into a per-container string pool so
+    repeated text is stored once. Indexing and iteration return plain item
+    dicts so code written against the YAML list form keeps working.
+
+    Converting back gives the dicts that went in: a flags byte per row
+    remembers integer quantities and rates and which text keys were present,
+    and any other keys (or non-string text values) are kept as per-row extras.
+    """
+
+    __slots__ = ('quantity', 'rate', 'amount_cents', 'name_id', 'description_id', 'unit_id',
+                 'flags', '_extras', '_strings', '_string_ids')
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = ()) -> None:
+        self.quantity = array('d')
+        self.rate = array('d')
+        self.amount_cents = array('q')
+        self.name_id = array('I')
+        self.description_id = array('I')
+        self.unit_id = array('I')
+        self.flags = array('B')
+        # Keys LineItems has no column for, by row (None for the usual rows)
+        self._extras: List[Optional[Dict[str, Any]]] = []
+        self._strings: List[str] = ['']
+        self._string_ids: Dict[str, int] = {'': 0}
+        self.extend(items)
+
+    def _intern(self, value) -> int:
+        """Pool an optional text field and return its index"""
+        if not value:
+            return 0
+        text = str(value)
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(sys.intern(text))
+            self._string_ids[text] = string_id
+        return string_id
+
+    def text(self, column: str, index: int) -> str:
+        """Text value of 'name', 'description' or 'unit' for a row"""
+        return self._strings[getattr(self, column + '_id')[index]]
+
+    def number(self, column: str, index: int) -> Union[int, float]:
+        """'quantity' or 'rate' for a row, as an int if it was given as one"""
+        value = getattr(self, column)[index]
+        return int(value) if self.flags[index] & _INT_FLAGS[column] else value
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Dict[str, Any]]) -> 'LineItems':
+        """Build a container from the YAML list-of-dicts form"""
+        if isinstance(items, LineItems):
+            return items
+        return cls(items)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert back to the YAML list-of-dicts form"""
+        return [self._row_dict(i) for i in range(len(self))]
+
+    # Row access
+
+    @staticmethod
+    def _cents(quantity: float, rate: float) -> int:
+        return int(line_amount(quantity, rate).scaleb(2))
+
+    def _encode(self, item: Dict[str, Any]) -> Tuple[float, float, int, int, int, int, int,
+                                                      Optional[Dict[str, Any]]]:
+        """Column values for one item dict, in _ARRAY_COLUMNS order plus its extras"""
+        flags = 0
+        numbers = []
+        for column in _NUMBER_COLUMNS:
+            value = item[column]
+            if isinstance(value, int) and not isinstance(value, bool):
+                flags |= _INT_FLAGS[column]
+            numbers.append(float(value))
+        quantity, rate = numbers
+        extras = {key: value for key, value in item.items() if key not in _KNOWN_KEYS}
+        text_ids = []
+        for column in _TEXT_COLUMNS:
+            value = item.get(column)
+            if isinstance(value, str):
+                flags |= _PRESENT_FLAGS[column]
+                text_ids.append(self._intern(value))
+            else:
+                if column in item:
+                    extras[column] = value
+                text_ids.append(0)
+        return (quantity, rate, self._cents(quantity, rate), *text_ids, flags, extras or None)
+
+    def _row_dict(self, index: int) -> Dict[str, Any]:
+        strings = self._strings
+        flags = self.flags[index]
+        item = {}
+        for column in ('name', 'description'):
+            if flags & _PRESENT_FLAGS[column]:
+                item[column] = strings[getattr(self, column + '_id')[index]]
+        item['quantity'] = self.number('quantity', index)
+        item['rate'] = self.number('rate', index)
+        if flags & _PRESENT_FLAGS['unit']:
+            item['unit'] = strings[self.unit_id[index]]
+        extras = self._extras[index]
+        if extras:
+            item.update(extras)
+        return item
+
+    def amount(self, index: int) -> Decimal:
+        """Exact line amount for a row"""
+        return Decimal(self.amount_cents[index]).scaleb(-2)
+
+    def amounts(self) -> List[Decimal]:
+        """Exact line amounts for all rows"""
+        return [Decimal(c).scaleb(-2) for c in self.amount_cents]
+
+    def subtotal(self) -> Decimal:
+        """Sum of all line amounts, computed on the integer cents column"""
+        return Decimal(sum(self.amount_cents)).scaleb(-2)
+
+    def rows(self) -> Iterator[Tuple[str, str, Union[int, float], Union[int, float], Decimal]]:
+        """Iterate (name, description, quantity, rate, amount) tuples without building dicts"""
+        strings = self._strings
+        for i in range(len(self)):
+            yield (strings[self.name_id[i]], strings[self.description_id[i]],
+                   self.number('quantity', i), self.number('rate', i),
+                   Decimal(self.amount_cents[i]).scaleb(-2))
+
+    # Mutation
+
+    def append(self, item: Dict[str, Any]) -> None:
+        """Append one item dict"""
+        *values, extras = self._encode(item)
+        for column, value in zip(_ARRAY_COLUMNS, values):
+            getattr(self, column).append(value)
+        self._extras.append(extras)
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Append many items"""
+        if isinstance(items, LineItems):
+            self.quantity.extend(items.quantity)
+            self.rate.extend(items.rate)
+            self.amount_cents.extend(items.amount_cents)
+            self.flags.extend(items.flags)
+            self._extras.extend(dict(extras) if extras else None for extras in items._extras)
+            remap = [self._intern(text) for text in items._strings]
+            for column in _TEXT_COLUMNS:
+                getattr(self, column + '_id').extend(remap[i] for i in getattr(items, column + '_id'))
+            return
+        for item in items:
+            self.append(item)
+
+    def copy(self) -> 'LineItems':
+        """Independent copy (strings are immutable and shared)"""
+        clone = LineItems()
+        clone.extend(self)
+        return clone
+
+    __copy__ = copy
+
+    def __deepcopy__(self, memo) -> 'LineItems':
+        return self.copy()
+
+    # Sequence protocol
+
+    def __len__(self) -> int:
+        return len(self.quantity)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self._row_dict(i)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line item index out of range")
+        return self._row_dict(index)
+
+    def __setitem__(self, index: int, item: Dict[str, Any]) -> None:
+        *values, extras = self._encode(item)
+        for column, value in zip(_ARRAY_COLUMNS, values):
+            getattr(self, column)[index] = value
+        self._extras[index] = extras
+
+    def __delitem__(self, index: int) -> None:
+        for column in _ARRAY_COLUMNS:
+            del getattr(self, column)[index]
+        del self._extras[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LineItems, list)):
+            return self.to_dicts() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LineItems({len(self)} items)"
+
+
+def _represent_line_items(dumper, data):
+    return dumper.represent_list(data.to_dicts())
+
+
+# Dump LineItems as a plain YAML list so saved files keep the usual format
+yaml.add_representer(LineItems, _represent_line_items)
+yaml.add_representer(LineItems, _represent_line_items, Dumper=yaml.SafeDumper)
+if hasattr(yaml, 'CSafeDumper'):
+    yaml.add_representer(LineItems, _represent_line_items, Dumper=yaml.CSafeDumper)
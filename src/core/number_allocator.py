@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Invoice number allocation for InvoiceArtisan
+Hands out collision-free invoice numbers from an SQLite-backed sequence,
+reserving them in blocks so parallel workers rarely touch the database
+"""
+
+import os
+import re
+import sqlite3
+import string
+import threading
+from datetime import date as date_type, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .invoice_store import DEFAULT_DB_PATH as DEFAULT_STORE_PATH
+except ImportError:
+    # Running as a standalone script
+    from invoice_store import DEFAULT_DB_PATH as DEFAULT_STORE_PATH
+
+# Relative to the data root (see default_sequence_db), not the working directory
+DEFAULT_SEQUENCE_DB = os.path.join('output', 'invoice_numbers.db')
+DEFAULT_PREFIX = "INV-"
+DEFAULT_FORMAT = "{prefix}{date}{suffix}"
+
+
+def _configured_numbering() -> Tuple[str, str]:
+    """Read number_prefix and number_format from app_config.yaml"""
+    try:
+        try:
+            from ..utils.config import get_config_value
+        except ImportError:
+            from utils.config import get_config_value
+    except ImportError:
+        return DEFAULT_PREFIX, DEFAULT_FORMAT
+    prefix = get_config_value('invoice', 'default', 'number_prefix', default=DEFAULT_PREFIX)
+    number_format = get_config_value('invoice', 'default', 'number_format', default=DEFAULT_FORMAT)
+    return str(prefix), str(number_format)
+
+
+def default_sequence_db() -> str:
+    """paths.numbers_db from app_config.yaml, anchored to the project (or executable) folder"""
+    try:
+        try:
+            from ..utils.config import get_data_path
+        except ImportError:
+            from utils.config import get_data_path
+    except ImportError:
+        return DEFAULT_SEQUENCE_DB
+    return str(get_data_path('paths', 'numbers_db', default=DEFAULT_SEQUENCE_DB))
+
+
+class InvoiceNumberAllocator:
+    """Allocates unique invoice numbers across threads and processes.
+
+    Each prefix/format has its own counter in the sequence database, restarted
+    per day when the format contains {date}.
+    Numbers are claimed from the database in blocks of ``block_size`` inside
+    an immediate transaction, then handed out locally, so concurrent workers
+    never receive the same number. Unused numbers from a claimed block are
+    skipped when the process exits, leaving gaps but never duplicates.
+
+    The first time a counter is used it starts after the highest matching
+    number already in the invoice store (``store_path``), so losing the
+    sequence database doesn't reissue numbers of saved invoices.
+
+    The number format supports {prefix}, {date} (YYYYMMDD), {seq} (the raw
+    counter) and {suffix} (the counter as "-001").
+    """
+
+    def __init__(self, db_path: Optional[str] = None, prefix: Optional[str] = None,
+                 number_format: Optional[str] = None, block_size: int = 100, width: int = 3,
+                 store_path: Optional[str] = DEFAULT_STORE_PATH):
+        """Open the sequence database; its path, the prefix and the format default to app_config.yaml.
+
+        ``store_path`` is the InvoiceStore database used to seed new counters;
+        None starts them at 1.
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        configured_prefix, configured_format = _configured_numbering()
+        self.prefix = configured_prefix if prefix is None else prefix
+        self.number_format = number_format or configured_format
+        self.block_size = block_size
+        self.width = width
+        self.store_path = store_path
+
+        self.db_path = str(db_path) if db_path else default_sequence_db()
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, List[int]] = {}  # key -> [next, end)
+        self._connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                           check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sequences (key TEXT PRIMARY KEY, next_value INTEGER NOT NULL)"
+        )
+
+    def close(self):
+        """Close the sequence database"""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _date_text(self, when) -> str:
+        if when is None:
+            when = datetime.now()
+        if isinstance(when, (datetime, date_type)):
+            return when.strftime('%Y%m%d')
+        return str(when).replace('-', '')
+
+    def _sequence_key(self, date_text: str) -> str:
+        # Formats that include the date restart their counter every day
+        scope = date_text if '{date' in self.number_format else ''
+        return f"{self.prefix}|{self.number_format}|{scope}"
+
+    def _format(self, date_text: str, seq: int) -> str:
+        return self.number_format.format(prefix=self.prefix, date=date_text,
+                                         suffix=f"-{seq:0{self.width}d}", seq=seq)
+
+    def _number_pattern(self, date_text: str) -> 're.Pattern':
+        """Regex matching numbers this allocator issues for a date, capturing the counter"""
+        parts = []
+        seq_seen = False
+        for literal, field, _, _ in string.Formatter().parse(self.number_format):
+            parts.append(re.escape(literal))
+            if field in ('seq', 'suffix'):
+                counter = '(?P=seq)' if seq_seen else r'(?P<seq>\d+)'
+                parts.append(counter if field == 'seq' else '-' + counter)
+                seq_seen = True
+            elif field == 'prefix':
+                parts.append(re.escape(self.prefix))
+            elif field == 'date':
+                parts.append(re.escape(date_text))
+            elif field is not None:
+                parts.append('.*?')
+        return re.compile(''.join(parts) + '$')
+
+    def _existing_numbers(self) -> Iterable[str]:
+        """Invoice numbers in the invoice store that start with this prefix"""
+        if not self.store_path or not os.path.exists(self.store_path):
+            return []
+        try:
+            connection = sqlite3.connect(f"file:{Path(self.store_path).resolve().as_posix()}?mode=ro", uri=True)
+            try:
+                rows = connection.execute("SELECT number FROM invoices WHERE substr(number, 1, ?) = ?",
+                                          (len(self.prefix), self.prefix)).fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read existing invoice numbers from {self.store_path}: {e}")
+            return []
+        return [row[0] for row in rows]
+
+    def _first_value(self, date_text: str) -> int:
+        """Where a new counter starts: after the highest existing number it would issue"""
+        pattern = self._number_pattern(date_text)
+        highest = 0
+        for number in self._existing_numbers():
+            match = pattern.match(number)
+            if match:
+                highest = max(highest, int(match.group('seq')))
+        return highest + 1
+
+    def _claim(self, key: str, count: int, date_text: str) -> Tuple[int, int]:
+        """Atomically claim ``count`` consecutive counter values from the database"""
+        connection = self._connection
+        # Seeding reads another database, so do it before taking the write lock
+        known = connection.execute("SELECT 1 FROM sequences WHERE key = ?", (key,)).fetchone()
+        first = 1 if known else self._first_value(date_text)
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT next_value FROM sequences WHERE key = ?", (key,)).fetchone()
+            start = row[0] if row else first
+            connection.execute(
+                "INSERT INTO sequences (key, next_value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET next_value = excluded.next_value",
+                (key, start + count)
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return start, start + count
+
+    def next_number(self, when=None) -> str:
+        """Allocate the next invoice number for a date (today by default)"""
+        return self.allocate(1, when)[0]
+
+    def allocate(self, count: int, when=None) -> List[str]:
+        """Allocate ``count`` invoice numbers for a date"""
+        date_text = self._date_text(when)
+        key = self._sequence_key(date_text)
+        numbers = []
+        with self._lock:
+            while len(numbers) < count:
+                block = self._blocks.get(key)
+                if not block or block[0] >= block[1]:
+                    start, end = self._claim(key, max(self.block_size, count - len(numbers)), date_text)
+                    block = self._blocks[key] = [start, end]
+                take = min(block[1] - block[0], count - len(numbers))
+                numbers.extend(self._format(date_text, seq) for seq in range(block[0], block[0] + take))
+                block[0] += take
+        return numbers
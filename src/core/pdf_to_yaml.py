@@ -2,10 +2,19 @@
 
 import sys
 import re
+import time
 import yaml
 from PyPDF2 import PdfReader
 from datetime import datetime
 
+try:
+    from ..utils.instrumentation import phases
+    from ..utils import metrics
+except ImportError:
+    # Imported as top-level 'core' with src on the path
+    from utils.instrumentation import phases
+    from utils import metrics
+
 def extract_amount(text):
     """Extract amount from text containing currency."""
     try:
@@ -136,13 +145,24 @@ def parse_invoice_items(text):
     
     return items
 
-def pdf_to_yaml(pdf_file):
-    """Convert PDF invoice to YAML template."""
+def pdf_to_yaml(pdf_file, output_file=None):
+    """Convert PDF invoice to YAML template.
+    
+    Writes to ``output_file``, or ``<pdf name>_template.yaml`` next to the PDF.
+    """
+    timing = phases('pdf_to_yaml')
     try:
+        timing.enter('extract_text')
+        extract_started = time.perf_counter()
         reader = PdfReader(pdf_file)
         text = ""
         for page in reader.pages:
             text += page.extract_text() + "\n"
+        extract_seconds = time.perf_counter() - extract_started
+        metrics.PAGES_EXTRACTED.inc(len(reader.pages))
+        metrics.EXTRACTION_SECONDS.inc(extract_seconds)
+        if extract_seconds > 0:
+            metrics.EXTRACTION_PAGES_PER_SECOND.set(len(reader.pages) / extract_seconds)
         
         print("\nExtracted text from PDF:")
         print("=" * 50)
@@ -161,6 +181,7 @@ def pdf_to_yaml(pdf_file):
         }
         
         # Extract invoice number
+        timing.enter('parse_invoice')
         invoice_number = re.search(r'#\s*(INV-\d+)', text)
         if invoice_number:
             invoice_data['invoice']['number'] = invoice_number.group(1).strip()
@@ -235,6 +256,7 @@ def pdf_to_yaml(pdf_file):
             print(f"Using default due date: {invoice_data['invoice']['due_date']}")
 
         # Extract company information (Syed Muhammad Maaz)
+        timing.enter('parse_parties')
         company_info = {
             'name': 'Syed Muhammad Maaz',
             'address': 'B-118, 5th Street',
@@ -264,6 +286,7 @@ def pdf_to_yaml(pdf_file):
         print(client_info)
         
         # Extract items
+        timing.enter('parse_items')
         items_section = text.split('Item & Description')[1].split('Notes')[0]
         print("\nItems section text:")
         print(items_section)
@@ -296,6 +319,7 @@ def pdf_to_yaml(pdf_file):
         print(invoice_data['items'])
         
         # Extract notes
+        timing.enter('parse_notes_terms')
         notes_match = re.search(r'Notes\s*(.*?)(?=Terms & Conditions|$)', text, re.DOTALL)
         if notes_match:
             invoice_data['notes'] = notes_match.group(1).strip()
@@ -308,7 +332,9 @@ def pdf_to_yaml(pdf_file):
             print(f"\nFound terms: {invoice_data['terms']}")
         
         # Generate YAML file
-        output_file = pdf_file.rsplit('.', 1)[0] + '_template.yaml'
+        timing.enter('write_yaml')
+        if not output_file:
+            output_file = str(pdf_file).rsplit('.', 1)[0] + '_template.yaml'
         with open(output_file, 'w') as f:
             yaml.dump(invoice_data, f, default_flow_style=False, sort_keys=False)
         
@@ -320,6 +346,8 @@ def pdf_to_yaml(pdf_file):
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        timing.close()
 
 def main():
     if len(sys.argv) != 2:
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Accounts-receivable aging and revenue reports for InvoiceArtisan
+Streams invoice YAML files into a columnar ledger, caching each file's
+facts so re-running a report only parses new or changed invoices
+"""
+
+import csv
+import hashlib
+import json
+import os
+from array import array
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+try:
+    from .invoice_store import YAML_EXTENSIONS, load_yaml, invoice_record
+except ImportError:
+    # Running as a standalone script
+    from invoice_store import YAML_EXTENSIONS, load_yaml, invoice_record
+
+# One cache file per scanned directory, kept out of the user's invoice folders
+CACHE_DIR = os.path.join('output', 'temp', 'report_cache')
+CACHE_VERSION = 2
+
+# (label, first day overdue, last day overdue); 'current' is not yet due
+AGING_BUCKETS = (
+    ('current', None, 0),
+    ('1-30', 1, 30),
+    ('31-60', 31, 60),
+    ('61-90', 61, 90),
+    ('90+', 91, None),
+)
+# Unpaid invoices whose due date is missing or unparseable
+UNKNOWN_BUCKET = 'unknown'
+
+PAID_STATUSES = ('paid', 'void', 'cancelled')
+
+
+def _money(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def _parse_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def parse_report_date(value) -> date:
+    """Parse a YYYY-MM-DD report date, raising ValueError with a readable message"""
+    parsed = _parse_date(value)
+    if parsed is None:
+        raise ValueError(f"Invalid date {value!r}: expected YYYY-MM-DD")
+    return parsed
+
+
+def default_cache_path(directory) -> Path:
+    """Cache file for a scanned directory under CACHE_DIR"""
+    key = hashlib.sha1(str(Path(directory).resolve()).encode('utf-8')).hexdigest()[:16]
+    return Path(CACHE_DIR) / f"{key}.json"
+
+
+def invoice_facts(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the per-invoice facts the reports aggregate over"""
+    record = invoice_record(data)
+    invoice = data.get('invoice') or {}
+    status = str(invoice.get('status', '')).lower()
+    return {
+        'number': record['number'],
+        'client': record['client'],
+        'date': record['date'],
+        'due_date': record['due_date'],
+        'total_cents': record['total_cents'],
+        'paid': bool(invoice.get('paid')) or status in PAID_STATUSES,
+    }
+
+
+class InvoiceLedger:
+    """Columnar invoice facts for a directory, with a per-file cache.
+
+    Each column is a parallel list/array indexed by invoice; totals are kept
+    as integer cents so aggregation is exact.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        """Create an empty ledger; the cache defaults to default_cache_path() of the scanned directory"""
+        self.cache_path = cache_path
+        self.paths: List[str] = []
+        self.numbers: List[str] = []
+        self.clients: List[str] = []
+        self.dates: List[str] = []
+        self.due_dates: List[str] = []
+        self.total_cents = array('q')
+        self.paid = array('b')
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _load_cache(self, cache_path: Path) -> Dict[str, Any]:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as file:
+                cache = json.load(file)
+            if cache.get('version') == CACHE_VERSION:
+                return cache.get('files', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_cache(self, cache_path: Path, files: Dict[str, Any]) -> None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(cache_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': CACHE_VERSION, 'files': files}, file)
+        os.replace(temp_path, cache_path)
+
+    def _append(self, path: str, facts: Dict[str, Any]) -> None:
+        self.paths.append(path)
+        self.numbers.append(facts['number'])
+        self.clients.append(facts['client'])
+        self.dates.append(facts['date'])
+        self.due_dates.append(facts['due_date'])
+        self.total_cents.append(facts['total_cents'])
+        self.paid.append(1 if facts['paid'] else 0)
+
+    def scan(self, directory: str, recursive: bool = True) -> Dict[str, int]:
+        """Load every invoice YAML under a directory, parsing only new or changed files.
+
+        Returns:
+            Counts of 'parsed', 'cached', 'skipped' and 'removed' files
+        """
+        root = Path(directory)
+        cache_path = Path(self.cache_path) if self.cache_path else default_cache_path(root)
+        cached = self._load_cache(cache_path)
+        files = {}
+        stats = {'parsed': 0, 'cached': 0, 'skipped': 0, 'removed': 0}
+
+        paths = root.rglob('*') if recursive else root.glob('*')
+        for path in sorted(paths):
+            if path.suffix.lower() not in YAML_EXTENSIONS or not path.is_file():
+                continue
+            key = str(path.resolve())
+            stat = path.stat()
+            entry = cached.get(key)
+            if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+                stats['cached'] += 1
+            else:
+                try:
+                    data = load_yaml(path)
+                    facts = invoice_facts(data) if isinstance(data, dict) and isinstance(data.get('invoice'), dict) else None
+                except (OSError, yaml.YAMLError, KeyError, TypeError, ValueError, ArithmeticError) as e:
+                    print(f"Warning: Could not read invoice {path}: {e}")
+                    facts = None
+                entry = {'mtime': stat.st_mtime, 'size': stat.st_size, 'facts': facts}
+                stats['parsed'] += 1
+
+            files[key] = entry
+            if entry['facts'] is None:
+                stats['skipped'] += 1
+            else:
+                self._append(key, entry['facts'])
+
+        stats['removed'] = len(set(cached) - set(files))
+        if stats['parsed'] or stats['removed'] or not cache_path.exists():
+            self._save_cache(cache_path, files)
+        return stats
+
+
+def aging_report(ledger: InvoiceLedger, as_of=None) -> List[Dict[str, Any]]:
+    """Outstanding balances per client, bucketed by days past due.
+
+    Invoices without a usable due date go in the UNKNOWN_BUCKET column
+    rather than being counted as current.
+    """
+    as_of = parse_report_date(as_of) if as_of else date.today()
+    labels = [label for label, _, _ in AGING_BUCKETS] + [UNKNOWN_BUCKET]
+    balances = defaultdict(lambda: [0] * len(labels))
+
+    for client, due_date, cents, paid in zip(ledger.clients, ledger.due_dates, ledger.total_cents, ledger.paid):
+        if paid:
+            continue
+        due = _parse_date(due_date)
+        if due is None:
+            balances[client][-1] += cents
+            continue
+        days_overdue = (as_of - due).days
+        for index, (_, first, last) in enumerate(AGING_BUCKETS):
+            if (first is None or days_overdue >= first) and (last is None or days_overdue <= last):
+                balances[client][index] += cents
+                break
+
+    rows = []
+    for client in sorted(balances):
+        cents = balances[client]
+        row = {'client': client}
+        row.update({label: _money(cents[i]) for i, label in enumerate(labels)})
+        row['total'] = _money(sum(cents))
+        rows.append(row)
+    return rows
+
+
+def revenue_report(ledger: InvoiceLedger) -> List[Dict[str, Any]]:
+    """Invoiced revenue per client per month (YYYY-MM of the invoice date)"""
+    totals = defaultdict(lambda: [0, 0])  # (client, month) -> [invoices, cents]
+    for client, invoice_date, cents in zip(ledger.clients, ledger.dates, ledger.total_cents):
+        month = invoice_date[:7] if _parse_date(invoice_date) else 'unknown'
+        bucket = totals[(client, month)]
+        bucket[0] += 1
+        bucket[1] += cents
+
+    return [
+        {'client': client, 'month': month, 'invoices': count, 'revenue': _money(cents)}
+        for (client, month), (count, cents) in sorted(totals.items())
+    ]
+
+
+def write_report(rows: List[Dict[str, Any]], output, output_format: str = 'csv') -> None:
+    """Write report rows as CSV or JSON to a path or open text file.
+
+    Money is written as decimal strings ("150.50") in both formats so JSON
+    consumers do not get binary floating-point amounts.
+    """
+    if output_format not in ('csv', 'json'):
+        raise ValueError(f"Unsupported report format '{output_format}'")
+
+    def _write(file):
+        if output_format == 'json':
+            json.dump(rows, file, indent=2, default=str)
+            file.write('\n')
+        elif rows:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    if hasattr(output, 'write'):
+        _write(output)
+    else:
+        with open(output, 'w', encoding='utf-8', newline='') as file:
+            _write(file)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Totals engine for InvoiceArtisan
+Computes line amounts, subtotal, tax and total once using exact Decimal rounding
+"""
+
+import importlib.util
+from decimal import Decimal, ROUND_HALF_UP
+from typing import List, Optional, Sequence
+
+# Optional NumPy acceleration for very large item lists; NumPy itself is only
+# imported the first time a list is long enough to use it
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+CENT = Decimal('0.01')
+
+# Item lists at least this long use the NumPy path when it is available
+NUMPY_THRESHOLD = 10000
+
+# Fixed-point scales used by the NumPy path (3 decimals for quantity, cents for rate)
+_QUANTITY_SCALE = 1000
+_RATE_SCALE = 100
+_INT64_LIMIT = 2 ** 62
+
+
+def to_decimal(value) -> Decimal:
+    """Convert a YAML/GUI number (int, float, str or Decimal) to Decimal exactly as written"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        # repr() gives the shortest string that round-trips, i.e. what the user typed
+        return Decimal(repr(value))
+    return Decimal(str(value).strip() or '0')
+
+
+def round_money(amount) -> Decimal:
+    """Round an amount to cents using half-up rounding"""
+    return to_decimal(amount).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class InvoiceTotals:
+    """Line amounts and invoice totals, rounded to cents"""
+
+    __slots__ = ('amounts', 'subtotal', 'tax_rate', 'tax', 'total', 'key')
+
+    def __init__(self, amounts: List[Decimal], tax_rate, subtotal: Optional[Decimal] = None,
+                 key: Optional[tuple] = None) -> None:
+        self.amounts = amounts
+        # items_key() of the items the amounts were computed from, if known
+        self.key = key
+        self.subtotal = sum(amounts, Decimal('0.00')) if subtotal is None else subtotal
+        self.tax_rate = to_decimal(tax_rate or 0)
+        self.tax = round_money(self.subtotal * self.tax_rate)
+        self.total = self.subtotal + self.tax
+
+    def __repr__(self) -> str:
+        return (f"InvoiceTotals(items={len(self.amounts)}, subtotal={self.subtotal}, "
+                f"tax={self.tax}, total={self.total})")
+
+
+    def matches(self, items, tax_rate) -> bool:
+        """Whether these totals were computed from the same item values and tax rate"""
+        return (self.key is not None and self.tax_rate == to_decimal(tax_rate or 0)
+                and self.key == items_key(items))
+
+
+def items_key(items) -> tuple:
+    """Key of the values line amounts depend on, used to tell whether cached totals are stale"""
+    if hasattr(items, 'amount_cents'):
+        return tuple(items.amount_cents)
+    return tuple((item['quantity'], item['rate']) for item in items)
+
+
+def amount_cents(amount) -> int:
+    """Convert a rounded money amount to integer cents"""
+    return int(round_money(amount).scaleb(2))
+
+
+def line_amount(quantity, rate) -> Decimal:
+    """Amount for a single line item, rounded to cents"""
+    return round_money(to_decimal(quantity) * to_decimal(rate))
+
+
+def _line_amounts_decimal(quantities, rates) -> List[Decimal]:
+    """Exact per-line amounts computed with Decimal arithmetic"""
+    return [line_amount(q, r) for q, r in zip(quantities, rates)]
+
+
+def _line_amounts_numpy(quantities, rates) -> Optional[List[Decimal]]:
+    """Per-line amounts computed in integer fixed point with NumPy.
+
+    Returns None when a value cannot be represented exactly at the fixed-point
+    scales, in which case the caller falls back to the Decimal path.
+    """
+    import numpy as np
+
+    q = np.asarray(quantities, dtype=np.float64) * _QUANTITY_SCALE
+    r = np.asarray(rates, dtype=np.float64) * _RATE_SCALE
+    q_int = np.rint(q)
+    r_int = np.rint(r)
+
+    # Only exact if every value already sits on the fixed-point grid
+    if not (np.allclose(q, q_int, rtol=0, atol=1e-6) and np.allclose(r, r_int, rtol=0, atol=1e-6)):
+        return None
+    if float(np.abs(q_int).max(initial=0)) * float(np.abs(r_int).max(initial=0)) >= _INT64_LIMIT:
+        return None
+
+    # Product is in units of 1e-5 dollars; round half-up (away from zero) to cents
+    scaled = q_int.astype(np.int64) * r_int.astype(np.int64)
+    step = (_QUANTITY_SCALE * _RATE_SCALE) // 100
+    cents = np.sign(scaled) * ((np.abs(scaled) + step // 2) // step)
+    return [Decimal(int(c)).scaleb(-2) for c in cents.tolist()]
+
+
+def compute_totals(items, tax_rate=0, use_numpy: Optional[bool] = None) -> InvoiceTotals:
+    """Compute line amounts, subtotal, tax and total for a list of items.
+
+    Args:
+        items: List of item dicts with 'quantity' and 'rate' keys, or a LineItems
+            container whose precomputed amount column is used directly
+        tax_rate: Tax rate as a fraction (0.08 for 8%)
+        use_numpy: Force (True) or disable (False) the NumPy path; by default it
+            is used for lists longer than NUMPY_THRESHOLD when NumPy is installed
+    """
+    if hasattr(items, 'amount_cents'):
+        # LineItems already holds exact integer-cent amounts
+        return InvoiceTotals(items.amounts(), tax_rate, subtotal=items.subtotal(), key=items_key(items))
+
+    quantities = [item['quantity'] for item in items]
+    rates = [item['rate'] for item in items]
+
+    if use_numpy is None:
+        use_numpy = NUMPY_AVAILABLE and len(quantities) >= NUMPY_THRESHOLD
+
+    amounts = None
+    if use_numpy and NUMPY_AVAILABLE:
+        amounts = _line_amounts_numpy(quantities, rates)
+    if amounts is None:
+        amounts = _line_amounts_decimal(quantities, rates)
+
+    return InvoiceTotals(amounts, tax_rate, key=tuple(zip(quantities, rates)))
+
+
+class RunningTotals:
+    """Subtotal, tax and total maintained incrementally as line items change.
+
+    The subtotal is kept in integer cents, so adding, replacing and removing
+    line amounts is O(1) and repeated edits never drift from a full re-sum.
+    """
+
+    __slots__ = ('subtotal_cents', 'count', 'tax_rate')
+
+    def __init__(self, tax_rate=0) -> None:
+        self.subtotal_cents = 0
+        self.count = 0
+        self.tax_rate = to_decimal(tax_rate or 0)
+
+    @classmethod
+    def from_items(cls, items, tax_rate=0) -> 'RunningTotals':
+        """Start from the full sum of an item list or LineItems container"""
+        running = cls(tax_rate)
+        if hasattr(items, 'amount_cents'):
+            running.subtotal_cents = sum(items.amount_cents)
+            running.count = len(items)
+        else:
+            for item in items:
+                running.add(amount_cents(line_amount(item['quantity'], item['rate'])))
+        return running
+
+    def add(self, cents: int) -> None:
+        """Account for a new line amount (in cents)"""
+        self.subtotal_cents += cents
+        self.count += 1
+
+    def extend(self, cents: Sequence[int]) -> None:
+        """Account for many new line amounts (in cents)"""
+        self.subtotal_cents += sum(cents)
+        self.count += len(cents)
+
+    def remove(self, cents: int) -> None:
+        """Account for a removed line amount (in cents)"""
+        self.subtotal_cents -= cents
+        self.count -= 1
+
+    def replace(self, old_cents: int, new_cents: int) -> None:
+        """Account for a line amount changing in place"""
+        self.subtotal_cents += new_cents - old_cents
+
+    def set_tax_rate(self, tax_rate) -> None:
+        self.tax_rate = to_decimal(tax_rate or 0)
+
+    def draft(self, old_cents: Optional[int], new_cents: int, tax_rate=None) -> 'RunningTotals':
+        """Totals as they would be after a pending edit, without applying it.
+
+        Args:
+            old_cents: Current amount of the line being edited, or None for a new line
+            new_cents: Amount the line would have
+            tax_rate: Tax rate to use instead of the current one
+        """
+        result = RunningTotals(self.tax_rate if tax_rate is None else tax_rate)
+        result.subtotal_cents = self.subtotal_cents
+        result.count = self.count
+        if old_cents is None:
+            result.add(new_cents)
+        else:
+            result.replace(old_cents, new_cents)
+        return result
+
+    @property
+    def subtotal(self) -> Decimal:
+        return Decimal(self.subtotal_cents).scaleb(-2)
+
+    @property
+    def tax(self) -> Decimal:
+        return round_money(self.subtotal * self.tax_rate)
+
+    @property
+    def total(self) -> Decimal:
+        return self.subtotal + self.tax
+
+    def __repr__(self) -> str:
+        return f"RunningTotals(items={self.count}, subtotal={self.subtotal}, tax_rate={self.tax_rate})"
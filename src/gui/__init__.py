@@ -3,6 +3,12 @@ GUI application for InvoiceArtisan
 Modern interface for invoice creation and management
 """
 
-from .main_window import InvoiceArtisanGUI
-
 __all__ = ['InvoiceArtisanGUI']
+
+
+def __getattr__(name):
+    # Imported on first use so gui.utils helpers can load without the whole window
+    if name == 'InvoiceArtisanGUI':
+        from .main_window import InvoiceArtisanGUI
+        return InvoiceArtisanGUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,8 +9,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import subprocess
 import threading
-from PIL import Image, ImageTk
 import json
+import copy
+import base64
+import time
 import traceback
 
 # Add the src directory to the Python path for imports
@@ -19,8 +21,49 @@ src_dir = os.path.dirname(current_dir)
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
+from core.totals import (amount_cents, compute_totals, InvoiceTotals, line_amount, RunningTotals,
+                         to_decimal)
+from core.line_items import LineItems
+from utils.config import get_config_value
+from utils.file_utils import CoalescingWriter, read_yaml
+from gui.utils.background import BackgroundTask, Debouncer, TaskCancelled, poll_future
+from gui.utils.items_view import VirtualItemsView
+from gui.utils.pdf_preview import PreviewRenderer, PYMUPDF_AVAILABLE
+from gui.utils.template_gallery import load_thumbnails
+from gui.tabs.workspace_tab import WorkspaceTab
+from gui.utils.binding import FormBinding, SectionCache, TextField, VarField
+
+# Top-level invoice data sections that edits are tracked by
+PREVIEW_SECTIONS = ('invoice', 'company', 'client', 'items', 'tax_rate', 'notes', 'terms')
+
+# Text preview sections and the data sections each one is built from
+TEXT_PREVIEW_SECTIONS = {
+    'header': ('invoice',),
+    'company': ('company',),
+    'client': ('client',),
+    'items': ('items',),
+    'totals': ('items', 'tax_rate'),
+    'notes': ('notes', 'terms'),
+}
+
+
+def parse_tax_percent(value):
+    """Convert the tax rate field (a percentage) to the stored fraction"""
+    try:
+        return float(value) / 100.0
+    except ValueError:
+        return 0.0
+
+
+def format_tax_percent(value):
+    """Show a stored tax fraction as a percentage"""
+    try:
+        return f"{float(value or 0) * 100:g}"
+    except (TypeError, ValueError):
+        return '0'
+
 class InvoiceArtisanGUI:
-    def __init__(self, root):
+    def __init__(self, root, offer_recovery=True):
         self.root = root
         self.root.title("InvoiceArtisan - Professional Invoice Generator")
         self.root.geometry("1200x800")
@@ -44,12 +87,40 @@ class InvoiceArtisanGUI:
             'dark': '#1a1a2e'
         }
         
+        # (phase, perf_counter) marks for the launcher's --profile-startup report
+        self.startup_marks = [('start', time.perf_counter())]
+        
         # Configure styles
         self.setup_styles()
+        self.mark_startup('styles')
         
         # Initialize data
         self.invoice_data = self.get_default_invoice_data()
         self.current_file = None
+        self.totals = None
+        self.running_totals = RunningTotals()
+        self.totals_debouncer = Debouncer(root, 150, self.update_live_totals)
+        self.invoice_store = None
+        self.number_allocator = None
+        self.generation_task = None
+        self.file_writer = CoalescingWriter()
+        self.file_busy = False
+        self.unsaved_changes = False
+        # Bumped on every autosave, so a save only discards the copies it supersedes
+        self.autosave_count = 0
+        
+        # Live page preview state
+        self.preview_renderer = PreviewRenderer()
+        self.preview_images = []
+        self.preview_page = 0
+        self.preview_task = None
+        self.preview_pending = False
+        self.preview_stale = True
+        self.preview_width = 0
+        self.preview_template = None
+        self.preview_dirty = set(PREVIEW_SECTIONS)
+        self.preview_sections = SectionCache(TEXT_PREVIEW_SECTIONS)
+        self.preview_debouncer = Debouncer(root, 400, self.render_live_preview)
         
         # Create main container
         self.main_container = ttk.Frame(root)
@@ -57,19 +128,39 @@ class InvoiceArtisanGUI:
         
         # Create header
         self.create_header()
+        self.mark_startup('header')
         
         # Create main content area
+        self.create_variables()
         self.create_main_content()
+        self.mark_startup('tabs')
         
         # Create status bar
         self.create_status_bar()
         
+        # Bind form fields to the invoice data
+        self.setup_bindings()
+        self.mark_startup('status bar and bindings')
+        
         # Load default data
         self.load_data_to_ui()
+        self.mark_startup('load data')
         
         # Bind events
         self.bind_events()
         
+        # Background autosave and flushing pending saves on exit
+        self.unsaved_changes = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.schedule_autosave()
+        if offer_recovery:
+            self.root.after_idle(self.offer_autosave_recovery)
+        self.mark_startup('events')
+        
+    def mark_startup(self, phase):
+        """Record the end of a startup phase"""
+        self.startup_marks.append((phase, time.perf_counter()))
+        
     def setup_styles(self):
         """Configure ttk styles for modern, futuristic appearance with high contrast"""
         style = ttk.Style()
@@ -272,17 +363,63 @@ class InvoiceArtisanGUI:
         self.notebook = ttk.Notebook(self.main_container)
         self.notebook.pack(fill=tk.BOTH, expand=True)
         
-        # Create tabs
+        # The first tab is built now; the others are built the first time they are shown
         self.create_invoice_tab()
-        self.create_company_tab()
-        self.create_client_tab()
-        self.create_items_tab()
-        self.create_notes_tab()
-        self.create_template_tab()
-        self.create_preview_tab()
-        
-        # Initialize template preview after all tabs are created
-        self.update_template_preview()
+        self.lazy_tabs = {}
+        self.add_lazy_tab("Company", self.create_company_tab)
+        self.add_lazy_tab("Client", self.create_client_tab)
+        self.add_lazy_tab("Items", self.create_items_tab)
+        self.add_lazy_tab("Notes & Terms", self.create_notes_tab)
+        self.add_lazy_tab("Template", self.create_template_tab)
+        self.preview_tab_frame = self.add_lazy_tab("Preview & Generate", self.create_preview_tab)
+        self.add_lazy_tab("Workspace", lambda frame: setattr(self, 'workspace_tab', WorkspaceTab(self, frame)))
+        
+    def add_lazy_tab(self, text, builder):
+        """Add a notebook tab whose contents are built on first selection"""
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=text)
+        self.lazy_tabs[str(frame)] = (frame, builder)
+        return frame
+        
+    def build_tab(self, tab_name):
+        """Build a lazy tab's widgets if they don't exist yet"""
+        entry = self.lazy_tabs.pop(str(tab_name), None)
+        if entry:
+            frame, builder = entry
+            builder(frame)
+            
+    def create_variables(self):
+        """Create the Tk variables behind fields on tabs that are built lazily"""
+        # Widgets on lazy tabs, set when their tab is built
+        self.items_view = None
+        self.template_description = None
+        self.gallery_frame = None
+        self.gallery_images = {}
+        self.gallery_labels = {}
+        self.preview_text = None
+        self.preview_canvas = None
+        self.workspace_tab = None
+        
+        # Notes and terms keep their text until the Notes & Terms tab exists
+        self.notes_field = TextField()
+        self.terms_field = TextField()
+        
+        self.company_name_var = tk.StringVar()
+        self.company_address1_var = tk.StringVar()
+        self.company_address2_var = tk.StringVar()
+        self.company_city_var = tk.StringVar()
+        self.company_state_var = tk.StringVar()
+        self.company_zip_var = tk.StringVar()
+        self.company_country_var = tk.StringVar()
+        self.company_email_var = tk.StringVar()
+        self.company_phone_var = tk.StringVar()
+        self.client_name_var = tk.StringVar()
+        self.client_address_var = tk.StringVar()
+        self.client_city_var = tk.StringVar()
+        self.client_state_var = tk.StringVar()
+        self.client_zip_var = tk.StringVar()
+        self.client_country_var = tk.StringVar()
+        self.client_email_var = tk.StringVar()
         
     def create_invoice_tab(self):
         """Create the invoice details tab"""
@@ -342,10 +479,8 @@ class InvoiceArtisanGUI:
         ttk.Button(actions_frame, text="🔢 Auto-generate Invoice Number", 
                   command=self.auto_generate_number).pack(side=tk.LEFT)
         
-    def create_company_tab(self):
+    def create_company_tab(self, company_frame):
         """Create the company information tab"""
-        company_frame = ttk.Frame(self.notebook)
-        self.notebook.add(company_frame, text="Company")
         
         content_frame = ttk.Frame(company_frame)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -353,70 +488,59 @@ class InvoiceArtisanGUI:
         # Company name
         ttk.Label(content_frame, text="Company Name:", 
                  style='Section.TLabel').grid(row=0, column=0, sticky=tk.W, pady=5)
-        self.company_name_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_name_var, 
                  width=40).grid(row=0, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # Address 1
         ttk.Label(content_frame, text="Address Line 1:", 
                  style='Section.TLabel').grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.company_address1_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_address1_var, 
                  width=40).grid(row=1, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # Address 2
         ttk.Label(content_frame, text="Address Line 2:", 
                  style='Section.TLabel').grid(row=2, column=0, sticky=tk.W, pady=5)
-        self.company_address2_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_address2_var, 
                  width=40).grid(row=2, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # City
         ttk.Label(content_frame, text="City:", 
                  style='Section.TLabel').grid(row=3, column=0, sticky=tk.W, pady=5)
-        self.company_city_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_city_var, 
                  width=40).grid(row=3, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # State
         ttk.Label(content_frame, text="State:", 
                  style='Section.TLabel').grid(row=4, column=0, sticky=tk.W, pady=5)
-        self.company_state_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_state_var, 
                  width=40).grid(row=4, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # ZIP
         ttk.Label(content_frame, text="ZIP Code:", 
                  style='Section.TLabel').grid(row=5, column=0, sticky=tk.W, pady=5)
-        self.company_zip_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_zip_var, 
                  width=40).grid(row=5, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # Country
         ttk.Label(content_frame, text="Country:", 
                  style='Section.TLabel').grid(row=6, column=0, sticky=tk.W, pady=5)
-        self.company_country_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_country_var, 
                  width=40).grid(row=6, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # Email
         ttk.Label(content_frame, text="Email:", 
                  style='Section.TLabel').grid(row=7, column=0, sticky=tk.W, pady=5)
-        self.company_email_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_email_var, 
                  width=40).grid(row=7, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # Phone
         ttk.Label(content_frame, text="Phone:", 
                  style='Section.TLabel').grid(row=8, column=0, sticky=tk.W, pady=5)
-        self.company_phone_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.company_phone_var, 
                  width=40).grid(row=8, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
-    def create_client_tab(self):
+    def create_client_tab(self, client_frame):
         """Create the client information tab"""
-        client_frame = ttk.Frame(self.notebook)
-        self.notebook.add(client_frame, text="Client")
         
         content_frame = ttk.Frame(client_frame)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -424,56 +548,47 @@ class InvoiceArtisanGUI:
         # Client name
         ttk.Label(content_frame, text="Client Name:", 
                  style='Section.TLabel').grid(row=0, column=0, sticky=tk.W, pady=5)
-        self.client_name_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.client_name_var, 
                  width=40).grid(row=0, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # Address
         ttk.Label(content_frame, text="Address:", 
                  style='Section.TLabel').grid(row=1, column=0, sticky=tk.W, pady=5)
-        self.client_address_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.client_address_var, 
                  width=40).grid(row=1, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # City
         ttk.Label(content_frame, text="City:", 
                  style='Section.TLabel').grid(row=2, column=0, sticky=tk.W, pady=5)
-        self.client_city_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.client_city_var, 
                  width=40).grid(row=2, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # State
         ttk.Label(content_frame, text="State:", 
                  style='Section.TLabel').grid(row=3, column=0, sticky=tk.W, pady=5)
-        self.client_state_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.client_state_var, 
                  width=40).grid(row=3, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # ZIP
         ttk.Label(content_frame, text="ZIP Code:", 
                  style='Section.TLabel').grid(row=4, column=0, sticky=tk.W, pady=5)
-        self.client_zip_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.client_zip_var, 
                  width=40).grid(row=4, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # Country
         ttk.Label(content_frame, text="Country:", 
                  style='Section.TLabel').grid(row=5, column=0, sticky=tk.W, pady=5)
-        self.client_country_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.client_country_var, 
                  width=40).grid(row=5, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
         # Email
         ttk.Label(content_frame, text="Email:", 
                  style='Section.TLabel').grid(row=6, column=0, sticky=tk.W, pady=5)
-        self.client_email_var = tk.StringVar()
         ttk.Entry(content_frame, textvariable=self.client_email_var, 
                  width=40).grid(row=6, column=1, sticky=tk.W, padx=(10, 0), pady=5)
         
-    def create_items_tab(self):
+    def create_items_tab(self, items_frame):
         """Create the invoice items tab"""
-        items_frame = ttk.Frame(self.notebook)
-        self.notebook.add(items_frame, text="Items")
         
         content_frame = ttk.Frame(items_frame)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -482,31 +597,17 @@ class InvoiceArtisanGUI:
         items_list_frame = ttk.Frame(content_frame)
         items_list_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Create Treeview for items
-        columns = ('name', 'description', 'quantity', 'rate', 'amount')
-        self.items_tree = ttk.Treeview(items_list_frame, columns=columns, show='headings', height=10)
-        
-        # Define headings
-        self.items_tree.heading('name', text='Item Name')
-        self.items_tree.heading('description', text='Description')
-        self.items_tree.heading('quantity', text='Quantity')
-        self.items_tree.heading('rate', text='Rate ($)')
-        self.items_tree.heading('amount', text='Amount ($)')
-        
-        # Define column widths
-        self.items_tree.column('name', width=200)
-        self.items_tree.column('description', width=250)
-        self.items_tree.column('quantity', width=100)
-        self.items_tree.column('rate', width=100)
-        self.items_tree.column('amount', width=100)
-        
-        # Add scrollbar
-        items_scrollbar = ttk.Scrollbar(items_list_frame, orient=tk.VERTICAL, command=self.items_tree.yview)
-        self.items_tree.configure(yscrollcommand=items_scrollbar.set)
-        
-        # Pack tree and scrollbar
-        self.items_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        items_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Windowed view: only the rows on screen exist as Treeview items
+        self.items_view = VirtualItemsView(
+            items_list_frame,
+            columns=(('name', 'Item Name', 200), ('description', 'Description', 250),
+                     ('quantity', 'Quantity', 100), ('rate', 'Rate ($)', 100),
+                     ('amount', 'Amount ($)', 100)),
+            row_values=self.item_row_values,
+            row_count=lambda: len(self.invoice_data['items']),
+            on_select=self.on_item_select)
+        self.items_view.pack(fill=tk.BOTH, expand=True)
+        self.items_view.reset()
         
         # Item editing frame
         item_edit_frame = ttk.LabelFrame(content_frame, text="Add/Edit Item", padding=10)
@@ -536,6 +637,10 @@ class InvoiceArtisanGUI:
         ttk.Entry(item_edit_frame, textvariable=self.item_rate_var, 
                  width=15).grid(row=1, column=3, sticky=tk.W, padx=(10, 0), pady=5)
         
+        # Totals follow quantity/rate typing before the item is added or updated
+        self.item_quantity_var.trace_add('write', self.totals_debouncer.trigger)
+        self.item_rate_var.trace_add('write', self.totals_debouncer.trigger)
+        
         # Buttons
         buttons_frame = ttk.Frame(item_edit_frame)
         buttons_frame.grid(row=2, column=0, columnspan=4, pady=10)
@@ -547,15 +652,14 @@ class InvoiceArtisanGUI:
         ttk.Button(buttons_frame, text="🗑️ Delete Item", 
                   command=self.delete_item, style='Modern.Warning.TButton').pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(buttons_frame, text="🗑️ Clear Form", 
-                  command=self.clear_item_form).pack(side=tk.LEFT)
+                  command=self.clear_item_form).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(buttons_frame, text="📥 Import Items...", 
+                  command=self.import_items_file).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(buttons_frame, text="📋 Paste Items", 
+                  command=self.paste_items).pack(side=tk.LEFT)
         
-        # Bind selection event
-        self.items_tree.bind('<<TreeviewSelect>>', self.on_item_select)
-        
-    def create_notes_tab(self):
+    def create_notes_tab(self, notes_frame):
         """Create the notes and terms tab"""
-        notes_frame = ttk.Frame(self.notebook)
-        self.notebook.add(notes_frame, text="Notes & Terms")
         
         content_frame = ttk.Frame(notes_frame)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -571,6 +675,8 @@ class InvoiceArtisanGUI:
                  style='Section.TLabel').pack(anchor=tk.W, pady=(0, 5))
         self.terms_text = scrolledtext.ScrolledText(content_frame, height=8, width=80)
         self.terms_text.pack(fill=tk.BOTH, expand=True)
+        self.notes_field.attach(self.notes_text)
+        self.terms_field.attach(self.terms_text)
         
         # Quick templates
         templates_frame = ttk.LabelFrame(content_frame, text="Quick Templates", padding=10)
@@ -583,10 +689,8 @@ class InvoiceArtisanGUI:
         ttk.Button(templates_frame, text="Clear All", 
                   command=self.clear_notes_terms).pack(side=tk.LEFT)
         
-    def create_template_tab(self):
+    def create_template_tab(self, template_frame):
         """Create the template selection and preview tab"""
-        template_frame = ttk.Frame(self.notebook)
-        self.notebook.add(template_frame, text="Template")
         
         content_frame = ttk.Frame(template_frame)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
@@ -617,6 +721,13 @@ class InvoiceArtisanGUI:
                                          justify=tk.LEFT)
         self.template_features.pack(anchor=tk.W, pady=(0, 10))
         
+        # Thumbnail gallery (rendered in the background, cached on disk)
+        if PYMUPDF_AVAILABLE:
+            self.gallery_frame = ttk.LabelFrame(content_frame, text="Gallery", padding=10)
+            self.gallery_frame.pack(fill=tk.X, pady=(0, 20))
+            self.gallery_status = ttk.Label(self.gallery_frame, text="Rendering thumbnails...")
+            self.gallery_status.grid(row=0, column=0, sticky=tk.W)
+        
         # Preview section
         preview_frame = ttk.LabelFrame(content_frame, text="Template Preview", padding=10)
         preview_frame.pack(fill=tk.BOTH, expand=True)
@@ -630,29 +741,99 @@ class InvoiceArtisanGUI:
         preview_buttons_frame.pack(fill=tk.X)
         
         ttk.Button(preview_buttons_frame, text="Update Preview", 
-                   command=self.update_template_preview).pack(side=tk.LEFT, padx=(0, 10))
+                   command=lambda: (self.update_template_preview(), self.refresh_template_gallery())).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(preview_buttons_frame, text="Generate Sample PDF", 
                    command=self.generate_template_sample).pack(side=tk.LEFT)
         
         # Update template preview when template changes
-        self.template_preview_combo.bind('<<ComboboxSelected>>', self.update_template_preview)
+        self.template_preview_combo.bind('<<ComboboxSelected>>', self.on_template_changed)
+        
+        self.update_template_preview()
+        self.refresh_template_gallery()
+        
+    def refresh_template_gallery(self):
+        """Load template thumbnails off the UI thread (cached ones are just read from disk)"""
+        if self.gallery_frame is None:
+            return
+        BackgroundTask(self.root, lambda task: load_thumbnails(cancel_event=task.cancel_event),
+                       on_success=self.show_template_gallery,
+                       on_error=lambda e: self.gallery_status.config(text=f"Thumbnails unavailable: {e}"),
+                       name="TemplateGallery").start()
+        
+    def show_template_gallery(self, thumbnails):
+        """Lay out one clickable thumbnail per template"""
+        for widget in self.gallery_frame.winfo_children():
+            widget.destroy()
+        self.gallery_labels = {}
+        self.gallery_images = {}
+        
+        names = {template_id: name for name, template_id in self.template_mapping.items()}
+        for column, (template_id, png) in enumerate(thumbnails.items()):
+            self.gallery_images[template_id] = tk.PhotoImage(data=base64.b64encode(png))
+            image_label = tk.Label(self.gallery_frame, image=self.gallery_images[template_id],
+                                   borderwidth=3, relief=tk.FLAT, cursor='hand2')
+            image_label.grid(row=0, column=column, padx=5)
+            ttk.Label(self.gallery_frame, text=names.get(template_id, template_id).split(' (')[0]).grid(
+                row=1, column=column, padx=5)
+            image_label.bind('<Button-1>', lambda event, template_id=template_id: self.select_template(template_id))
+            self.gallery_labels[template_id] = image_label
+        self.highlight_gallery_selection()
+        
+    def highlight_gallery_selection(self):
+        selected = self.get_selected_template()
+        for template_id, label in self.gallery_labels.items():
+            if template_id == selected:
+                label.config(relief=tk.SOLID, background=self.colors['highlight'])
+            else:
+                label.config(relief=tk.FLAT, background=self.colors['background'])
+        
+    def select_template(self, template_id):
+        """Select a template from the gallery"""
+        for name, mapped_id in self.template_mapping.items():
+            if mapped_id == template_id:
+                self.template_var.set(name)
+                self.on_template_changed(None)
+                return
         
-    def create_preview_tab(self):
+    def create_preview_tab(self, preview_frame):
         """Create the preview and generate tab"""
-        preview_frame = ttk.Frame(self.notebook)
-        self.notebook.add(preview_frame, text="Preview & Generate")
         
         content_frame = ttk.Frame(preview_frame)
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Preview area
-        preview_label = ttk.Label(content_frame, text="Invoice Preview", 
-                                 style='Section.TLabel')
-        preview_label.pack(anchor=tk.W, pady=(0, 10))
+        header_frame = ttk.Frame(content_frame)
+        header_frame.pack(fill=tk.X, pady=(0, 10))
         
-        # Preview text area
-        self.preview_text = scrolledtext.ScrolledText(content_frame, height=20, width=80)
-        self.preview_text.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
+        preview_label = ttk.Label(header_frame, text="Invoice Preview", 
+                                 style='Section.TLabel')
+        preview_label.pack(side=tk.LEFT)
+        
+        if PYMUPDF_AVAILABLE:
+            # Live page images, re-rendered in the background as fields change
+            ttk.Button(header_frame, text="▶", width=3,
+                       command=lambda: self.show_preview_page(self.preview_page + 1)).pack(side=tk.RIGHT)
+            self.preview_page_label = ttk.Label(header_frame, text="Page 0 of 0")
+            self.preview_page_label.pack(side=tk.RIGHT, padx=5)
+            ttk.Button(header_frame, text="◀", width=3,
+                       command=lambda: self.show_preview_page(self.preview_page - 1)).pack(side=tk.RIGHT)
+            self.preview_status_label = ttk.Label(header_frame, text="")
+            self.preview_status_label.pack(side=tk.RIGHT, padx=(0, 20))
+            
+            canvas_frame = ttk.Frame(content_frame)
+            canvas_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
+            self.preview_canvas = tk.Canvas(canvas_frame, bg=self.colors['background_light'],
+                                            highlightthickness=0)
+            preview_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL,
+                                              command=self.preview_canvas.yview)
+            self.preview_canvas.configure(yscrollcommand=preview_scrollbar.set)
+            self.preview_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            preview_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            self.preview_canvas.bind('<Configure>', self.on_preview_resize)
+        else:
+            # Preview text area
+            self.preview_text = scrolledtext.ScrolledText(content_frame, height=20, width=80)
+            self.preview_text.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
         
         # Generate button
         generate_frame = ttk.Frame(content_frame)
@@ -663,6 +844,16 @@ class InvoiceArtisanGUI:
                                       style='Modern.Success.TButton')
         self.generate_btn.pack(side=tk.RIGHT)
         
+        # Cancel button and progress for background generation
+        self.cancel_generate_btn = ttk.Button(generate_frame, text="✖ Cancel",
+                                              command=self.cancel_generation,
+                                              state=tk.DISABLED)
+        self.cancel_generate_btn.pack(side=tk.RIGHT, padx=(0, 10))
+        
+        self.generate_progress = ttk.Progressbar(generate_frame, mode='determinate',
+                                                 maximum=100, length=200)
+        self.generate_progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+        
         # Preview button
         self.preview_btn = ttk.Button(generate_frame, text="👁️ Update Preview", 
                                      command=self.update_preview,
@@ -723,108 +914,139 @@ class InvoiceArtisanGUI:
         
     def load_data_to_ui(self):
         """Load invoice data into UI fields"""
-        # Invoice details
-        self.invoice_number_var.set(self.invoice_data['invoice']['number'])
-        self.invoice_date_var.set(self.invoice_data['invoice']['date'])
-        self.due_date_var.set(self.invoice_data['invoice']['due_date'])
-        self.month_var.set(self.invoice_data['invoice']['month'])
-        self.tax_rate_var.set(str(self.invoice_data['tax_rate']))
-        
-        # Company details
-        self.company_name_var.set(self.invoice_data['company']['name'])
-        self.company_address1_var.set(self.invoice_data['company'].get('address1', ''))
-        self.company_address2_var.set(self.invoice_data['company'].get('address2', ''))
-        self.company_city_var.set(self.invoice_data['company']['city'])
-        self.company_state_var.set(self.invoice_data['company']['state'])
-        self.company_zip_var.set(self.invoice_data['company']['zip'])
-        self.company_country_var.set(self.invoice_data['company']['country'])
-        self.company_email_var.set(self.invoice_data['company']['email'])
-        self.company_phone_var.set(self.invoice_data['company']['phone'])
-        
-        # Client details
-        self.client_name_var.set(self.invoice_data['client']['name'])
-        self.client_address_var.set(self.invoice_data['client']['address'])
-        self.client_city_var.set(self.invoice_data['client']['city'])
-        self.client_state_var.set(self.invoice_data['client']['state'])
-        self.client_zip_var.set(self.invoice_data['client']['zip'])
-        self.client_country_var.set(self.invoice_data['client']['country'])
-        self.client_email_var.set(self.invoice_data['client']['email'])
+        # Keep items in the compact columnar form while editing
+        self.invoice_data['items'] = LineItems.from_dicts(self.invoice_data.get('items') or [])
+        
+        # Fields (only those whose displayed value differs are rewritten)
+        self.form.load(self.invoice_data)
+        self.mark_data_changed(PREVIEW_SECTIONS)
         
         # Items
         self.refresh_items_tree()
         
-        # Notes and terms
-        self.notes_text.delete(1.0, tk.END)
-        self.notes_text.insert(1.0, self.invoice_data.get('notes', ''))
-        
-        self.terms_text.delete(1.0, tk.END)
-        self.terms_text.insert(1.0, self.invoice_data.get('terms', ''))
-        
     def refresh_items_tree(self):
-        """Refresh the items treeview"""
-        # Clear existing items
-        for item in self.items_tree.get_children():
-            self.items_tree.delete(item)
-        
-        # Add items from data
-        for item in self.invoice_data['items']:
-            amount = item['quantity'] * item['rate']
-            self.items_tree.insert('', 'end', values=(
-                item.get('name', ''),
-                item.get('description', ''),
-                item['quantity'],
-                f"${item['rate']:.2f}",
-                f"${amount:.2f}"
-            ))
-        
-        # Update totals
+        """Reload the items view and running totals after the whole item list was replaced"""
+        self.running_totals = RunningTotals.from_items(self.invoice_data['items'],
+                                                       self.invoice_data['tax_rate'])
+        if self.items_view is not None:
+            self.items_view.reset()
+        self.items_changed()
+        
+    def item_row_values(self, index):
+        """Display values for one row of the items view"""
+        items = self.invoice_data['items']
+        return (items.text('name', index), items.text('description', index), items.number('quantity', index),
+                f"${items.rate[index]:.2f}", f"${items.amount(index):.2f}")
+        
+    def items_changed(self):
+        """Refresh totals and preview after an item edit"""
+        # Full totals (with per-line amounts) are rebuilt lazily for preview/generation
+        self.totals = None
+        self.mark_data_changed({'items'})
+        self.unsaved_changes = True
         self.update_totals()
+        self.schedule_live_preview()
+        
+    def recalculate_totals(self):
+        """Recompute the cached line amounts and totals from the current items"""
+        self.totals = compute_totals(self.invoice_data['items'], self.invoice_data['tax_rate'])
+        
+    def get_totals(self):
+        """Get the cached totals, re-applying the tax rate if it has changed"""
+        if self.totals is None:
+            self.recalculate_totals()
+        elif self.totals.tax_rate != to_decimal(self.invoice_data['tax_rate']):
+            self.totals = InvoiceTotals(self.totals.amounts, self.invoice_data['tax_rate'], key=self.totals.key)
+        return self.totals
         
     def update_totals(self):
         """Update totals display"""
-        subtotal = sum(item['quantity'] * item['rate'] for item in self.invoice_data['items'])
-        tax = subtotal * self.invoice_data['tax_rate']
-        total = subtotal + tax
-        
-        # Update status bar with totals
-        self.status_bar.config(text=f"Subtotal: ${subtotal:.2f} | Tax: ${tax:.2f} | Total: ${total:.2f}")
+        self.running_totals.set_tax_rate(self.invoice_data['tax_rate'])
+        self.show_totals(self.running_totals)
+        
+    def update_live_totals(self):
+        """Show totals including the item being typed and the tax rate field.
+        
+        Only the edited row's amount is recomputed and applied as a delta to
+        the running subtotal, so this costs the same for any number of items.
+        """
+        tax_rate = parse_tax_percent(self.tax_rate_var.get())
+        new_cents = self.item_form_cents()
+        if new_cents is None:
+            self.show_totals(self.running_totals.draft(0, 0, tax_rate))
+            return
         
-    def collect_data_from_ui(self):
-        """Collect data from UI fields back to invoice_data"""
-        # Invoice details
-        self.invoice_data['invoice']['number'] = self.invoice_number_var.get()
-        self.invoice_data['invoice']['date'] = self.invoice_date_var.get()
-        self.invoice_data['invoice']['due_date'] = self.due_date_var.get()
-        self.invoice_data['invoice']['month'] = self.month_var.get()
+        item_index = self.items_view.selection() if self.items_view is not None else None
+        old_cents = None if item_index is None else self.invoice_data['items'].amount_cents[item_index]
+        self.show_totals(self.running_totals.draft(old_cents, new_cents, tax_rate),
+                         pending=old_cents != new_cents)
         
+    def item_form_cents(self):
+        """Amount in cents of the quantity and rate typed in the item form, or None if incomplete"""
+        if self.items_view is None:
+            return None
         try:
-            self.invoice_data['tax_rate'] = float(self.tax_rate_var.get()) / 100.0
+            return amount_cents(line_amount(float(self.item_quantity_var.get()),
+                                            float(self.item_rate_var.get())))
         except ValueError:
-            self.invoice_data['tax_rate'] = 0.0
-        
-        # Company details
-        self.invoice_data['company']['name'] = self.company_name_var.get()
-        self.invoice_data['company']['address1'] = self.company_address1_var.get()
-        self.invoice_data['company']['address2'] = self.company_address2_var.get()
-        self.invoice_data['company']['city'] = self.company_city_var.get()
-        self.invoice_data['company']['state'] = self.company_state_var.get()
-        self.invoice_data['company']['zip'] = self.company_zip_var.get()
-        self.invoice_data['company']['country'] = self.company_country_var.get()
-        self.invoice_data['company']['email'] = self.company_email_var.get()
-        self.invoice_data['company']['phone'] = self.company_phone_var.get()
-        
-        # Client details
-        self.invoice_data['client']['name'] = self.client_name_var.get()
-        self.invoice_data['client']['address'] = self.client_address_var.get()
-        self.invoice_data['client']['city'] = self.client_city_var.get()
-        self.invoice_data['client']['state'] = self.client_state_var.get()
-        self.invoice_data['client']['zip'] = self.client_zip_var.get()
-        self.invoice_data['client']['country'] = self.client_country_var.get()
-        self.invoice_data['client']['email'] = self.client_email_var.get()
-        
-        # Notes and terms
-        self.invoice_data['notes'] = self.notes_text.get(1.0, tk.END).strip()
-        self.invoice_data['terms'] = self.terms_text.get(1.0, tk.END).strip()
+            return None
+        
+    def show_totals(self, totals, pending=False):
+        """Show totals in the status bar, flagging those that include an unsaved item edit"""
+        text = f"Subtotal: ${totals.subtotal:.2f} | Tax: ${totals.tax:.2f} | Total: ${totals.total:.2f}"
+        if pending:
+            text += " (including item being edited)"
+        self.status_bar.config(text=text)
+        
+    def collect_data_from_ui(self):
+        """Collect edited fields back into invoice_data and return the sections that changed"""
+        changed = self.form.collect(self.invoice_data)
+        self.mark_data_changed(changed)
+        return changed
+        
+    def mark_data_changed(self, sections):
+        """Invalidate preview output that depends on the given data sections"""
+        self.preview_dirty.update(sections)
+        self.preview_sections.invalidate(sections)
+        
+    def setup_bindings(self):
+        """Bind form fields to their paths in invoice_data"""
+        self.form = FormBinding(on_change=self.on_field_changed)
+        fields = (
+            (('invoice', 'number'), self.invoice_number_var),
+            (('invoice', 'date'), self.invoice_date_var),
+            (('invoice', 'due_date'), self.due_date_var),
+            (('invoice', 'month'), self.month_var),
+            (('company', 'name'), self.company_name_var),
+            (('company', 'address1'), self.company_address1_var),
+            (('company', 'address2'), self.company_address2_var),
+            (('company', 'city'), self.company_city_var),
+            (('company', 'state'), self.company_state_var),
+            (('company', 'zip'), self.company_zip_var),
+            (('company', 'country'), self.company_country_var),
+            (('company', 'email'), self.company_email_var),
+            (('company', 'phone'), self.company_phone_var),
+            (('client', 'name'), self.client_name_var),
+            (('client', 'address'), self.client_address_var),
+            (('client', 'city'), self.client_city_var),
+            (('client', 'state'), self.client_state_var),
+            (('client', 'zip'), self.client_zip_var),
+            (('client', 'country'), self.client_country_var),
+            (('client', 'email'), self.client_email_var),
+        )
+        for path, var in fields:
+            self.form.bind(path, VarField(var), from_data=str)
+        self.form.bind(('tax_rate',), VarField(self.tax_rate_var),
+                       to_data=parse_tax_percent, from_data=format_tax_percent)
+        self.form.bind(('notes',), self.notes_field, from_data=str)
+        self.form.bind(('terms',), self.terms_field, from_data=str)
+        
+    def on_field_changed(self, path):
+        """Handle an edit in any bound field"""
+        self.unsaved_changes = True
+        if path == ('tax_rate',):
+            self.totals_debouncer.trigger()
+        self.schedule_live_preview()
         
     def load_available_templates(self):
         """Load available invoice templates"""
@@ -868,9 +1090,14 @@ class InvoiceArtisanGUI:
         print(f"Template changed to: {selected_template}")
         # Update template preview
         self.update_template_preview()
+        self.highlight_gallery_selection()
+        self.schedule_live_preview()
     
     def update_template_preview(self):
         """Update the template preview with current selection"""
+        if self.template_description is None:
+            # Template tab not built yet; it shows the current template when it is
+            return
         try:
             from utils.template_manager import get_template_manager
             template_manager = get_template_manager()
@@ -962,19 +1189,30 @@ FEATURES:
         
     def on_tab_changed(self, event):
         """Handle tab change events"""
+        self.build_tab(self.notebook.select())
+        
         # Auto-save data when switching tabs
         self.collect_data_from_ui()
         
+        # Catch the page preview up with edits made on other tabs
+        if self.preview_stale:
+            self.schedule_live_preview()
+        
     def new_invoice(self):
         """Create a new invoice"""
         if messagebox.askyesno("New Invoice", "Are you sure you want to create a new invoice? All unsaved changes will be lost."):
             self.invoice_data = self.get_default_invoice_data()
             self.current_file = None
             self.load_data_to_ui()
+            self.unsaved_changes = False
             self.status_bar.config(text="New invoice created")
             
     def open_yaml(self):
         """Open a YAML file"""
+        if self.file_busy:
+            self.status_bar.config(text="Please wait, a file is still loading...")
+            return
+        
         # Set default directory to output/invoices folder
         initial_dir = os.path.join(os.getcwd(), 'output', 'invoices')
         if not os.path.exists(initial_dir):
@@ -987,17 +1225,49 @@ FEATURES:
         )
         
         if file_path:
-            try:
-                with open(file_path, 'r') as file:
-                    self.invoice_data = yaml.safe_load(file)
-                self.current_file = file_path
-                self.load_data_to_ui()
-                self.status_bar.config(text=f"Opened: {os.path.basename(file_path)}")
-            except Exception as e:
-                self.show_error("File Open Error",
-                              f"Failed to open YAML file: {str(e)}",
-                              exception=e,
-                              context=f"File Path: {file_path}")
+            self.load_yaml_async(file_path)
+            
+    def load_yaml_async(self, file_path, recovered=False):
+        """Parse a YAML invoice on a worker thread and show it when ready.
+        
+        A ``recovered`` autosave copy is shown as a new, unsaved invoice.
+        """
+        def load(task):
+            data = read_yaml(file_path)
+            if not isinstance(data, dict):
+                raise ValueError("File does not contain invoice data")
+            # Build the columnar items off the UI thread too
+            data['items'] = LineItems.from_dicts(data.get('items') or [])
+            return data
+        
+        def on_success(data):
+            self.set_file_busy(False)
+            self.invoice_data = data
+            self.current_file = None if recovered else file_path
+            self.load_data_to_ui()
+            self.unsaved_changes = recovered
+            self.status_bar.config(text="Recovered unsaved invoice" if recovered
+                                   else f"Opened: {os.path.basename(file_path)}")
+            
+        def on_error(e):
+            self.set_file_busy(False)
+            self.show_error("File Open Error",
+                          f"Failed to open YAML file: {str(e)}",
+                          exception=e,
+                          context=f"File Path: {file_path}")
+        
+        self.set_file_busy(True, f"Opening {os.path.basename(file_path)}...")
+        BackgroundTask(self.root, load, on_success=on_success, on_error=on_error,
+                       name="InvoiceOpen").start()
+        
+    def set_file_busy(self, busy, message=None):
+        """Show or clear the loading state while a file is being read"""
+        self.file_busy = busy
+        state = tk.DISABLED if busy else tk.NORMAL
+        self.open_btn.config(state=state)
+        self.root.config(cursor='watch' if busy else '')
+        if message:
+            self.status_bar.config(text=message)
                 
     def save_yaml(self):
         """Save current data to YAML file"""
@@ -1020,98 +1290,164 @@ FEATURES:
             else:
                 return
         
-        try:
-            with open(self.current_file, 'w', encoding='utf-8') as file:
-                yaml.dump(self.invoice_data, file, default_flow_style=False, sort_keys=False)
-            self.status_bar.config(text=f"Saved: {os.path.basename(self.current_file)}")
-        except Exception as e:
+        # Dump and write on the writer thread; repeated saves of the same file coalesce
+        file_path = self.current_file
+        self.unsaved_changes = False
+        self.status_bar.config(text=f"Saving {os.path.basename(file_path)}...")
+        future = self.file_writer.submit(file_path, copy.deepcopy(self.invoice_data))
+        autosave_count = self.autosave_count
+        
+        def on_success(path):
+            self.status_bar.config(text=f"Saved: {os.path.basename(path)}")
+            if path == self.current_file:
+                self.index_current_invoice()
+            if autosave_count == self.autosave_count:
+                # No edits were autosaved since this save; the recovery copy is stale
+                self.discard_autosave()
+                
+        def on_error(e):
+            self.unsaved_changes = True
             self.show_error("File Save Error",
                           f"Failed to save YAML file: {str(e)}",
                           exception=e,
-                          context=f"File Path: {self.current_file}")
+                          context=f"File Path: {file_path}")
+        
+        poll_future(self.root, future, on_success, on_error)
+        
+    def schedule_autosave(self):
+        """Arm the periodic background autosave"""
+        if get_config_value('gui', 'autosave', 'enabled', default=True):
+            interval = get_config_value('gui', 'autosave', 'interval_seconds', default=60)
+            self.root.after(int(interval * 1000), self.autosave)
             
-    def generate_pdf(self):
-        """Generate PDF invoice with comprehensive error handling"""
-        self.collect_data_from_ui()
+    def autosave_path(self):
+        """Recovery copy location; relative paths are under the working directory like output/invoices"""
+        return Path(os.getcwd()) / get_config_value(
+            'gui', 'autosave', 'file', default=os.path.join('output', 'temp', 'autosave.yaml'))
+        
+    def autosave(self):
+        """Write a recovery copy of unsaved edits without touching the user's file"""
+        if self.unsaved_changes and not self.file_busy:
+            self.collect_data_from_ui()
+            future = self.file_writer.submit(self.autosave_path(), copy.deepcopy(self.invoice_data))
+            self.autosave_count += 1
+            self.unsaved_changes = False
+            
+            def on_error(e):
+                self.unsaved_changes = True
+                print(f"Warning: Autosave failed: {e}")
+            
+            poll_future(self.root, future, on_error=on_error)
+        self.schedule_autosave()
         
-        if not self.current_file:
-            messagebox.showwarning("Warning", "Please save the YAML file first before generating PDF.")
+    def offer_autosave_recovery(self):
+        """Offer to restore edits autosaved by a session that ended without saving them"""
+        autosave_path = self.autosave_path()
+        if not autosave_path.is_file():
             return
+        if messagebox.askyesno("Recover Unsaved Invoice",
+                               "InvoiceArtisan found unsaved changes from a previous session.\n\n"
+                               "Would you like to restore them?"):
+            self.load_yaml_async(str(autosave_path), recovered=True)
+        else:
+            self.discard_autosave()
+            
+    def discard_autosave(self):
+        """Delete the recovery copy once it is no longer needed"""
+        try:
+            self.autosave_path().unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Could not remove autosave file: {e}")
+        
+    def on_close(self):
+        """Finish pending writes before the window closes"""
+        if not self.file_writer.flush(timeout=10):
+            print("Warning: Closing before all saves finished")
+        self.root.destroy()
         
-        # Save current data
+    def index_current_invoice(self):
+        """Record the current invoice in the invoice store for lookup and reporting"""
         try:
-            self.save_yaml()
+            from core.invoice_store import InvoiceStore
+            if self.invoice_store is None:
+                self.invoice_store = InvoiceStore()
+            pdf_path = self.current_file.rsplit('.', 1)[0] + '.pdf'
+            self.invoice_store.add_invoice(self.invoice_data, os.path.abspath(self.current_file),
+                                           os.path.abspath(pdf_path) if os.path.exists(pdf_path) else None)
         except Exception as e:
-            self.show_error("Save Error", 
-                          f"Failed to save YAML file before generating PDF: {str(e)}",
-                          exception=e,
-                          context=f"File: {self.current_file}")
+            # Indexing is best effort and must never block saving
+            print(f"Warning: Could not index invoice: {e}")
+            
+    def generate_pdf(self):
+        """Generate the PDF invoice on a background thread from the in-memory data"""
+        if self.generation_task is not None:
+            messagebox.showinfo("Generation Running", "A PDF is already being generated.")
             return
         
-        # Generate PDF using the core invoice generator
-        output_pdf = None
-        pdf_path = None
+        self.collect_data_from_ui()
         
-        try:
-            # Import the generate_invoice function
-            from core.invoice_generator import generate_invoice
-            
-            # Generate PDF in the same directory as the YAML file
+        # Write the PDF next to the YAML file, or ask where to put it for unsaved invoices
+        if self.current_file:
             output_pdf = self.current_file.rsplit('.', 1)[0] + '.pdf'
+        else:
+            initial_dir = os.path.join(os.getcwd(), 'output', 'invoices')
+            if not os.path.exists(initial_dir):
+                initial_dir = os.getcwd()
+            output_pdf = filedialog.asksaveasfilename(
+                title="Save PDF Invoice",
+                initialdir=initial_dir,
+                initialfile=f"{self.invoice_data['invoice']['number']}.pdf",
+                defaultextension=".pdf",
+                filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")]
+            )
+            if not output_pdf:
+                return
+        
+        # Render from a snapshot so edits made while generating don't leak into this PDF
+        invoice_data = copy.deepcopy(self.invoice_data)
+        totals = self.get_totals()
+        selected_template = self.get_selected_template()
+        
+        def render(task):
+            from core.invoice_generator import generate_invoice, GenerationCancelled
             
             # Validate output path
             output_dir = os.path.dirname(output_pdf)
-            if not os.path.exists(output_dir):
+            if output_dir and not os.path.exists(output_dir):
                 try:
                     os.makedirs(output_dir, exist_ok=True)
                 except Exception as e:
                     raise Exception(f"Cannot create output directory '{output_dir}': {str(e)}")
             
             # Check write permissions
-            if os.path.exists(output_dir) and not os.access(output_dir, os.W_OK):
+            if output_dir and not os.access(output_dir, os.W_OK):
                 raise Exception(f"No write permission for directory: {output_dir}")
             
-            # Load the YAML data first
             try:
-                with open(self.current_file, 'r', encoding='utf-8') as file:
-                    invoice_data = yaml.safe_load(file)
-                if not invoice_data:
-                    raise Exception("YAML file is empty or invalid")
-            except yaml.YAMLError as e:
-                raise Exception(f"Invalid YAML format in file: {str(e)}")
-            except Exception as e:
-                raise Exception(f"Failed to read YAML file: {str(e)}")
-            
-            # Validate invoice data structure
-            required_fields = ['invoice', 'company', 'client', 'items']
-            for field in required_fields:
-                if field not in invoice_data:
-                    raise Exception(f"Missing required field in YAML: '{field}'")
-            
-            # Get selected template
-            selected_template = self.get_selected_template()
-            
-            # Generate PDF using the imported function with selected template
-            pdf_path = generate_invoice(invoice_data, output_pdf, selected_template)
+                pdf_path = generate_invoice(invoice_data, output_pdf, selected_template, totals=totals,
+                                            progress=task.report_progress, cancel_event=task.cancel_event)
+            except GenerationCancelled:
+                raise TaskCancelled()
             
             # Validate PDF was created
-            if not pdf_path:
-                raise Exception("PDF generation function returned None. Check console/logs for details.")
-            
-            if not os.path.exists(pdf_path):
-                raise Exception(f"PDF file was not created at expected path: {pdf_path}")
+            if not pdf_path or not os.path.exists(pdf_path):
+                raise Exception(f"PDF file was not created at expected path: {output_pdf}")
             
             # Check file size (should be > 0)
             file_size = os.path.getsize(pdf_path)
             if file_size == 0:
                 raise Exception(f"PDF file was created but is empty (0 bytes): {pdf_path}")
-            
-            # Success!
+            return pdf_path, file_size
+        
+        def on_success(result):
+            pdf_path, file_size = result
+            self.finish_generation(f"PDF generated: {os.path.basename(pdf_path)}")
             messagebox.showinfo("Success", 
                               f"PDF invoice generated successfully!\n\n"
                               f"File: {pdf_path}\n"
                               f"Size: {file_size:,} bytes")
-            self.status_bar.config(text=f"PDF generated: {os.path.basename(pdf_path)}")
             
             # Open the generated PDF
             if messagebox.askyesno("Open PDF", "Would you like to open the generated PDF?"):
@@ -1125,78 +1461,225 @@ FEATURES:
                                   f"PDF was generated successfully but could not be opened: {str(e)}",
                                   exception=e,
                                   context=f"PDF Path: {pdf_path}")
-                
-        except ImportError as e:
-            self.show_error("Import Error",
-                          f"Failed to import invoice generator module.\n\n"
-                          f"Please ensure the application is properly installed and all dependencies are available.",
-                          exception=e,
-                          context=f"Module: core.invoice_generator")
-        except Exception as e:
-            error_context = f"Output Path: {output_pdf}\nYAML File: {self.current_file}\nTemplate: {self.get_selected_template()}"
-            self.show_error("PDF Generation Error",
-                          f"Failed to generate PDF invoice.\n\n"
-                          f"Error: {str(e)}",
-                          exception=e,
-                          context=error_context)
+        
+        def on_error(e):
+            self.finish_generation("PDF generation failed")
+            if isinstance(e, ImportError):
+                self.show_error("Import Error",
+                              f"Failed to import invoice generator module.\n\n"
+                              f"Please ensure the application is properly installed and all dependencies are available.",
+                              exception=e,
+                              context=f"Module: core.invoice_generator")
+            else:
+                error_context = f"Output Path: {output_pdf}\nYAML File: {self.current_file}\nTemplate: {selected_template}"
+                self.show_error("PDF Generation Error",
+                              f"Failed to generate PDF invoice.\n\n"
+                              f"Error: {str(e)}",
+                              exception=e,
+                              context=error_context)
+        
+        def on_progress(fraction, message):
+            self.generate_progress['value'] = fraction * 100
+            self.status_bar.config(text=f"Generating PDF: {message}")
+        
+        self.generate_btn.config(state=tk.DISABLED)
+        self.cancel_generate_btn.config(state=tk.NORMAL)
+        self.generate_progress['value'] = 0
+        self.status_bar.config(text="Generating PDF...")
+        self.generation_task = BackgroundTask(
+            self.root, render,
+            on_success=on_success,
+            on_error=on_error,
+            on_progress=on_progress,
+            on_cancel=lambda: self.finish_generation("PDF generation cancelled"),
+            name="InvoicePdfGeneration"
+        ).start()
+        
+    def cancel_generation(self):
+        """Cancel the running PDF generation"""
+        if self.generation_task is not None:
+            self.generation_task.cancel()
+            self.cancel_generate_btn.config(state=tk.DISABLED)
+            self.status_bar.config(text="Cancelling PDF generation...")
+            
+    def finish_generation(self, status_text):
+        """Reset the generate controls once a background generation ends"""
+        self.generation_task = None
+        self.generate_btn.config(state=tk.NORMAL)
+        self.cancel_generate_btn.config(state=tk.DISABLED)
+        self.generate_progress['value'] = 0
+        self.status_bar.config(text=status_text)
+            
+    def schedule_live_preview(self, *args):
+        """Debounce a page preview re-render after an edit"""
+        self.preview_stale = True
+        if self.preview_canvas is not None and self.notebook.select() == str(self.preview_tab_frame):
+            self.preview_debouncer.trigger()
+            
+    def render_live_preview(self):
+        """Render the page preview off the UI thread from the in-memory invoice data"""
+        if self.preview_task is not None:
+            # Render again with the latest data once the current render finishes
+            self.preview_pending = True
+            return
+        
+        self.collect_data_from_ui()
+        template_id = self.get_selected_template()
+        width = max(self.preview_canvas.winfo_width() - 20, 200)
+        if (not self.preview_dirty and self.preview_images and template_id == self.preview_template
+                and width == self.preview_width):
+            # Nothing changed since the last render
+            self.preview_stale = False
+            return
+        
+        invoice_data = copy.deepcopy(self.invoice_data)
+        totals = self.get_totals()
+        renderer = self.preview_renderer
+        
+        def render(task):
+            page_count, changed = renderer.render(invoice_data, template_id, totals=totals,
+                                                  width=width, cancel_event=task.cancel_event)
+            return page_count, {index: base64.b64encode(png) for index, png in changed.items()}
+        
+        self.preview_stale = False
+        self.preview_dirty.clear()
+        self.preview_width = width
+        self.preview_template = template_id
+        self.preview_status_label.config(text="Rendering...")
+        self.preview_task = BackgroundTask(self.root, render,
+                                           on_success=self.on_live_preview_rendered,
+                                           on_error=self.on_live_preview_failed,
+                                           name="InvoicePreview").start()
+        
+    def on_live_preview_rendered(self, result):
+        """Swap in the page images that changed in the latest render"""
+        self.preview_task = None
+        page_count, changed = result
+        
+        del self.preview_images[page_count:]
+        for index in sorted(changed):
+            image = tk.PhotoImage(data=changed[index])
+            if index < len(self.preview_images):
+                self.preview_images[index] = image
+            else:
+                self.preview_images.append(image)
+        
+        self.show_preview_page(min(self.preview_page, page_count - 1))
+        self.preview_status_label.config(text=f"Updated {len(changed)} of {page_count} pages")
+        
+        if self.preview_pending:
+            self.preview_pending = False
+            self.render_live_preview()
+            
+    def on_live_preview_failed(self, error):
+        """Show live preview errors inline rather than interrupting typing with dialogs"""
+        self.preview_task = None
+        self.preview_status_label.config(text=f"Preview unavailable: {str(error).splitlines()[0]}")
+        if self.preview_pending:
+            self.preview_pending = False
+            self.render_live_preview()
+            
+    def show_preview_page(self, page):
+        """Display one rendered page on the preview canvas"""
+        if not self.preview_images:
+            return
+        self.preview_page = max(0, min(page, len(self.preview_images) - 1))
+        image = self.preview_images[self.preview_page]
+        self.preview_canvas.delete('all')
+        self.preview_canvas.create_image(10, 10, anchor=tk.NW, image=image)
+        self.preview_canvas.configure(scrollregion=(0, 0, image.width() + 20, image.height() + 20))
+        self.preview_page_label.config(text=f"Page {self.preview_page + 1} of {len(self.preview_images)}")
+        
+    def on_preview_resize(self, event):
+        """Re-render at the new width when the preview area is resized noticeably"""
+        if abs((event.width - 20) - self.preview_width) > 40:
+            self.preview_renderer.reset()
+            self.schedule_live_preview()
             
     def update_preview(self):
         """Update the preview tab"""
+        if self.preview_canvas is not None:
+            # Force a full re-render of every page
+            self.preview_debouncer.cancel()
+            self.preview_renderer.reset()
+            self.preview_dirty.update(PREVIEW_SECTIONS)
+            self.render_live_preview()
+            return
+        
         self.collect_data_from_ui()
         
-        preview_text = f"""INVOICE PREVIEW
+        # Only sections whose data changed since the last preview are rebuilt
+        preview_text = "".join(self.preview_sections.get(name, build) for name, build in (
+            ('header', self.preview_header_text),
+            ('company', self.preview_company_text),
+            ('client', self.preview_client_text),
+            ('items', self.preview_items_text),
+            ('totals', self.preview_totals_text),
+            ('notes', self.preview_notes_text),
+        ))
+        
+        self.preview_text.delete(1.0, tk.END)
+        self.preview_text.insert(1.0, preview_text)
+        
+    def preview_header_text(self):
+        invoice = self.invoice_data['invoice']
+        return f"""INVOICE PREVIEW
 {'='*50}
 
-INVOICE: {self.invoice_data['invoice']['number']}
-Date: {self.invoice_data['invoice']['date']}
-Due Date: {self.invoice_data['invoice']['due_date']}
-Month: {self.invoice_data['invoice']['month']}
-
-FROM:
-{self.invoice_data['company']['name']}
-{self.invoice_data['company'].get('address1', '')}
-{self.invoice_data['company'].get('address2', '')}
-{self.invoice_data['company']['city']}, {self.invoice_data['company']['state']} {self.invoice_data['company']['zip']}
-{self.invoice_data['company']['country']}
-Email: {self.invoice_data['company']['email']}
-Phone: {self.invoice_data['company']['phone']}
+INVOICE: {invoice['number']}
+Date: {invoice['date']}
+Due Date: {invoice['due_date']}
+Month: {invoice['month']}
 
-BILL TO:
-{self.invoice_data['client']['name']}
-{self.invoice_data['client']['address']}
-{self.invoice_data['client']['city']}, {self.invoice_data['client']['state']} {self.invoice_data['client']['zip']}
-{self.invoice_data['client']['country']}
-Email: {self.invoice_data['client']['email']}
+"""
+        
+    def preview_company_text(self):
+        company = self.invoice_data['company']
+        return f"""FROM:
+{company['name']}
+{company.get('address1', '')}
+{company.get('address2', '')}
+{company['city']}, {company['state']} {company['zip']}
+{company['country']}
+Email: {company['email']}
+Phone: {company['phone']}
 
-ITEMS:
 """
         
-        # Add items
-        subtotal = 0
-        for i, item in enumerate(self.invoice_data['items'], 1):
-            amount = item['quantity'] * item['rate']
-            subtotal += amount
-            preview_text += f"{i}. {item.get('name', '')} - {item.get('description', '')}\n"
-            preview_text += f"   Quantity: {item['quantity']} x ${item['rate']:.2f} = ${amount:.2f}\n\n"
+    def preview_client_text(self):
+        client = self.invoice_data['client']
+        return f"""BILL TO:
+{client['name']}
+{client['address']}
+{client['city']}, {client['state']} {client['zip']}
+{client['country']}
+Email: {client['email']}
+
+"""
         
-        # Add totals
-        tax = subtotal * self.invoice_data['tax_rate']
-        total = subtotal + tax
+    def preview_items_text(self):
+        lines = ["ITEMS:\n"]
+        for i, (name, description, quantity, rate, amount) in enumerate(self.invoice_data['items'].rows(), 1):
+            lines.append(f"{i}. {name} - {description}\n")
+            lines.append(f"   Quantity: {quantity} x ${rate:.2f} = ${amount:.2f}\n\n")
+        return "".join(lines)
         
-        preview_text += f"""
+    def preview_totals_text(self):
+        totals = self.get_totals()
+        return f"""
 TOTALS:
-Subtotal: ${subtotal:.2f}
-Tax ({self.invoice_data['tax_rate']*100:.1f}%): ${tax:.2f}
-Total: ${total:.2f}
+Subtotal: ${totals.subtotal:.2f}
+Tax ({self.invoice_data['tax_rate']*100:.1f}%): ${totals.tax:.2f}
+Total: ${totals.total:.2f}
 
-Notes: {self.invoice_data.get('notes', '')}
+"""
+        
+    def preview_notes_text(self):
+        return f"""Notes: {self.invoice_data.get('notes', '')}
 
 Terms: {self.invoice_data.get('terms', '')}
 """
         
-        self.preview_text.delete(1.0, tk.END)
-        self.preview_text.insert(1.0, preview_text)
-        
     def set_today_date(self):
         """Set today's date"""
         today = datetime.now()
@@ -1209,9 +1692,22 @@ Terms: {self.invoice_data.get('terms', '')}
         self.due_date_var.set(due_date.strftime('%Y-%m-%d'))
         
     def auto_generate_number(self):
-        """Auto-generate invoice number"""
-        today = datetime.now()
-        self.invoice_number_var.set(f"INV-{today.strftime('%Y%m%d')}-001")
+        """Auto-generate the next unused invoice number for the invoice date"""
+        try:
+            invoice_date = datetime.strptime(self.invoice_date_var.get(), '%Y-%m-%d')
+        except ValueError:
+            invoice_date = datetime.now()
+        
+        try:
+            from core.number_allocator import InvoiceNumberAllocator
+            if self.number_allocator is None:
+                # Interactive use: don't reserve numbers the user will never see
+                self.number_allocator = InvoiceNumberAllocator(block_size=1)
+            self.invoice_number_var.set(self.number_allocator.next_number(invoice_date))
+        except Exception as e:
+            self.show_error("Invoice Number Error",
+                          f"Failed to allocate an invoice number: {str(e)}",
+                          exception=e)
         
     def add_item(self):
         """Add a new item"""
@@ -1238,14 +1734,18 @@ Terms: {self.invoice_data.get('terms', '')}
             'rate': rate
         }
         
-        self.invoice_data['items'].append(new_item)
-        self.refresh_items_tree()
+        items = self.invoice_data['items']
+        items.append(new_item)
+        self.running_totals.add(items.amount_cents[-1])
+        self.items_view.row_inserted(len(items) - 1)
+        self.items_view.see(len(items) - 1)
+        self.items_changed()
         self.clear_item_form()
         
     def update_item(self):
         """Update selected item"""
-        selection = self.items_tree.selection()
-        if not selection:
+        item_index = self.items_view.selection()
+        if item_index is None:
             messagebox.showwarning("Warning", "Please select an item to update.")
             return
         
@@ -1259,29 +1759,33 @@ Terms: {self.invoice_data.get('terms', '')}
                           context=f"Quantity: '{self.item_quantity_var.get()}', Rate: '{self.item_rate_var.get()}'")
             return
         
-        # Find and update the item
-        item_index = self.items_tree.index(selection[0])
-        self.invoice_data['items'][item_index] = {
+        # Update the item in place and apply the change to the running totals
+        items = self.invoice_data['items']
+        old_cents = items.amount_cents[item_index]
+        items[item_index] = {
             'name': self.item_name_var.get().strip(),
             'description': self.item_description_var.get().strip(),
             'quantity': quantity,
             'rate': rate
         }
-        
-        self.refresh_items_tree()
+        self.running_totals.replace(old_cents, items.amount_cents[item_index])
+        self.items_view.row_updated(item_index)
+        self.items_changed()
         self.clear_item_form()
         
     def delete_item(self):
         """Delete selected item"""
-        selection = self.items_tree.selection()
-        if not selection:
+        item_index = self.items_view.selection()
+        if item_index is None:
             messagebox.showwarning("Warning", "Please select an item to delete.")
             return
         
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this item?"):
-            item_index = self.items_tree.index(selection[0])
-            del self.invoice_data['items'][item_index]
-            self.refresh_items_tree()
+            items = self.invoice_data['items']
+            self.running_totals.remove(items.amount_cents[item_index])
+            del items[item_index]
+            self.items_view.row_deleted(item_index)
+            self.items_changed()
             self.clear_item_form()
             
     def clear_item_form(self):
@@ -1291,17 +1795,80 @@ Terms: {self.invoice_data.get('terms', '')}
         self.item_quantity_var.set('')
         self.item_rate_var.set('')
         
-    def on_item_select(self, event):
+    def import_items_file(self):
+        """Append line items from a CSV or Excel file"""
+        from core.item_import import OPENPYXL_AVAILABLE, import_item_file
+        
+        filetypes = [("CSV files", "*.csv"), ("Tab-separated files", "*.tsv *.txt")]
+        if OPENPYXL_AVAILABLE:
+            filetypes.insert(1, ("Excel workbooks", "*.xlsx"))
+        file_path = filedialog.askopenfilename(
+            title="Import Items",
+            initialdir=os.getcwd(),
+            filetypes=filetypes + [("All files", "*.*")]
+        )
+        if file_path:
+            self.run_item_import(lambda progress: import_item_file(file_path, progress=progress),
+                                 os.path.basename(file_path))
+        
+    def paste_items(self):
+        """Append line items from rows copied out of a spreadsheet"""
+        from core.item_import import import_pasted_items
+        
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            text = ''
+        if not text.strip():
+            messagebox.showinfo("Paste Items", "Copy some rows from a spreadsheet first.")
+            return
+        self.run_item_import(lambda progress: import_pasted_items(text, progress=progress), "clipboard")
+        
+    def run_item_import(self, read, source):
+        """Parse and validate imported rows off the UI thread"""
+        def run(task):
+            def progress(rows):
+                task.check_cancelled()
+                task.report_progress(0, f"Importing items from {source}: {rows} rows read")
+            return read(progress)
+        
+        self.status_bar.config(text=f"Importing items from {source}...")
+        BackgroundTask(self.root, run,
+                       on_success=lambda result: self.on_items_imported(result, source),
+                       on_error=lambda e: self.show_error("Import Error",
+                                                          f"Could not import items from {source}: {e}",
+                                                          exception=e),
+                       on_progress=lambda fraction, message: self.status_bar.config(text=message),
+                       name="ItemImport").start()
+        
+    def on_items_imported(self, result, source):
+        """Append imported items with one view update and one totals delta"""
+        items = self.invoice_data['items']
+        first = len(items)
+        items.extend(result.items)
+        self.running_totals.extend(result.items.amount_cents)
+        if result.items:
+            self.items_view.row_inserted(first)
+            self.items_view.see(first)
+        self.items_changed()
+        
+        if result.errors:
+            shown = "\n".join(f"Row {row}: {message}" for row, message in result.errors[:10])
+            more = len(result.errors) - 10
+            if more > 0:
+                shown += f"\n...and {more} more"
+            messagebox.showwarning("Import Items",
+                                   f"Imported {len(result.items)} items from {source}; "
+                                   f"skipped {len(result.errors)} invalid rows:\n\n{shown}")
+        
+    def on_item_select(self, item_index):
         """Handle item selection"""
-        selection = self.items_tree.selection()
-        if selection:
-            item_index = self.items_tree.index(selection[0])
-            item = self.invoice_data['items'][item_index]
-            
-            self.item_name_var.set(item.get('name', ''))
-            self.item_description_var.set(item.get('description', ''))
-            self.item_quantity_var.set(str(item['quantity']))
-            self.item_rate_var.set(str(item['rate']))
+        item = self.invoice_data['items'][item_index]
+        
+        self.item_name_var.set(item.get('name', ''))
+        self.item_description_var.set(item.get('description', ''))
+        self.item_quantity_var.set(str(item['quantity']))
+        self.item_rate_var.set(str(item['rate']))
             
     def load_standard_terms(self):
         """Load standard terms and conditions"""
@@ -1329,8 +1896,12 @@ IBAN Number: PK24ALFH0740001009144194"""
         self.notes_text.delete(1.0, tk.END)
         self.terms_text.delete(1.0, tk.END)
     
-    def show_error_details(self, title, error_message, exception=None, context=None):
-        """Show detailed error dialog with stack trace and copy functionality"""
+    def show_error_details(self, title, error_message, exception=None, context=None, details=None):
+        """Show detailed error dialog with stack trace and copy functionality.
+        
+        ``details`` is shown instead of a stack trace when there is no exception
+        object, e.g. for errors reported by batch worker processes.
+        """
         # Create error dialog window
         error_window = tk.Toplevel(self.root)
         error_window.title(f"Error: {title}")
@@ -1399,7 +1970,12 @@ IBAN Number: PK24ALFH0740001009144194"""
             trace_content.append("\n" + "="*70 + "\n")
             trace_content.append("Full Stack Trace:\n")
             trace_content.append("="*70 + "\n")
-            trace_content.append(traceback.format_exc())
+            # Exceptions from background tasks carry their worker-thread traceback
+            trace_content.append(getattr(exception, 'formatted_traceback', None)
+                                 or ''.join(traceback.format_exception(type(exception), exception,
+                                                                       exception.__traceback__)))
+        elif details:
+            trace_content.append(details)
         else:
             trace_content.append("No exception details available.\n")
             trace_content.append("This error occurred without a Python exception.\n")
@@ -1437,10 +2013,10 @@ IBAN Number: PK24ALFH0740001009144194"""
         y = (error_window.winfo_screenheight() // 2) - (error_window.winfo_height() // 2)
         error_window.geometry(f"+{x}+{y}")
     
-    def show_error(self, title, error_message, exception=None, context=None):
+    def show_error(self, title, error_message, exception=None, context=None, details=None):
         """Show error with option to view details"""
         # Show details dialog directly
-        self.show_error_details(title, error_message, exception, context)
+        self.show_error_details(title, error_message, exception, context, details)
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Workspace tab for the InvoiceArtisan GUI
+Lists many invoice files and generates their PDFs through a batch queue
+"""
+
+import os
+import queue
+import time
+import tkinter as tk
+from datetime import date, timedelta
+from pathlib import Path
+from tkinter import ttk, filedialog, messagebox
+
+from gui.utils.background import BackgroundTask
+
+STATUS_LABELS = {
+    'pending': "Pending",
+    'queued': "Queued",
+    'done': "Done",
+    'failed': "Failed",
+    'cancelled': "Cancelled",
+}
+
+
+def _first_line(text):
+    """Summary line of a possibly multi-line error message"""
+    lines = str(text).strip().splitlines()
+    return lines[0] if lines else ''
+
+
+def _find_invoices(folder):
+    """Index a folder in the invoice store and return the rows for its invoices"""
+    from core.invoice_store import InvoiceStore
+
+    root = str(Path(folder).resolve())
+    with InvoiceStore() as store:
+        store.import_directory(root)
+        return [row for row in store.iter_invoices(order_by='number')
+                if row['yaml_path'] and row['yaml_path'].startswith(root + os.sep)]
+
+
+def _month_invoices(day):
+    """Indexed invoices dated in the month of ``day``"""
+    from core.invoice_store import InvoiceStore
+
+    first = day.replace(day=1)
+    last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    with InvoiceStore() as store:
+        return [row for row in store.iter_invoices(date_from=first.isoformat(), date_to=last.isoformat(),
+                                                   order_by='client')
+                if row['yaml_path'] and os.path.exists(row['yaml_path'])]
+
+
+def _file_records(paths):
+    """Summary rows for individually chosen invoice files"""
+    from core.invoice_store import invoice_record, load_yaml
+
+    rows = []
+    for path in paths:
+        try:
+            data = load_yaml(path)
+            rows.append(invoice_record(data, str(Path(path).resolve())))
+        except Exception as e:
+            print(f"Warning: Could not read invoice {path}: {e}")
+    return rows
+
+
+class WorkspaceTab:
+    """Invoice list with a bounded background batch generation queue"""
+
+    def __init__(self, app, frame):
+        self.app = app
+        self.root = app.root
+        self.jobs = {}
+        # Full error text of failed invoices by path, for the details dialog
+        self.errors = {}
+        self.batch_task = None
+        self.batch_updates = queue.Queue()
+        self.batch_started = None
+        self.batch_finished = 0
+
+        content_frame = ttk.Frame(frame)
+        content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        # Sources
+        sources_frame = ttk.Frame(content_frame)
+        sources_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Button(sources_frame, text="📁 Add Folder",
+                   command=self.add_folder, style='Modern.Primary.TButton').pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(sources_frame, text="📄 Add Files",
+                   command=self.add_files).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(sources_frame, text="🗓️ This Month's Invoices",
+                   command=self.add_month).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(sources_frame, text="🗑️ Remove",
+                   command=self.remove_selected).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(sources_frame, text="📂 Open in Editor",
+                   command=self.open_selected).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(sources_frame, text="⚠️ Error Details",
+                   command=self.show_selected_error).pack(side=tk.LEFT)
+
+        # Invoice list
+        list_frame = ttk.Frame(content_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True)
+        columns = (('file', 'File', 220), ('number', 'Invoice #', 140), ('client', 'Client', 200),
+                   ('date', 'Date', 100), ('status', 'Status', 100), ('seconds', 'Time (s)', 80))
+        self.tree = ttk.Treeview(list_frame, columns=[c for c, _, _ in columns], show='headings',
+                                 selectmode='extended')
+        for column_id, heading, width in columns:
+            self.tree.heading(column_id, text=heading)
+            self.tree.column(column_id, width=width)
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.bind('<Double-1>', lambda event: self.open_selected())
+
+        # Batch controls
+        batch_frame = ttk.LabelFrame(content_frame, text="Batch Generation", padding=10)
+        batch_frame.pack(fill=tk.X, pady=(20, 0))
+        ttk.Label(batch_frame, text="Workers:").pack(side=tk.LEFT)
+        self.workers_var = tk.StringVar(value=str(os.cpu_count() or 1))
+        ttk.Spinbox(batch_frame, from_=1, to=64, width=4,
+                    textvariable=self.workers_var).pack(side=tk.LEFT, padx=(5, 20))
+        self.generate_btn = ttk.Button(batch_frame, text="🚀 Generate Selected",
+                                       command=self.generate_selected, style='Modern.Success.TButton')
+        self.generate_btn.pack(side=tk.LEFT, padx=(0, 10))
+        self.cancel_btn = ttk.Button(batch_frame, text="⏹ Cancel", command=self.cancel_batch,
+                                     state=tk.DISABLED, style='Modern.Warning.TButton')
+        self.cancel_btn.pack(side=tk.LEFT, padx=(0, 20))
+        self.progress = ttk.Progressbar(batch_frame, mode='determinate', length=200)
+        self.progress.pack(side=tk.LEFT, padx=(0, 10))
+        self.summary_label = ttk.Label(batch_frame, text="")
+        self.summary_label.pack(side=tk.LEFT)
+
+    # Adding invoices
+
+    def add_records(self, rows):
+        """Add invoice summary rows, skipping files already in the workspace"""
+        added = 0
+        for row in rows:
+            path = row['yaml_path']
+            if self.tree.exists(path):
+                continue
+            self.tree.insert('', 'end', iid=path, values=(
+                os.path.basename(path), row['number'], row['client'], row['date'],
+                STATUS_LABELS['pending'], ''))
+            added += 1
+        self.summary_label.config(text=f"Added {added} invoices ({len(self.tree.get_children())} in workspace)")
+
+    def load_in_background(self, func, *args, description="Loading invoices..."):
+        """Run a slow lookup off the UI thread and add its rows when done"""
+        self.summary_label.config(text=description)
+        BackgroundTask(self.root, lambda task: func(*args), on_success=self.add_records,
+                       on_error=lambda e: self.app.show_error("Workspace Error",
+                                                              f"Could not load invoices: {e}", exception=e),
+                       name="WorkspaceLoad").start()
+
+    def add_folder(self):
+        folder = filedialog.askdirectory(title="Add Invoice Folder", initialdir=os.getcwd())
+        if folder:
+            self.load_in_background(_find_invoices, folder, description=f"Scanning {folder}...")
+
+    def add_files(self):
+        paths = filedialog.askopenfilenames(
+            title="Add Invoice Files",
+            initialdir=os.getcwd(),
+            filetypes=[("YAML files", "*.yaml"), ("YAML files", "*.yml"), ("All files", "*.*")]
+        )
+        if paths:
+            self.load_in_background(_file_records, list(paths))
+
+    def add_month(self):
+        self.load_in_background(_month_invoices, date.today(),
+                                description="Loading this month's invoices...")
+
+    def remove_selected(self):
+        if self.batch_task is not None:
+            return
+        for path in self.tree.selection():
+            self.tree.delete(path)
+            self.errors.pop(path, None)
+
+    def open_selected(self):
+        selection = self.tree.selection()
+        if selection:
+            self.app.load_yaml_async(selection[0])
+            self.app.notebook.select(0)
+
+    def show_selected_error(self):
+        """Show the full error of the selected failed invoice"""
+        failed = [path for path in self.tree.selection() if path in self.errors]
+        if not failed:
+            messagebox.showinfo("Workspace", "Select an invoice that failed to generate.")
+            return
+        path = failed[0]
+        self.app.show_error("Batch Generation Error", _first_line(self.errors[path]),
+                            context=f"File Path: {path}", details=self.errors[path])
+
+    # Batch generation
+
+    def generate_selected(self):
+        """Queue PDF generation for the selected invoices (all of them if none are selected)"""
+        from core.batch import BatchJob, run_batch
+
+        if self.batch_task is not None:
+            return
+        paths = self.tree.selection() or self.tree.get_children()
+        if not paths:
+            messagebox.showinfo("Workspace", "Add some invoices to the workspace first.")
+            return
+        try:
+            workers = max(1, int(self.workers_var.get()))
+        except ValueError:
+            workers = os.cpu_count() or 1
+
+        template_id = self.app.get_selected_template()
+        jobs = [BatchJob(path, template_id=template_id) for path in paths]
+        for job in jobs:
+            self.set_job_status(job)
+
+        def run(task):
+            def on_update(job):
+                self.batch_updates.put((job.yaml_path, job.status, job.seconds, job.error))
+                # Wakes the UI poller; the per-job details travel through batch_updates
+                task.report_progress(0, "")
+            return run_batch(jobs, max_workers=workers, on_update=on_update, cancel_event=task.cancel_event)
+
+        self.batch_started = time.perf_counter()
+        self.batch_finished = 0
+        self.progress.config(maximum=len(jobs), value=0)
+        self.generate_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self.batch_task = BackgroundTask(self.root, run, on_success=self.on_batch_finished,
+                                         on_error=self.on_batch_failed,
+                                         on_progress=lambda *args: self.drain_updates(len(jobs)),
+                                         name="InvoiceBatch").start()
+
+    def set_job_status(self, job):
+        self.errors.pop(job.yaml_path, None)
+        self.tree.set(job.yaml_path, 'status', STATUS_LABELS[job.status])
+        self.tree.set(job.yaml_path, 'seconds', '')
+
+    def drain_updates(self, total):
+        """Apply queued per-invoice status changes and refresh throughput"""
+        while True:
+            try:
+                path, status, seconds, error = self.batch_updates.get_nowait()
+            except queue.Empty:
+                break
+            if not self.tree.exists(path):
+                continue
+            if error:
+                # The cell shows the summary; the full text is under Error Details
+                self.errors[path] = error
+                self.tree.set(path, 'status', f"Failed: {_first_line(error)}")
+            else:
+                self.tree.set(path, 'status', STATUS_LABELS[status])
+            if seconds is not None:
+                self.tree.set(path, 'seconds', f"{seconds:.2f}")
+            if status in ('done', 'failed', 'cancelled'):
+                self.batch_finished += 1
+
+        elapsed = time.perf_counter() - self.batch_started
+        rate = self.batch_finished / elapsed if elapsed else 0.0
+        self.progress.config(value=self.batch_finished)
+        self.summary_label.config(text=f"{self.batch_finished}/{total} finished | {rate:.1f} invoices/s")
+
+    def cancel_batch(self):
+        if self.batch_task is not None:
+            self.batch_task.cancel()
+            self.summary_label.config(text="Cancelling after the running invoices finish...")
+
+    def on_batch_finished(self, stats):
+        self.drain_updates(int(self.progress['maximum']))
+        self.batch_task = None
+        self.generate_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.summary_label.config(
+            text=f"{stats['done']} generated, {stats['failed']} failed, {stats['cancelled']} cancelled "
+                 f"in {stats['elapsed']:.1f}s ({stats['per_second']:.1f} invoices/s)")
+
+    def on_batch_failed(self, error):
+        self.batch_task = None
+        self.generate_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.app.show_error("Batch Generation Error", f"Batch generation stopped: {error}", exception=error)
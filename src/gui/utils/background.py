@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Background work helpers for the InvoiceArtisan GUI
+Runs slow work off the Tk main thread and marshals results back with root.after
+"""
+
+import queue
+import threading
+import traceback
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task when it notices it has been cancelled"""
+
+
+class BackgroundTask:
+    """Run a function on a worker thread and deliver its outcome on the Tk thread.
+
+    The function receives the task itself so it can call ``report_progress``
+    and check ``cancelled``/``check_cancelled``. Callbacks (on_success,
+    on_error, on_progress, on_cancel) are always invoked from the Tk event
+    loop, never from the worker thread.
+    """
+
+    def __init__(self, root, func, on_success=None, on_error=None,
+                 on_progress=None, on_cancel=None, poll_ms=50, name=None):
+        self.root = root
+        self.func = func
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.poll_ms = poll_ms
+        self.cancel_event = threading.Event()
+        self._events = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name or "InvoiceArtisanTask", daemon=True)
+        self._after_id = None
+        self.done = False
+
+    # Worker side
+
+    def report_progress(self, fraction, message=""):
+        """Report progress (0.0-1.0) from the worker thread"""
+        self._events.put(('progress', (fraction, message)))
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raise TaskCancelled if cancellation was requested"""
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def _run(self):
+        try:
+            result = self.func(self)
+        except TaskCancelled:
+            self._events.put(('cancelled', None))
+        except Exception as e:
+            e.formatted_traceback = traceback.format_exc()
+            self._events.put(('error', e))
+        else:
+            self._events.put(('success', result))
+
+    # Tk side
+
+    def start(self):
+        """Start the worker and begin polling for its events"""
+        self._thread.start()
+        self._after_id = self.root.after(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        """Request cancellation; the worker stops at its next check"""
+        self.cancel_event.set()
+
+    def _poll(self):
+        self._after_id = None
+        latest_progress = None
+        try:
+            while True:
+                kind, payload = self._events.get_nowait()
+                if kind == 'progress':
+                    latest_progress = payload
+                    continue
+                # Deliver any pending progress before the final outcome
+                if latest_progress and self.on_progress:
+                    self.on_progress(*latest_progress)
+                latest_progress = None
+                self.done = True
+                callback = {'success': self.on_success, 'error': self.on_error,
+                            'cancelled': self.on_cancel}[kind]
+                if callback:
+                    if kind == 'cancelled':
+                        callback()
+                    else:
+                        callback(payload)
+                return
+        except queue.Empty:
+            pass
+
+        # Coalesce bursts of progress events into one UI update per poll
+        if latest_progress and self.on_progress:
+            self.on_progress(*latest_progress)
+        self._after_id = self.root.after(self.poll_ms, self._poll)
+
+
+class Debouncer:
+    """Collapse bursts of calls into one callback after ``delay_ms`` of quiet"""
+
+    def __init__(self, root, delay_ms, callback):
+        self.root = root
+        self.delay_ms = delay_ms
+        self.callback = callback
+        self._after_id = None
+
+    def trigger(self, *args):
+        """Restart the quiet period; extra arguments (e.g. from Tk traces) are ignored"""
+        self.cancel()
+        self._after_id = self.root.after(self.delay_ms, self._fire)
+
+    def cancel(self):
+        """Drop any pending callback"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    @property
+    def pending(self):
+        return self._after_id is not None
+
+    def _fire(self):
+        self._after_id = None
+        self.callback()
+
+
+def poll_future(root, future, on_success=None, on_error=None, poll_ms=50):
+    """Deliver a concurrent Future's outcome on the Tk thread once it completes"""
+    def check():
+        if not future.done():
+            root.after(poll_ms, check)
+            return
+        error = future.exception()
+        if error is None:
+            if on_success:
+                on_success(future.result())
+        elif on_error:
+            on_error(error)
+    root.after(poll_ms, check)
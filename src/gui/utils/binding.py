@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Two-way form binding for the InvoiceArtisan GUI
+Tracks which invoice fields were edited so only those are synchronized,
+and which data sections changed so previews only rebuild what is stale
+"""
+
+import tkinter as tk
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+_MISSING = object()
+
+
+class VarField:
+    """Field adapter for a Tk variable (StringVar, DoubleVar, ...)"""
+
+    def __init__(self, var):
+        self.var = var
+
+    def get(self):
+        return self.var.get()
+
+    def set(self, value):
+        self.var.set(value)
+
+    def watch(self, callback):
+        self.var.trace_add('write', lambda *args: callback())
+
+
+class TextField:
+    """Field adapter for a Text/ScrolledText widget; the value is the stripped text.
+
+    The widget can be attached after binding (e.g. when its tab is first
+    built); until then the adapter holds the value itself.
+    """
+
+    def __init__(self, widget=None):
+        self.widget = None
+        self.value = ''
+        self._callbacks = []
+        if widget is not None:
+            self.attach(widget)
+
+    def attach(self, widget):
+        """Start showing the value in a widget"""
+        self.widget = widget
+        self.set(self.value)
+        for callback in self._callbacks:
+            self._bind(callback)
+
+    def get(self):
+        if self.widget is None:
+            return self.value
+        return self.widget.get('1.0', tk.END).strip()
+
+    def set(self, value):
+        self.value = value
+        if self.widget is None:
+            return
+        self.widget.delete('1.0', tk.END)
+        self.widget.insert('1.0', value)
+        # Programmatic loads are not user edits
+        self.widget.edit_modified(False)
+
+    def watch(self, callback):
+        self._callbacks.append(callback)
+        if self.widget is not None:
+            self._bind(callback)
+
+    def _bind(self, callback):
+        def on_modified(event):
+            # <<Modified>> also fires when the flag is reset, so check it is set
+            if self.widget.edit_modified():
+                self.widget.edit_modified(False)
+                callback()
+        self.widget.bind('<<Modified>>', on_modified, add='+')
+
+
+class FormBinding:
+    """Binds form fields to paths in the invoice data dict with dirty tracking.
+
+    Paths are tuples such as ('client', 'name'); the first key is the data
+    section. Edits mark their path dirty, ``collect`` copies only dirty fields
+    into the data and ``load`` only writes fields whose displayed value differs.
+    """
+
+    def __init__(self, on_change: Optional[Callable[[Tuple[str, ...]], None]] = None):
+        self.on_change = on_change
+        self.bindings: Dict[Tuple[str, ...], Tuple[Any, Optional[Callable], Optional[Callable]]] = {}
+        self.dirty: Set[Tuple[str, ...]] = set()
+        self._loading = False
+
+    def bind(self, path: Tuple[str, ...], field, to_data: Optional[Callable] = None,
+             from_data: Optional[Callable] = None) -> None:
+        """Bind a field adapter to a data path.
+
+        Args:
+            path: Keys leading to the value in the invoice data
+            field: VarField/TextField (anything with get, set and watch)
+            to_data: Converts the displayed value to the stored value
+            from_data: Converts the stored value to the displayed value
+        """
+        self.bindings[path] = (field, to_data, from_data)
+        field.watch(lambda: self._mark_dirty(path))
+
+    def _mark_dirty(self, path: Tuple[str, ...]) -> None:
+        if self._loading:
+            return
+        self.dirty.add(path)
+        if self.on_change:
+            self.on_change(path)
+
+    def collect(self, data: Dict[str, Any]) -> Set[str]:
+        """Copy edited fields into ``data`` and return the sections whose values changed"""
+        changed = set()
+        for path in self.dirty:
+            field, to_data, _ = self.bindings[path]
+            value = field.get()
+            if to_data:
+                value = to_data(value)
+            container = data
+            for key in path[:-1]:
+                container = container.setdefault(key, {})
+            if container.get(path[-1], _MISSING) != value:
+                container[path[-1]] = value
+                changed.add(path[0])
+        self.dirty.clear()
+        return changed
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """Show ``data`` in the bound fields, skipping fields that already display it"""
+        self._loading = True
+        try:
+            for path, (field, _, from_data) in self.bindings.items():
+                value = data
+                for key in path:
+                    value = value.get(key, '') if isinstance(value, dict) else ''
+                if from_data:
+                    value = from_data(value)
+                if field.get() != value:
+                    field.set(value)
+        finally:
+            self._loading = False
+        self.dirty.clear()
+
+
+class SectionCache:
+    """Rendered output per preview section, invalidated by the data sections it depends on"""
+
+    def __init__(self, dependencies: Dict[str, Iterable[str]]):
+        self.dependencies = {name: set(sections) for name, sections in dependencies.items()}
+        self._cache: Dict[str, Any] = {}
+
+    def invalidate(self, changed_sections: Iterable[str]) -> None:
+        changed = set(changed_sections)
+        for name, sections in self.dependencies.items():
+            if sections & changed:
+                self._cache.pop(name, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def get(self, name: str, build: Callable[[], Any]) -> Any:
+        """Return the cached output for a section, building it if stale"""
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
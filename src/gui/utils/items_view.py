@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Virtualized items list for the InvoiceArtisan GUI
+A Treeview that only materializes the rows on screen, so invoices with tens
+of thousands of items scroll and edit without rebuilding the whole list
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualItemsView:
+    """Windowed view over an indexable row source.
+
+    The Treeview holds a fixed pool of row slots, one per visible line, and
+    the scrollbar moves a window over the underlying rows. Scrolling refills
+    the slots with ``row_values(index)``; edits are applied with
+    ``row_updated``/``row_inserted``/``row_deleted`` so only rows inside the
+    window are touched. Selection is tracked as an absolute row index.
+    """
+
+    def __init__(self, parent, columns, row_values, row_count, on_select=None):
+        """
+        Args:
+            parent: Parent widget
+            columns: Sequence of (column_id, heading, width) tuples
+            row_values: Callable returning the tuple of values for a row index
+            row_count: Callable returning the number of rows
+            on_select: Callback invoked with the selected row index
+        """
+        self.row_values = row_values
+        self.row_count = row_count
+        self.on_select = on_select
+        self.first = 0
+        self.visible = 10
+        self.selected = None
+
+        self.frame = ttk.Frame(parent)
+        column_ids = [column_id for column_id, _, _ in columns]
+        self.tree = ttk.Treeview(self.frame, columns=column_ids, show='headings',
+                                 selectmode='browse', height=self.visible)
+        for column_id, heading, width in columns:
+            self.tree.heading(column_id, text=heading)
+            self.tree.column(column_id, width=width)
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self._scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda event: self._scroll_by(3))
+        for key, delta in (('<Up>', -1), ('<Down>', 1)):
+            self.tree.bind(key, lambda event, delta=delta: self._move_selection(delta))
+        self.tree.bind('<Prior>', lambda event: self._move_selection(-self.visible))
+        self.tree.bind('<Next>', lambda event: self._move_selection(self.visible))
+        self.tree.bind('<Home>', lambda event: self._select_and_notify(0))
+        self.tree.bind('<End>', lambda event: self._select_and_notify(self.row_count() - 1))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    # Incremental updates
+
+    def reset(self):
+        """Show a new row source from the top"""
+        self.first = 0
+        self.selected = None
+        self._render()
+
+    def row_updated(self, index):
+        """Refresh one row if it is on screen"""
+        slot = index - self.first
+        if 0 <= slot < len(self.tree.get_children()):
+            self.tree.item(f'row{slot}', values=self.row_values(index))
+
+    def row_inserted(self, index):
+        """Account for a row inserted at ``index``"""
+        if self.selected is not None and self.selected >= index:
+            self.selected += 1
+        self._render(start=index)
+
+    def row_deleted(self, index):
+        """Account for the row at ``index`` having been removed"""
+        if self.selected == index:
+            self.selected = None
+        elif self.selected is not None and self.selected > index:
+            self.selected -= 1
+        self._render(start=index)
+
+    # Selection
+
+    def selection(self):
+        """Absolute index of the selected row, or None"""
+        return self.selected
+
+    def select(self, index):
+        """Select a row by absolute index, scrolling it into view"""
+        total = self.row_count()
+        if not total:
+            return
+        self.selected = max(0, min(index, total - 1))
+        self.see(self.selected)
+        self._sync_selection()
+
+    def clear_selection(self):
+        self.selected = None
+        self._sync_selection()
+
+    def see(self, index):
+        """Scroll so that a row is inside the window"""
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self.visible:
+            self.first = index - self.visible + 1
+        else:
+            return
+        self._render()
+
+    # Scrolling
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * self.row_count())
+        elif args[0] == 'scroll':
+            step = self.visible if args[2] == 'pages' else 1
+            self.first += int(args[1]) * step
+        self._render()
+
+    def _scroll_by(self, rows):
+        self.first += rows
+        self._render()
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        rows = -int(event.delta / 120 * 3) if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+        return self._scroll_by(rows)
+
+    def _on_resize(self, event):
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or DEFAULT_ROW_HEIGHT)
+        # One extra row of space is taken by the column headings
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self._render()
+
+    # Rendering
+
+    def _render(self, start=None):
+        """Fill the row slots for the current window, from ``start`` onwards"""
+        total = self.row_count()
+        self.first = max(0, min(self.first, total - self.visible))
+        count = min(self.visible, total - self.first)
+
+        children = self.tree.get_children()
+        for slot in range(len(children), count):
+            self.tree.insert('', 'end', iid=f'row{slot}')
+        if len(children) > count:
+            self.tree.delete(*children[count:])
+
+        first_slot = 0 if start is None else max(0, start - self.first)
+        for slot in range(first_slot, count):
+            self.tree.item(f'row{slot}', values=self.row_values(self.first + slot))
+
+        self._sync_selection()
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + count) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _sync_selection(self):
+        """Mirror the absolute selection onto the visible row slots"""
+        slot = None if self.selected is None else self.selected - self.first
+        if slot is not None and 0 <= slot < len(self.tree.get_children()):
+            self.tree.selection_set(f'row{slot}')
+            self.tree.focus(f'row{slot}')
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            # Selection scrolled out of the window; keep the absolute index
+            return
+        index = self.first + self.tree.index(selection[0])
+        if index != self.selected:
+            self.selected = index
+            if self.on_select:
+                self.on_select(index)
+
+    def _select_and_notify(self, index):
+        self.select(index)
+        if self.selected is not None and self.on_select:
+            self.on_select(self.selected)
+        return 'break'
+
+    def _move_selection(self, delta):
+        start = self.first if self.selected is None else self.selected + delta
+        return self._select_and_notify(start)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+In-memory PDF preview rendering for the InvoiceArtisan GUI
+Renders an invoice to a memory buffer and rasterizes only the pages that changed
+"""
+
+import hashlib
+import importlib
+import importlib.util
+import io
+
+# Optional page rasterization with PyMuPDF (imported as 'fitz' before 1.24).
+# The module is large, so it is only imported when the first page is rasterized.
+_PYMUPDF_MODULE = next((name for name in ('pymupdf', 'fitz') if importlib.util.find_spec(name)), None)
+PYMUPDF_AVAILABLE = _PYMUPDF_MODULE is not None
+
+
+def _fitz():
+    return importlib.import_module(_PYMUPDF_MODULE)
+
+
+def render_pdf_bytes(invoice_data, template_id, totals=None, cancel_event=None):
+    """Render an invoice PDF into memory and return its bytes"""
+    from core.invoice_generator import generate_invoice
+
+    buffer = io.BytesIO()
+    generate_invoice(invoice_data, buffer, template_id, totals=totals, cancel_event=cancel_event)
+    return buffer.getvalue()
+
+
+def rasterize_pdf(pdf_bytes, width=None, zoom=1.0, fmt='png', known_hashes=None):
+    """Rasterize the pages of an in-memory PDF.
+
+    Args:
+        pdf_bytes: PDF document bytes
+        width: Target image width in pixels (overrides zoom when given)
+        zoom: Scale factor relative to 72 dpi
+        fmt: Image format passed to PyMuPDF ('png' or 'ppm')
+        known_hashes: Page content hashes from the previous render; pages whose
+            hash is unchanged are not rasterized again
+
+    Returns:
+        A list with one (content_hash, image_bytes or None) tuple per page,
+        where None means the page is unchanged from ``known_hashes``
+    """
+    if not PYMUPDF_AVAILABLE:
+        raise RuntimeError("PyMuPDF is required for PDF previews (pip install pymupdf)")
+
+    fitz = _fitz()
+    known_hashes = known_hashes or []
+    pages = []
+    with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+        for page_number in range(doc.page_count):
+            page = doc[page_number]
+            scale = width / page.rect.width if width else zoom
+            digest = hashlib.sha1(page.read_contents())
+            digest.update(f"{scale:.4f}".encode())
+            content_hash = digest.hexdigest()
+
+            if page_number < len(known_hashes) and known_hashes[page_number] == content_hash:
+                pages.append((content_hash, None))
+                continue
+
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+            pages.append((content_hash, pixmap.tobytes(fmt)))
+    return pages
+
+
+class PreviewRenderer:
+    """Keeps the page hashes of the last preview so re-renders only rasterize changed pages"""
+
+    def __init__(self):
+        self.page_hashes = []
+
+    def render(self, invoice_data, template_id, totals=None, width=None, cancel_event=None):
+        """Render and rasterize an invoice.
+
+        Returns:
+            (page_count, {page_index: png_bytes}) for the pages that changed
+        """
+        pdf_bytes = render_pdf_bytes(invoice_data, template_id, totals=totals, cancel_event=cancel_event)
+        pages = rasterize_pdf(pdf_bytes, width=width, known_hashes=self.page_hashes)
+        self.page_hashes = [content_hash for content_hash, _ in pages]
+        changed = {index: image for index, (_, image) in enumerate(pages) if image is not None}
+        return len(pages), changed
+
+    def reset(self):
+        """Forget the previous render so the next one rasterizes every page"""
+        self.page_hashes = []
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Template thumbnail rendering for the InvoiceArtisan GUI
+Renders each template's sample invoice once and caches the image on disk,
+keyed by the template configuration so edits to template_configs.yaml
+produce fresh thumbnails
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from gui.utils.pdf_preview import rasterize_pdf, render_pdf_bytes
+from utils.file_utils import write_atomic
+from utils.metrics import TEMPLATE_CACHE
+
+THUMBNAIL_DIR = os.path.join('output', 'temp', 'thumbnails')
+THUMBNAIL_WIDTH = 150
+
+# Bump when the invoice layout changes so previously cached thumbnails are ignored
+THUMBNAIL_VERSION = 1
+
+
+def thumbnail_key(template_manager, template_id, width, sample_data):
+    """Cache key covering everything that affects a template's thumbnail"""
+    payload = json.dumps({
+        'template': template_manager.get_template_hash(template_id),
+        'sample': sample_data,
+        'width': width,
+        'version': THUMBNAIL_VERSION,
+    }, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class ThumbnailCache:
+    """PNG thumbnails stored as <key>.png files in a cache directory"""
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def path_for(self, key):
+        return self.cache_dir / f"{key}.png"
+
+    def get(self, key):
+        """Cached PNG bytes for a key, or None"""
+        try:
+            png = self.path_for(key).read_bytes()
+        except OSError:
+            TEMPLATE_CACHE.inc(result='miss')
+            return None
+        TEMPLATE_CACHE.inc(result='hit')
+        return png
+
+    def put(self, key, png):
+        write_atomic(self.path_for(key), lambda file: file.write(png), mode='wb')
+
+    def prune(self, keep_keys):
+        """Delete thumbnails whose key is no longer current and return how many were removed"""
+        keep = {f"{key}.png" for key in keep_keys}
+        removed = 0
+        if self.cache_dir.is_dir():
+            for path in self.cache_dir.glob('*.png'):
+                if path.name not in keep:
+                    path.unlink()
+                    removed += 1
+        return removed
+
+
+def render_thumbnail(template_id, sample_data, width=THUMBNAIL_WIDTH, cancel_event=None):
+    """Render the first page of a template's sample invoice as PNG bytes"""
+    pdf_bytes = render_pdf_bytes(sample_data, template_id, cancel_event=cancel_event)
+    return rasterize_pdf(pdf_bytes, width=width)[0][1]
+
+
+def load_thumbnails(cache=None, width=THUMBNAIL_WIDTH, cancel_event=None):
+    """Thumbnails for every template, rendering only those missing from the cache.
+
+    Templates are reloaded first if template_configs.yaml changed, and cached
+    thumbnails for outdated configurations are pruned.
+
+    Returns:
+        Dict of template id -> PNG bytes
+    """
+    from utils.template_manager import get_template_manager
+
+    cache = cache or ThumbnailCache()
+    template_manager = get_template_manager()
+    template_manager.reload_if_changed()
+    sample_data = template_manager.get_template_preview_data()
+
+    thumbnails = {}
+    keys = []
+    for template_id in list(template_manager.templates):
+        key = thumbnail_key(template_manager, template_id, width, sample_data)
+        keys.append(key)
+        png = cache.get(key)
+        if png is None:
+            png = render_thumbnail(template_id, sample_data, width, cancel_event)
+            cache.put(key, png)
+        thumbnails[template_id] = png
+
+    cache.prune(keys)
+    return thumbnails
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Configuration loading for InvoiceArtisan
+Reads config/app_config.yaml in both development and PyInstaller builds
+"""
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+import yaml
+
+
+def get_project_root() -> Path:
+    """Get the directory that contains the assets and config folders"""
+    if getattr(sys, 'frozen', False):
+        # Running as PyInstaller executable
+        return Path(sys._MEIPASS)
+    return Path(__file__).parent.parent.parent
+
+
+def get_data_root() -> Path:
+    """Get the directory for data kept between runs, such as databases"""
+    if getattr(sys, 'frozen', False):
+        # _MEIPASS is a temporary folder; keep data next to the executable
+        return Path(sys.executable).parent
+    return get_project_root()
+
+
+@lru_cache(maxsize=None)
+def load_app_config(config_path: str = None) -> Dict[str, Any]:
+    """Load the application configuration (cached after the first call)"""
+    path = Path(config_path) if config_path else get_project_root() / "config" / "app_config.yaml"
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return yaml.safe_load(file) or {}
+    except (OSError, yaml.YAMLError) as e:
+        print(f"Warning: Could not load app config from {path}: {e}")
+        return {}
+
+
+def get_config_value(*keys: str, default: Any = None, config: Dict[str, Any] = None) -> Any:
+    """Look up a nested configuration value, e.g. get_config_value('invoice', 'default', 'tax_rate')"""
+    value = load_app_config() if config is None else config
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
+
+
+def get_data_path(*keys: str, default: str) -> Path:
+    """A configured file path, with relative paths resolved against get_data_root()"""
+    path = Path(get_config_value(*keys, default=default))
+    return path if path.is_absolute() else get_data_root() / path
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+File operations for InvoiceArtisan
+Fast YAML reading, atomic writes and a background writer that coalesces saves
+"""
+
+import os
+import stat
+import tempfile
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+# The libyaml-backed classes are several times faster when PyYAML was built with them
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def _read_umask() -> int:
+    # os.umask can only be read by setting it, so do it once at import rather
+    # than racing other threads on every write
+    umask = os.umask(0o022)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def read_yaml(path) -> Any:
+    """Parse a YAML file"""
+    with open(path, 'r', encoding='utf-8') as file:
+        return yaml.load(file, Loader=YAML_LOADER)
+
+
+def write_atomic(path, write: Callable[[Any], None], mode: str = 'w') -> None:
+    """Write a file through a temporary file in the same directory, then rename it into place.
+
+    Readers see either the old or the new contents, never a partial file, and
+    a crash mid-write leaves the original untouched. The file keeps the
+    permissions of the one it replaces; new files get the usual 0666 & ~umask
+    rather than mkstemp's private 0600.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    encoding = None if 'b' in mode else 'utf-8'
+    try:
+        permissions = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        permissions = 0o666 & ~_UMASK
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temp_path, permissions)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_yaml_atomic(path, data: Any) -> None:
+    """Dump data to a YAML file atomically, keeping key order"""
+    write_atomic(path, lambda file: yaml.dump(data, file, Dumper=YAML_DUMPER,
+                                              default_flow_style=False, sort_keys=False,
+                                              allow_unicode=True))
+
+
+class CoalescingWriter:
+    """Writes files on a single background thread.
+
+    Each ``submit`` returns a Future. If a path is submitted again before its
+    previous snapshot was written, only the newest snapshot is written and
+    all the waiting futures complete together, so bursts of saves cost one
+    write.
+    """
+
+    def __init__(self, write: Callable[[Any, Any], None] = write_yaml_atomic):
+        self.write = write
+        self._pending: Dict[str, Tuple[Any, List[Future]]] = {}
+        self._condition = threading.Condition()
+        self._writing = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, path, data: Any) -> Future:
+        """Queue a snapshot to be written to ``path``"""
+        future = Future()
+        key = str(path)
+        with self._condition:
+            _, waiting = self._pending.pop(key, (None, []))
+            self._pending[key] = (data, waiting + [future])
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="InvoiceArtisanWriter", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write has finished; returns False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                key = next(iter(self._pending))
+                data, futures = self._pending.pop(key)
+                self._writing = True
+
+            try:
+                self.write(key, data)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+            else:
+                for future in futures:
+                    future.set_result(key)
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Opt-in timing instrumentation for InvoiceArtisan
+Named spans around processing phases, delivered to pluggable sinks (log,
+JSON lines file, in-memory collector). With no sink installed, span() and
+phases() return shared no-op objects, so instrumented code costs one call.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# Set to 'log' or a .jsonl file path to enable spans without code changes
+ENV_VARIABLE = 'INVOICEARTISAN_SPANS'
+
+_sinks: tuple = ()
+_sinks_lock = threading.Lock()
+
+
+def add_sink(sink) -> None:
+    """Start delivering spans to a sink (anything with ``emit(name, seconds, attrs)``)"""
+    global _sinks
+    with _sinks_lock:
+        _sinks = _sinks + (sink,)
+
+
+def remove_sink(sink) -> None:
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s is not sink)
+
+
+def enabled() -> bool:
+    """True when at least one sink is installed"""
+    return bool(_sinks)
+
+
+def emit(name: str, seconds: float, attrs: Optional[Dict[str, Any]] = None) -> None:
+    """Deliver a finished span to every sink"""
+    for sink in _sinks:
+        sink.emit(name, seconds, attrs or {})
+
+
+@contextmanager
+def collecting(*sinks):
+    """Install sinks for the duration of a ``with`` block and yield the first one"""
+    for sink in sinks:
+        add_sink(sink)
+    try:
+        yield sinks[0] if sinks else None
+    finally:
+        for sink in sinks:
+            remove_sink(sink)
+
+
+# Spans
+
+class _Span:
+    __slots__ = ('name', 'attrs', 'start')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        attrs = self.attrs
+        if exc_type is not None:
+            attrs = dict(attrs, error=exc_type.__name__)
+        emit(self.name, time.perf_counter() - self.start, attrs)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **attrs):
+    """Context manager timing a block as a span named ``name``"""
+    if not _sinks:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+
+class PhaseSpans:
+    """Sequential phases of one operation, recorded as ``<operation>.<phase>`` spans.
+
+    ``enter(phase)`` ends the running phase and starts the next, so long
+    functions can be split into phases without re-indenting them. ``close``
+    ends the last phase and records the whole operation as ``<operation>``.
+    """
+
+    __slots__ = ('operation', 'attrs', 'started', 'phase', 'phase_started')
+
+    def __init__(self, operation, attrs):
+        self.operation = operation
+        self.attrs = attrs
+        self.started = time.perf_counter()
+        self.phase = None
+        self.phase_started = self.started
+
+    def enter(self, phase: str) -> None:
+        now = time.perf_counter()
+        if self.phase is not None:
+            emit(f"{self.operation}.{self.phase}", now - self.phase_started, self.attrs)
+        self.phase = phase
+        self.phase_started = now
+
+    def close(self) -> None:
+        if self.started is None:
+            return
+        self.enter(None)
+        emit(self.operation, self.phase_started - self.started, self.attrs)
+        self.started = None
+
+
+class _NullPhases:
+    __slots__ = ()
+
+    def enter(self, phase):
+        pass
+
+    def close(self):
+        pass
+
+
+_NULL_PHASES = _NullPhases()
+
+
+def phases(operation: str, **attrs):
+    """Start timing the phases of ``operation`` (see PhaseSpans)"""
+    if not _sinks:
+        return _NULL_PHASES
+    return PhaseSpans(operation, attrs)
+
+
+# Sinks
+
+class LogSink:
+    """Writes each span to a logger"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger('invoiceartisan.spans')
+        self.level = level
+
+    def emit(self, name, seconds, attrs):
+        extra = ''.join(f" {key}={value}" for key, value in attrs.items())
+        self.logger.log(self.level, "%s %.3f ms%s", name, seconds * 1000, extra)
+
+
+class JsonLinesSink:
+    """Appends one JSON object per span to a file"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def emit(self, name, seconds, attrs):
+        record = {'name': name, 'seconds': seconds, 'time': time.time(), 'pid': os.getpid(), **attrs}
+        line = json.dumps(record, default=str) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+class MemorySink:
+    """Keeps every span duration in memory, grouped by name.
+
+    With ``current_thread_only`` the sink ignores spans from other threads,
+    so concurrent operations can each collect their own timings.
+    """
+
+    def __init__(self, current_thread_only: bool = False):
+        self.samples: Dict[str, List[float]] = {}
+        self.thread_id = threading.get_ident() if current_thread_only else None
+        self._lock = threading.Lock()
+
+    def emit(self, name, seconds, attrs):
+        if self.thread_id is not None and threading.get_ident() != self.thread_id:
+            return
+        with self._lock:
+            self.samples.setdefault(name, []).append(seconds)
+
+    def merge(self, samples: Dict[str, List[float]]) -> None:
+        """Add durations collected elsewhere (e.g. in a worker process)"""
+        with self._lock:
+            for name, values in samples.items():
+                self.samples.setdefault(name, []).extend(values)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, total, mean, p50, p95, p99 and max seconds per span name"""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self.samples.items()}
+        return {
+            name: {
+                'count': len(values),
+                'total': sum(values),
+                'mean': sum(values) / len(values),
+                'p50': percentile(values, 0.50),
+                'p95': percentile(values, 0.95),
+                'p99': percentile(values, 0.99),
+                'max': values[-1],
+            }
+            for name, values in samples.items() if values
+        }
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """Render a MemorySink summary as a table in milliseconds"""
+    width = max([len(name) for name in summary] + [4])
+    lines = [f"{'Span':<{width}}  {'count':>6}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'total ms':>10}"]
+    for name, stats in summary.items():
+        lines.append(f"{name:<{width}}  {stats['count']:>6}  {stats['p50'] * 1000:>9.2f}  "
+                     f"{stats['p95'] * 1000:>9.2f}  {stats['p99'] * 1000:>9.2f}  {stats['total'] * 1000:>10.1f}")
+    return "\n".join(lines)
+
+
+def configure_from_env() -> None:
+    """Install a sink named by the INVOICEARTISAN_SPANS environment variable, if set"""
+    setting = os.environ.get(ENV_VARIABLE, '').strip()
+    if not setting:
+        return
+    if setting == 'log':
+        logging.basicConfig(level=logging.INFO)
+        add_sink(LogSink())
+    else:
+        add_sink(JsonLinesSink(setting))
+
+
+configure_from_env()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Memory profiling for InvoiceArtisan
+Takes tracemalloc snapshots at each instrumented phase boundary of
+generate_invoice and pdf_to_yaml and reports peak memory and top
+allocation sites per phase and per invoice, as a diffable text report
+"""
+
+import os
+import sys
+import sysconfig
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from .instrumentation import add_sink, remove_sink
+except ImportError:
+    # Running as a standalone script
+    from instrumentation import add_sink, remove_sink
+
+DEFAULT_TOP = 10
+
+# Allocations made by the profiler machinery itself
+_IGNORED_FILES = (tracemalloc.__file__, __file__, '<frozen importlib._bootstrap>',
+                  '<frozen importlib._bootstrap_external>', '<unknown>')
+
+_SRC_DIR = str(Path(__file__).resolve().parent.parent)
+_STDLIB_DIR = str(Path(sysconfig.get_paths()['stdlib']).resolve())
+
+
+def _site(filename: str) -> str:
+    """Machine-independent name for a source file, so reports diff cleanly across hosts"""
+    if filename.startswith('<'):
+        return filename
+    path = os.path.realpath(filename)
+    parts = Path(path).parts
+    for marker in ('site-packages', 'dist-packages'):
+        if marker in parts:
+            return '/'.join(parts[parts.index(marker) + 1:])
+    for prefix, label in ((_SRC_DIR, 'src'), (_STDLIB_DIR, 'stdlib')):
+        if path.startswith(prefix + os.sep):
+            return f"{label}/{Path(path[len(prefix) + 1:]).as_posix()}"
+    return '/'.join(parts[-2:])
+
+
+def _kib(size: float) -> str:
+    return f"{size / 1024:,.1f} KiB"
+
+
+class PhaseMemory:
+    """Allocations attributed to one phase of one invoice"""
+
+    def __init__(self, name: str, net_bytes: int, peak_bytes: int, top: List[Dict[str, Any]]):
+        self.name = name
+        self.net_bytes = net_bytes
+        self.peak_bytes = peak_bytes
+        self.top = top
+
+
+class InvoiceMemory:
+    """Per-phase memory of one profiled invoice"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.phases: List[PhaseMemory] = []
+        self.peak_bytes = 0
+
+
+class MemoryProfiler:
+    """Instrumentation sink that snapshots tracemalloc at every phase boundary.
+
+    Use ``profile(label)`` around each invoice; phases are the
+    ``<operation>.<phase>`` spans emitted inside it. Snapshots make
+    profiled runs several times slower, so this is a diagnostic mode.
+    """
+
+    def __init__(self, top: int = DEFAULT_TOP, frames: int = 1):
+        self.top = top
+        self.frames = frames
+        self.invoices: List[InvoiceMemory] = []
+        self._current: Optional[InvoiceMemory] = None
+        self._previous = None
+        # Traced bytes when the invoice and the running phase started, and
+        # the highest traced total seen during the invoice so far
+        self._invoice_base = 0
+        self._phase_base = 0
+        self._invoice_peak = 0
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES])
+
+    @contextmanager
+    def profile(self, label: str):
+        """Profile everything run inside the block as one invoice"""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.frames)
+        invoice = InvoiceMemory(label)
+        self._current = invoice
+        self._previous = self._snapshot()
+        tracemalloc.reset_peak()
+        self._invoice_base = self._phase_base = self._invoice_peak = tracemalloc.get_traced_memory()[0]
+        add_sink(self)
+        try:
+            yield invoice
+        finally:
+            remove_sink(self)
+            # Peak above what was already allocated when the invoice started
+            peak = max(self._invoice_peak, tracemalloc.get_traced_memory()[1])
+            invoice.peak_bytes = max(0, peak - self._invoice_base)
+            self.invoices.append(invoice)
+            self._current = self._previous = None
+            if started_tracing:
+                tracemalloc.stop()
+
+    def emit(self, name, seconds, attrs):
+        if self._current is None or '.' not in name:
+            # Whole-operation spans are covered by the invoice totals
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self._previous, 'lineno')
+        top = [
+            {'site': f"{_site(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+             'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+            for stat in stats[:self.top] if stat.size_diff
+        ]
+        net = sum(stat.size_diff for stat in stats)
+        self._current.phases.append(PhaseMemory(name, net, max(0, peak - self._phase_base), top))
+        self._invoice_peak = max(self._invoice_peak, peak)
+        self._previous = snapshot
+        tracemalloc.reset_peak()
+        # Taking the snapshot allocates too; start the next phase after it
+        self._phase_base = tracemalloc.get_traced_memory()[0]
+
+    def report(self) -> str:
+        """Text report with stable ordering and no addresses or timestamps"""
+        lines = ["# InvoiceArtisan memory profile", ""]
+        for invoice in self.invoices:
+            lines.append(f"## {invoice.label}")
+            lines.append(f"peak: {_kib(invoice.peak_bytes)}")
+            for phase in invoice.phases:
+                lines.append(f"  {phase.name:<36} net {_kib(phase.net_bytes):>14}   peak {_kib(phase.peak_bytes):>14}")
+                for site in phase.top:
+                    lines.append(f"      {site['site']:<60} {_kib(site['size_diff']):>14} "
+                                 f"({site['count_diff']:+,} blocks)")
+            lines.append("")
+
+        if self.invoices:
+            largest = max(self.invoices, key=lambda invoice: invoice.peak_bytes)
+            lines.append("## Summary")
+            lines.append(f"invoices: {len(self.invoices)}")
+            lines.append(f"largest peak: {_kib(largest.peak_bytes)} ({largest.label})")
+            if largest.peak_bytes:
+                per_gib = int((1 << 30) // largest.peak_bytes)
+                lines.append(f"concurrent renders per GiB of headroom: {per_gib} "
+                             f"(Python allocations only; add the worker's baseline RSS)")
+            rss = max_rss_bytes()
+            if rss:
+                lines.append(f"process max RSS: {_kib(rss)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.report(), encoding='utf-8')
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, where the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Metrics registry for InvoiceArtisan
+Counters, gauges and histograms for invoices rendered, render latency, bytes
+written, extraction throughput and cache hits, exposed as Prometheus text over
+an optional local HTTP endpoint and as periodic JSON snapshots.
+
+Each process keeps its own registry; updates take a per-metric lock and never
+touch shared state. For multi-process runs, every process dumps its snapshot
+to its own file in a shared directory and the endpoint merges them on read.
+"""
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .file_utils import write_atomic
+except ImportError:
+    # Running as a standalone script
+    from file_utils import write_atomic
+
+# Directory shared by worker processes for their snapshots (inherited by child processes)
+MULTIPROCESS_ENV = 'INVOICEARTISAN_METRICS_DIR'
+
+DEFAULT_PORT = 9464
+DEFAULT_DUMP_INTERVAL = 15.0
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, Any] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [{'labels': dict(key), 'value': self._copy(value)} for key, value in self._values.items()]
+        return {'type': self.kind, 'help': self.help, 'values': values}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        key = _label_key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Per-bucket (non-cumulative) counts plus an overflow bucket, sum, count
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @staticmethod
+    def _copy(value):
+        return {'counts': list(value[0]), 'sum': value[1], 'count': value[2]}
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot['buckets'] = list(self.buckets)
+        return snapshot
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(_label_key(labels))
+        return entry[2] if entry else 0
+
+
+class MetricsRegistry:
+    """Named metrics of one process"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str = '') -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = '') -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = '', buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable copy of every metric"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            'pid': os.getpid(),
+            'time': time.time(),
+            'metrics': {metric.name: metric.snapshot() for metric in metrics},
+        }
+
+    def clear(self) -> None:
+        """Reset every value (metrics stay registered)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+# Metrics recorded by InvoiceArtisan itself
+INVOICES_RENDERED = REGISTRY.counter('invoiceartisan_invoices_rendered_total', 'Invoices rendered to PDF')
+RENDER_FAILURES = REGISTRY.counter('invoiceartisan_render_failures_total', 'Invoice renders that failed')
+RENDER_SECONDS = REGISTRY.histogram('invoiceartisan_render_seconds', 'Time to render one invoice PDF')
+PDF_BYTES_WRITTEN = REGISTRY.counter('invoiceartisan_pdf_bytes_written_total', 'Bytes of PDF output produced')
+PAGES_EXTRACTED = REGISTRY.counter('invoiceartisan_extraction_pages_total', 'PDF pages read by pdf_to_yaml')
+EXTRACTION_SECONDS = REGISTRY.counter('invoiceartisan_extraction_seconds_total',
+                                      'Time spent extracting text from PDFs')
+EXTRACTION_PAGES_PER_SECOND = REGISTRY.gauge('invoiceartisan_extraction_pages_per_second',
+                                             'Extraction throughput of the most recent PDF')
+TEMPLATE_CACHE = REGISTRY.counter('invoiceartisan_template_cache_requests_total',
+                                  'Template thumbnail cache lookups by result (hit/miss)')
+BATCH_QUEUE_DEPTH = REGISTRY.gauge('invoiceartisan_batch_queue_depth', 'Batch jobs not yet finished')
+BATCH_JOBS = REGISTRY.counter('invoiceartisan_batch_jobs_total', 'Finished batch jobs by status')
+
+
+# Merging and exposition
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Combine per-process snapshots by summing values with the same labels.
+
+    Gauges are point-in-time values (a queue depth, the latest throughput)
+    that mean nothing summed, so each process's gauges keep a 'pid' label.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        pid = snapshot.get('pid')
+        for name, metric in snapshot.get('metrics', {}).items():
+            target = merged.setdefault(name, {'type': metric['type'], 'help': metric['help'],
+                                              'buckets': metric.get('buckets'), 'values': {}})
+            for entry in metric['values']:
+                labels = entry['labels']
+                if metric['type'] == 'gauge' and pid is not None:
+                    labels = dict(labels, pid=pid)
+                key = _label_key(labels)
+                value = entry['value']
+                current = target['values'].get(key)
+                if current is None:
+                    target['values'][key] = (dict(value, counts=list(value['counts']))
+                                             if metric['type'] == 'histogram' else value)
+                elif metric['type'] == 'histogram':
+                    current['counts'] = [a + b for a, b in zip(current['counts'], value['counts'])]
+                    current['sum'] += value['sum']
+                    current['count'] += value['count']
+                else:
+                    target['values'][key] = current + value
+    return merged
+
+
+def merged_snapshot(merged: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """JSON-serialisable form of merge_snapshots() output, laid out like a registry snapshot"""
+    metrics = {}
+    for name, metric in sorted(merged.items()):
+        entry = {'type': metric['type'], 'help': metric['help'],
+                 'values': [{'labels': dict(key), 'value': value}
+                            for key, value in sorted(metric['values'].items())]}
+        if metric['type'] == 'histogram':
+            entry['buckets'] = metric['buckets']
+        metrics[name] = entry
+    return {'time': time.time(), 'metrics': metrics}
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(merged: Dict[str, Dict[str, Any]]) -> str:
+    """Prometheus text exposition format for merged snapshots"""
+    lines: List[str] = []
+    for name in sorted(merged):
+        metric = merged[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        for key, value in sorted(metric['values'].items()):
+            if metric['type'] != 'histogram':
+                lines.append(f"{name}{_format_labels(key)} {_format_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(metric['buckets']) + ['+Inf'], value['counts']):
+                cumulative += count
+                le = bound if bound == '+Inf' else _format_number(float(bound))
+                lines.append(f"{name}_bucket{_format_labels(key, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_number(float(value['sum']))}")
+            lines.append(f"{name}_count{_format_labels(key)} {value['count']}")
+    return '\n'.join(lines) + '\n'
+
+
+def collect_snapshots(registry: MetricsRegistry = REGISTRY, directory=None) -> List[Dict[str, Any]]:
+    """This process's snapshot plus those other processes dumped to ``directory``"""
+    snapshots = [registry.snapshot()]
+    directory = directory or os.environ.get(MULTIPROCESS_ENV)
+    if directory and os.path.isdir(directory):
+        own = f"metrics-{os.getpid()}.json"
+        for path in Path(directory).glob('metrics-*.json'):
+            if path.name == own:
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text(encoding='utf-8')))
+            except (OSError, ValueError):
+                # Being replaced by its process right now; it is picked up on the next read
+                continue
+    return snapshots
+
+
+def render_all(registry: MetricsRegistry = REGISTRY, directory=None) -> str:
+    """Prometheus text for this process and every process sharing ``directory``"""
+    return render_prometheus(merge_snapshots(collect_snapshots(registry, directory)))
+
+
+# Periodic JSON dumps
+
+class JsonDumper:
+    """Writes registry snapshots to a JSON file every ``interval`` seconds and at exit.
+
+    With ``directory`` the file holds the merged view of this process and
+    every process sharing that directory, as the HTTP endpoint serves it.
+    """
+
+    def __init__(self, path, registry: MetricsRegistry = REGISTRY, interval: float = DEFAULT_DUMP_INTERVAL,
+                 directory=None):
+        self.path = Path(path)
+        self.registry = registry
+        self.interval = interval
+        self.directory = directory
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="InvoiceArtisanMetricsDump", daemon=True)
+
+    def start(self) -> 'JsonDumper':
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def dump(self) -> None:
+        if self.directory:
+            snapshot = merged_snapshot(merge_snapshots(collect_snapshots(self.registry, self.directory)))
+        else:
+            snapshot = self.registry.snapshot()
+        write_atomic(self.path, lambda file: json.dump(snapshot, file))
+
+    def stop(self) -> None:
+        """Stop the periodic thread and write a final snapshot"""
+        if not self._stop.is_set():
+            self._stop.set()
+            self.dump()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.dump()
+            except OSError as e:
+                print(f"Warning: Could not write metrics to {self.path}: {e}")
+
+
+# HTTP endpoint
+
+class MetricsServer:
+    """Serves Prometheus text at /metrics on a background thread"""
+
+    def __init__(self, port: int = DEFAULT_PORT, host: str = '127.0.0.1',
+                 registry: MetricsRegistry = REGISTRY, directory=None):
+        # Only processes that serve metrics pay for importing the HTTP stack
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry_ref, directory_ref = registry, directory
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = render_all(registry_ref, directory_ref).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes would otherwise flood stderr
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="InvoiceArtisanMetrics",
+                                        daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def start(self) -> 'MetricsServer':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def enable_multiprocess(directory, interval: float = DEFAULT_DUMP_INTERVAL) -> JsonDumper:
+    """Share metrics with child processes through snapshot files in ``directory``.
+
+    Clears old snapshots, and exports the directory in the environment so
+    worker processes started afterwards dump their own metrics there.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob('metrics-*.json'):
+        path.unlink()
+    os.environ[MULTIPROCESS_ENV] = str(directory)
+    return _start_process_dumper(directory, interval)
+
+
+def _start_process_dumper(directory, interval=DEFAULT_DUMP_INTERVAL) -> JsonDumper:
+    return JsonDumper(Path(directory) / f"metrics-{os.getpid()}.json", interval=interval).start()
+
+
+def start_metrics(port: Optional[int] = None, dump_path=None, interval: float = DEFAULT_DUMP_INTERVAL,
+                  host: str = '127.0.0.1', multiprocess_dir=None):
+    """Start the optional HTTP endpoint and/or periodic JSON dump for this process.
+
+    Returns:
+        (MetricsServer or None, JsonDumper or None)
+    """
+    if multiprocess_dir:
+        enable_multiprocess(multiprocess_dir, interval)
+    server = MetricsServer(port, host, directory=multiprocess_dir).start() if port is not None else None
+    dumper = JsonDumper(dump_path, interval=interval, directory=multiprocess_dir).start() if dump_path else None
+    return server, dumper
+
+
+# Worker processes inherit the shared directory and dump their metrics into it
+if os.environ.get(MULTIPROCESS_ENV):
+    _start_process_dumper(os.environ[MULTIPROCESS_ENV])
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+CPU profiling for InvoiceArtisan
+Wraps work in cProfile and writes pstats files plus collapsed-stack files
+that flamegraph.pl, speedscope and inferno can render, and merges profiles
+from many invoices into one aggregate
+"""
+
+import cProfile
+import pstats
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PROFILE_SUFFIX = '.prof'
+COLLAPSED_SUFFIX = '.collapsed'
+AGGREGATE_NAME = 'aggregate'
+
+# Deepest call stack written to collapsed files; deeper frames fold into their parent
+MAX_DEPTH = 64
+# Stack paths cheaper than this many microseconds are left out of collapsed files
+MIN_MICROSECONDS = 1
+
+
+@contextmanager
+def profiled(base_path):
+    """Profile the block and write ``<base_path>.prof`` and ``<base_path>.collapsed``"""
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        write_profile(pstats.Stats(profile), base_path)
+
+
+def _label(func: Tuple[str, int, str]) -> str:
+    filename, lineno, name = func
+    if filename == '~':
+        # Built-in functions, e.g. "<built-in method builtins.len>"
+        return name.strip('<>')
+    return f"{name} ({Path(filename).name}:{lineno})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """Approximate stacks from the cProfile call graph in collapsed format.
+
+    cProfile only records caller/callee pairs, so a function's time is
+    split over the paths reaching it in proportion to the time each caller
+    spent in it. Each line is ``root;...;leaf <self microseconds>``.
+    """
+    entries = stats.stats
+    callees: Dict[tuple, Dict[tuple, float]] = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+
+    totals: Dict[str, float] = {}
+
+    def walk(func, stack, ratio):
+        _, _, self_time, cumulative, _ = entries[func]
+        stack = stack + (func,)
+        key = ';'.join(_label(f) for f in stack)
+        totals[key] = totals.get(key, 0.0) + self_time * ratio
+        for callee, edge_time in sorted(callees.get(func, {}).items()):
+            callee_cumulative = entries[callee][3]
+            share = ratio * edge_time
+            if callee in stack or not callee_cumulative or share * 1e6 < MIN_MICROSECONDS:
+                continue
+            if len(stack) >= MAX_DEPTH:
+                totals[key] += share
+                continue
+            walk(callee, stack, share / callee_cumulative)
+
+    roots = sorted(func for func, entry in entries.items() if not entry[4])
+    for root in roots:
+        walk(root, (), 1.0)
+    return [f"{key} {round(seconds * 1e6)}" for key, seconds in sorted(totals.items())
+            if round(seconds * 1e6) >= MIN_MICROSECONDS]
+
+
+def write_profile(stats: pstats.Stats, base_path) -> Tuple[Path, Path]:
+    """Write pstats and collapsed-stack files next to each other"""
+    base = Path(base_path)
+    base.parent.mkdir(parents=True, exist_ok=True)
+    profile_path = base.with_name(base.name + PROFILE_SUFFIX)
+    collapsed_path = base.with_name(base.name + COLLAPSED_SUFFIX)
+    stats.dump_stats(str(profile_path))
+    collapsed_path.write_text("\n".join(collapsed_stacks(stats)) + "\n", encoding='utf-8')
+    return profile_path, collapsed_path
+
+
+def merge_profiles(paths: Iterable, base_path) -> Optional[Tuple[Path, Path]]:
+    """Combine several .prof files (e.g. one per invoice) into one aggregate profile"""
+    paths = [str(path) for path in paths]
+    if not paths:
+        return None
+    return write_profile(pstats.Stats(*paths), base_path)
+
+
+def aggregate_directory(directory) -> Optional[Tuple[Path, Path]]:
+    """Merge every profile in ``directory`` into ``<directory>/aggregate.*``"""
+    directory = Path(directory)
+    paths = sorted(path for path in directory.glob(f'*{PROFILE_SUFFIX}') if path.stem != AGGREGATE_NAME)
+    return merge_profiles(paths, directory / AGGREGATE_NAME)
+
+
+def profile_name(index: int, path) -> str:
+    """Per-input profile file name that stays unique when inputs share a stem"""
+    return f"{index:04d}-{Path(path).stem}"
+
+
+def new_run_directory(root) -> Path:
+    """Create a fresh ``<root>/<YYYYmmdd-HHMMSS>`` directory for one run's profiles.
+
+    Keeping each run apart means aggregate_directory() never merges in
+    profiles left over from earlier runs.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    run_id = time.strftime('%Y%m%d-%H%M%S')
+    for attempt in range(1, 1000):
+        directory = root / (run_id if attempt == 1 else f"{run_id}-{attempt}")
+        try:
+            directory.mkdir()
+            return directory
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Too many profile runs in {root} for {run_id}")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Structured run reports for InvoiceArtisan
+One JSON object per generated or converted invoice (input and output
+hashes, output size and pages, phase timings, worker, retries, error
+class), appended to a JSON lines file for aggregation
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+_HASH_CHUNK = 1 << 20
+
+
+def file_sha256(path) -> Optional[str]:
+    """Hex SHA-256 of a file's contents, or None if it can't be read"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(_HASH_CHUNK), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def pdf_page_count(path) -> Optional[int]:
+    """Pages in a PDF, or None for other files and unreadable PDFs"""
+    if not str(path).lower().endswith('.pdf'):
+        return None
+    try:
+        from PyPDF2 import PdfReader
+        return len(PdfReader(str(path)).pages)
+    except Exception:
+        return None
+
+
+def root_error(exc: BaseException) -> BaseException:
+    """The exception behind a failure.
+
+    generate_invoice wraps every error in a RuntimeError raised ``from`` the
+    original, so explicit causes are followed to the end of the chain. Some
+    converters print the error and call sys.exit; the SystemExit then
+    carries the original exception as its context.
+    """
+    seen = set()
+    while id(exc) not in seen:
+        seen.add(id(exc))
+        if exc.__cause__ is not None:
+            exc = exc.__cause__
+        elif isinstance(exc, SystemExit) and exc.__context__ is not None:
+            exc = exc.__context__
+        else:
+            break
+    return exc
+
+
+def error_summary(error: Union[BaseException, str]) -> str:
+    """First line of an error message; generate_invoice appends the whole traceback"""
+    lines = str(error).strip().splitlines()
+    return lines[0] if lines else ''
+
+
+def phase_milliseconds(spans: Optional[Dict[str, List[float]]]) -> Dict[str, float]:
+    """Total milliseconds per span name, from MemorySink samples"""
+    return {name: round(sum(values) * 1000, 3) for name, values in sorted((spans or {}).items())}
+
+
+def worker_id() -> str:
+    """Host and process running the caller, e.g. to tell batch workers apart"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def job_record(action: str, input_path, output_path=None, seconds: Optional[float] = None,
+               spans: Optional[Dict[str, List[float]]] = None,
+               error: Union[BaseException, str, None] = None, error_type: Optional[str] = None,
+               retries: int = 0, worker: Optional[str] = None, **extra: Any) -> Dict[str, Any]:
+    """Build the report entry for one job; files are inspected now, so call it once the job has finished.
+
+    ``error`` is the exception (or message) a failed job ended with, of which
+    only the first line is kept; ``error_type`` names its class when only the
+    message is at hand.
+    ``worker`` is the worker_id() that ran the job, None if unknown.
+    """
+    if isinstance(error, BaseException):
+        error = root_error(error)
+        error_type = error_type or type(error).__name__
+    failed = error is not None or error_type is not None
+    output_exists = output_path is not None and not failed and os.path.exists(output_path)
+    record = {
+        'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'action': action,
+        'status': STATUS_FAILED if failed else STATUS_DONE,
+        'input': str(input_path),
+        'input_sha256': file_sha256(input_path),
+        'output': str(output_path) if output_path is not None else None,
+        # Only comparable across runs for deterministic PDFs (see generate_invoice)
+        'output_sha256': file_sha256(output_path) if output_exists else None,
+        'output_bytes': os.path.getsize(output_path) if output_exists else None,
+        'pages': pdf_page_count(output_path) if output_exists else None,
+        'seconds': round(seconds, 6) if seconds is not None else None,
+        'phases_ms': phase_milliseconds(spans),
+        'worker': worker,
+        'retries': retries,
+        'error_class': error_type,
+        'error': error_summary(error) if error is not None else None,
+    }
+    record.update(extra)
+    return record
+
+
+class RunReport:
+    """Appends job records to a JSON lines file, one object per line"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=str) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_report(path) -> List[Dict[str, Any]]:
+    """All records of a run report, skipping lines cut short by a crash"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
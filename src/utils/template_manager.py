@@ -6,22 +6,31 @@ Handles loading and applying different invoice templates
 
 import yaml
 import os
+import hashlib
+import json
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+try:
+    from .config import get_project_root
+except ImportError:
+    # Running as a standalone script
+    from config import get_project_root
+
 class TemplateManager:
     """Manages invoice templates and their styling configurations"""
     
     def __init__(self, config_path: str = None):
         """Initialize the template manager"""
         if config_path is None:
-            # Default to the templates directory
-            current_dir = Path(__file__).parent.parent.parent
-            config_path = current_dir / "assets" / "templates" / "template_configs.yaml"
+            # Default to the templates directory (also in frozen builds, where
+            # modules may be bundled as bytecode away from the source tree)
+            config_path = get_project_root() / "assets" / "templates" / "template_configs.yaml"
         
         self.config_path = Path(config_path)
         self.templates = {}
         self.current_template = "modern_blue"  # Default template
+        self.config_mtime = None
         self.load_templates()
     
     def load_templates(self) -> bool:
@@ -31,6 +40,7 @@ class TemplateManager:
                 print(f"Warning: Template config file not found at {self.config_path}")
                 return False
             
+            self.config_mtime = self.config_path.stat().st_mtime
             with open(self.config_path, 'r', encoding='utf-8') as file:
                 config = yaml.safe_load(file)
             
@@ -46,6 +56,22 @@ class TemplateManager:
             print(f"Error loading templates: {e}")
             return False
     
+    def reload_if_changed(self) -> bool:
+        """Reload the templates if template_configs.yaml changed on disk; returns True if reloaded"""
+        try:
+            mtime = self.config_path.stat().st_mtime
+        except OSError:
+            return False
+        if mtime == self.config_mtime:
+            return False
+        return self.load_templates()
+    
+    def get_template_hash(self, template_id: str) -> str:
+        """Stable hash of a template's configuration, used to key rendered previews"""
+        template = self.templates.get(template_id, {})
+        payload = json.dumps({'id': template_id, 'template': template}, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
     def get_available_templates(self) -> Dict[str, Dict[str, Any]]:
         """Get all available templates with their metadata"""
         return {
@@ -0,0 +1,121 @@
+"""
+Test batch PDF generation on a worker pool
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core import batch
+from core.batch import BatchJob, run_batch
+from core.number_allocator import InvoiceNumberAllocator
+from utils.template_manager import get_template_manager
+
+
+def write_invoices(directory, count):
+    data = get_template_manager().get_template_preview_data()
+    paths = []
+    for i in range(count):
+        data['invoice']['number'] = f"INV-{i:03d}"
+        path = directory / f"invoice_{i}.yaml"
+        path.write_text(yaml.safe_dump(data), encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def test_batch_generates_and_reports_status(tmp_path):
+    """Each job ends done or failed, and a bad file does not stop the batch"""
+    paths = write_invoices(tmp_path, 4)
+    broken = tmp_path / "broken.yaml"
+    broken.write_text("- not an invoice\n", encoding='utf-8')
+    jobs = [BatchJob(path) for path in paths] + [BatchJob(broken)]
+
+    updates = []
+    stats = run_batch(jobs, max_workers=2, use_processes=False,
+                      on_update=lambda job: updates.append((job.yaml_path, job.status)))
+
+    assert stats['done'] == 4 and stats['failed'] == 1
+    assert stats['per_second'] > 0
+    assert all(Path(job.output_pdf).stat().st_size > 0 for job in jobs[:4])
+    assert jobs[-1].status == 'failed' and jobs[-1].error
+    assert [status for _, status in updates].count('queued') == 5
+
+
+def test_failed_jobs_are_retried(tmp_path):
+    """A failing job is resubmitted up to the retry limit and keeps its error class"""
+    paths = write_invoices(tmp_path, 1)
+    broken = tmp_path / "broken.yaml"
+    broken.write_text("- not an invoice\n", encoding='utf-8')
+    jobs = [BatchJob(paths[0]), BatchJob(broken)]
+
+    stats = run_batch(jobs, max_workers=1, use_processes=False, retries=2)
+
+    assert stats['done'] == 1 and stats['failed'] == 1
+    assert jobs[0].retries == 0 and jobs[0].worker and jobs[0].client == 'Sample Client'
+    assert jobs[1].retries == 2 and jobs[1].error_type == 'ValueError'
+
+
+def test_batch_runs_in_worker_processes(tmp_path):
+    """The process pool renders invoices in spawned workers"""
+    jobs = [BatchJob(path, tmp_path / "pdf" / f"{path.stem}.pdf") for path in write_invoices(tmp_path, 2)]
+    stats = run_batch(jobs, max_workers=2)
+    assert stats['done'] == 2
+    assert all(Path(job.output_pdf).exists() for job in jobs)
+
+
+def test_failed_worker_jobs_keep_their_details(tmp_path):
+    """A failure in a worker process reports its worker, time and underlying error class"""
+    data = get_template_manager().get_template_preview_data()
+    del data['company']
+    path = tmp_path / "no_company.yaml"
+    path.write_text(yaml.safe_dump(data), encoding='utf-8')
+    jobs = [BatchJob(path)]
+
+    stats = run_batch(jobs, max_workers=1, collect_spans=True)
+
+    assert stats['failed'] == 1
+    job = jobs[0]
+    assert job.error_type == 'ValueError' and 'company' in job.error
+    assert job.worker and not job.worker.endswith(f":{os.getpid()}")
+    assert job.seconds > 0 and job.client == 'Sample Client'
+
+
+def test_cancel_stops_queueing(tmp_path):
+    """Cancelling marks every job that has not started as cancelled"""
+    jobs = [BatchJob(path) for path in write_invoices(tmp_path, 6)]
+    cancel_event = threading.Event()
+    cancel_event.set()
+    stats = run_batch(jobs, max_workers=1, use_processes=False, cancel_event=cancel_event)
+    assert stats['done'] + stats['cancelled'] == 6
+    assert stats['cancelled'] >= 4
+
+
+def test_unnumbered_invoices_get_unique_numbers(tmp_path, monkeypatch):
+    """Invoices without a number are numbered from the shared sequence and saved"""
+    paths = write_invoices(tmp_path, 6)
+    for path in paths[1:]:
+        data = yaml.safe_load(path.read_text(encoding='utf-8'))
+        data['invoice']['number'] = ''
+        data['invoice']['date'] = '2025-03-01'
+        path.write_text(yaml.safe_dump(data), encoding='utf-8')
+    allocator = InvoiceNumberAllocator(str(tmp_path / 'seq.db'), prefix="INV-",
+                                       number_format="{prefix}{date}{suffix}", store_path=None)
+    monkeypatch.setattr(batch, '_allocator', allocator)
+    jobs = [BatchJob(path) for path in paths]
+    for job in jobs:
+        job.assign_number = True
+
+    stats = run_batch(jobs, max_workers=3, use_processes=False)
+    allocator.close()
+
+    assert stats['done'] == 6
+    assert jobs[0].number is None
+    numbers = sorted(job.number for job in jobs[1:])
+    assert numbers == [f"INV-20250301-{i:03d}" for i in range(1, 6)]
+    saved = [yaml.safe_load(path.read_text(encoding='utf-8'))['invoice']['number'] for path in paths]
+    assert saved[0] == "INV-000" and sorted(saved[1:]) == numbers
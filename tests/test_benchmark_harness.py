@@ -0,0 +1,82 @@
+"""
+Test the benchmark history and baseline regression checks
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from harness import append_history, find_regressions
+
+
+def test_regressions_respect_tolerances_and_noise_floor():
+    """Only slowdowns beyond the tolerance and the absolute floor are flagged"""
+    baseline = {
+        'items/100': {'wall_seconds': 0.100, 'peak_bytes': 1_000_000},
+        'items/1': {'wall_seconds': 0.001},
+        'removed': {'wall_seconds': 1.0},
+    }
+    cases = {
+        'items/100': {'wall_seconds': 0.130, 'peak_bytes': 1_050_000},
+        'items/1': {'wall_seconds': 0.003},
+        'new': {'wall_seconds': 5.0},
+    }
+    regressions = find_regressions(cases, baseline, time_tolerance=0.15, memory_tolerance=0.10)
+    assert len(regressions) == 1 and regressions[0].startswith('items/100: wall time')
+
+    cases['items/100']['peak_bytes'] = 1_200_000
+    assert len(find_regressions(cases, baseline, time_tolerance=0.5)) == 1
+
+
+def test_history_keeps_newest_runs(tmp_path):
+    """The history file is a JSON list trimmed to the newest runs"""
+    path = tmp_path / "history.json"
+    for i in range(5):
+        append_history(path, {'run': i}, limit=3)
+    assert json.loads(path.read_text()) == [{'run': 2}, {'run': 3}, {'run': 4}]
+
+
+def test_accuracy_drops_are_regressions():
+    """Accuracy scores regress when they fall by more than the absolute tolerance"""
+    baseline = {'pdf_to_yaml': {'wall_seconds': 1.0, 'accuracy': {'items.recall': 0.80, 'overall.recall': 0.5}}}
+    cases = {'pdf_to_yaml': {'wall_seconds': 1.0, 'accuracy': {'items.recall': 0.70, 'overall.recall': 0.495}}}
+    regressions = find_regressions(cases, baseline, accuracy_tolerance=0.01)
+    assert regressions == ['pdf_to_yaml: items.recall 0.800 -> 0.700']
+
+
+def test_extraction_scoring_counts_wrong_values_as_misses():
+    """A wrong value is a false positive and a false negative; items match on name, quantity and rate"""
+    from bench_extraction import precision_recall, score_invoice
+
+    truth = {'invoice': {'number': 'INV-1', 'date': '2025-01-02'}, 'notes': 'Thanks',
+             'items': [{'name': 'Design', 'quantity': 2.0, 'rate': 50.0},
+                       {'name': 'Hosting', 'quantity': 1.0, 'rate': 9.99}]}
+    extracted = {'invoice': {'number': 'INV-1', 'date': '2025-09-09'},
+                 'items': [{'description': 'Design', 'quantity': 2, 'rate': 50.0},
+                           {'description': 'Support', 'quantity': 1.0, 'rate': 10.0}]}
+    counts = {}
+    score_invoice(truth, extracted, counts)
+    assert counts['invoice.number'] == [1, 0, 0]
+    assert counts['invoice.date'] == [0, 1, 1]
+    assert counts['notes'] == [0, 0, 1]
+    assert counts['company.name'] == [0, 0, 0]
+    assert counts['items'] == [1, 1, 1]
+
+    scores = precision_recall(counts)
+    assert scores['items'] == {'precision': 0.5, 'recall': 0.5}
+    assert scores['overall'] == {'precision': 2 / 4, 'recall': 2 / 5}
+
+
+def test_importtime_output_is_ranked_by_self_time():
+    """The slowest imports by self time come first, in milliseconds"""
+    from bench_startup import parse_importtime
+
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       150 |        150 |   _io\n"
+              "import time:      9000 |      12000 |     reportlab.platypus.paragraph\n"
+              "import time:      2500 |      21500 | core.invoice_generator\n")
+    top = parse_importtime(stderr, limit=2)
+    assert top == [{'module': 'reportlab.platypus.paragraph', 'self_ms': 9.0, 'cumulative_ms': 12.0},
+                   {'module': 'core.invoice_generator', 'self_ms': 2.5, 'cumulative_ms': 21.5}]
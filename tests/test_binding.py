@@ -0,0 +1,81 @@
+"""
+Test the GUI form binding layer with dirty tracking
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gui.utils.binding import FormBinding, SectionCache
+
+
+class FakeField:
+    """Stands in for a Tk variable so the binding logic runs without a display"""
+
+    def __init__(self, value=''):
+        self.value = value
+        self.sets = 0
+        self.callbacks = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        self.sets += 1
+        for callback in self.callbacks:
+            callback()
+
+    def watch(self, callback):
+        self.callbacks.append(callback)
+
+    def type(self, value):
+        """Simulate a user edit"""
+        self.set(value)
+
+
+def test_only_dirty_fields_are_synchronized():
+    """collect copies edited fields only; load skips fields already showing the value"""
+    changes = []
+    form = FormBinding(on_change=changes.append)
+    name, city, tax = FakeField(), FakeField(), FakeField()
+    form.bind(('client', 'name'), name)
+    form.bind(('client', 'city'), city)
+    form.bind(('tax_rate',), tax, to_data=lambda v: float(v) / 100, from_data=lambda v: f"{v * 100:g}")
+
+    data = {'client': {'name': 'Acme', 'city': 'Paris'}, 'tax_rate': 0.08}
+    form.load(data)
+    assert (name.value, city.value, tax.value) == ('Acme', 'Paris', '8')
+    assert not form.dirty and not changes
+
+    name.type('Globex')
+    assert form.dirty == {('client', 'name')}
+    assert changes == [('client', 'name')]
+    assert form.collect(data) == {'client'}
+    assert data['client'] == {'name': 'Globex', 'city': 'Paris'}
+    assert not form.dirty
+
+    # Re-typing the same value is not a data change
+    city.type('Paris')
+    assert form.collect(data) == set()
+
+    sets_before = (name.sets, city.sets, tax.sets)
+    form.load(data)
+    assert (name.sets, city.sets, tax.sets) == sets_before
+
+
+def test_section_cache_rebuilds_only_stale_sections():
+    """Sections are rebuilt only when a data section they depend on changed"""
+    builds = []
+    cache = SectionCache({'client': ['client'], 'totals': ['items', 'tax_rate']})
+
+    def build(name):
+        return lambda: builds.append(name) or name.upper()
+
+    assert cache.get('client', build('client')) == 'CLIENT'
+    cache.get('totals', build('totals'))
+    cache.invalidate({'tax_rate'})
+    cache.get('client', build('client'))
+    cache.get('totals', build('totals'))
+    assert builds == ['client', 'totals', 'totals']
@@ -0,0 +1,41 @@
+"""
+Test digital/scanned PDF classification in scripts/check_pdf_type.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from gui.utils.pdf_preview import PYMUPDF_AVAILABLE
+
+
+@pytest.mark.skipif(not PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
+def test_digital_invoice_and_scanned_copy_are_told_apart(tmp_path):
+    """A rendered invoice is digital; the same invoice as page images is scanned"""
+    from bench_pdf_type import load_checker, rasterize
+    from core.invoice_generator import generate_invoice
+    from utils.template_manager import get_template_manager
+
+    checker = load_checker()
+    digital = tmp_path / "invoice.pdf"
+    scanned = tmp_path / "invoice_scanned.pdf"
+    data = get_template_manager().get_template_preview_data()
+    data['items'] = data['items'] * 8
+    generate_invoice(data, str(digital), 'modern_blue')
+    rasterize(digital, scanned)
+
+    def detect(path):
+        return checker.CheckPdfTypeProcessor(checker.CheckPdfTypeOptions(str(path))).process()
+
+    assert detect(digital) == checker.CheckPdfTypeProcessor.PdfType.DIGITAL
+    assert detect(scanned) == checker.CheckPdfTypeProcessor.PdfType.SCANNED
+
+    processor = checker.CheckPdfTypeProcessor(checker.CheckPdfTypeOptions(str(tmp_path / "notes.txt")))
+    with pytest.raises(ValueError):
+        processor.process()
+    assert processor.is_junk_text("(cid:12)" * 30)
+    assert processor.text_score("") == 0.0
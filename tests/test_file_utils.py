@@ -0,0 +1,78 @@
+"""
+Test atomic YAML writes and the coalescing background writer
+"""
+
+import os
+import stat
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.line_items import LineItems
+from utils.file_utils import CoalescingWriter, read_yaml, write_yaml_atomic
+
+
+def test_atomic_write_round_trip(tmp_path):
+    """Invoices with LineItems are written atomically and read back unchanged"""
+    path = tmp_path / "invoice.yaml"
+    items = [{'name': 'Work', 'description': '', 'quantity': 2.0, 'rate': 50.0}]
+    write_yaml_atomic(path, {'invoice': {'number': 'INV-1'}, 'items': LineItems(items)})
+    assert read_yaml(path) == {'invoice': {'number': 'INV-1'}, 'items': items}
+    assert [p.name for p in tmp_path.iterdir()] == ["invoice.yaml"]
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="POSIX permission bits")
+def test_atomic_write_keeps_permissions(tmp_path):
+    """Saving keeps the replaced file's mode; new files follow the umask, not mkstemp's 0600"""
+    path = tmp_path / "invoice.yaml"
+    path.write_text("old: 1\n", encoding='utf-8')
+    os.chmod(path, 0o644)
+    write_yaml_atomic(path, {'new': 1})
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+    os.chmod(path, 0o640)
+    write_yaml_atomic(path, {'new': 2})
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+    umask = os.umask(0o022)
+    os.umask(umask)
+    created = tmp_path / "new.yaml"
+    write_yaml_atomic(created, {'new': 3})
+    assert stat.S_IMODE(created.stat().st_mode) == 0o666 & ~umask
+
+
+def test_failed_write_keeps_original(tmp_path):
+    """A write that fails part-way leaves the previous file and no temp files"""
+    path = tmp_path / "invoice.yaml"
+    write_yaml_atomic(path, {'version': 1})
+    try:
+        write_yaml_atomic(path, {'bad': object()})
+    except Exception:
+        pass
+    assert read_yaml(path) == {'version': 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["invoice.yaml"]
+
+
+def test_rapid_saves_coalesce(tmp_path):
+    """Saves queued while a write is running collapse into one write of the newest data"""
+    release = threading.Event()
+    writes = []
+
+    def slow_write(path, data):
+        release.wait(5)
+        writes.append(data)
+        write_yaml_atomic(path, data)
+
+    writer = CoalescingWriter(slow_write)
+    path = tmp_path / "invoice.yaml"
+    futures = [writer.submit(path, {'version': n}) for n in range(10)]
+    release.set()
+    assert writer.flush(timeout=5)
+    assert all(future.result(timeout=5) == str(path) for future in futures)
+    assert len(writes) <= 2
+    assert writes[-1] == {'version': 9}
+    assert read_yaml(path) == {'version': 9}
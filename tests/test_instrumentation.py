@@ -0,0 +1,73 @@
+"""
+Test timing spans, sinks and the generate_invoice phase instrumentation
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils import instrumentation
+from utils.instrumentation import (JsonLinesSink, MemorySink, collecting, percentile, phases, span)
+
+
+def test_disabled_spans_are_shared_no_ops():
+    """Without sinks, span() and phases() hand back the same do-nothing objects"""
+    assert not instrumentation.enabled()
+    assert span('a') is span('b')
+    assert phases('x') is phases('y')
+    with span('a'):
+        pass
+    phases('x').close()
+
+
+def test_phases_and_spans_reach_sinks(tmp_path):
+    """Phase spans are named <operation>.<phase> and the operation span covers them all"""
+    memory = MemorySink()
+    jsonl = JsonLinesSink(tmp_path / "spans.jsonl")
+    with collecting(memory, jsonl):
+        timing = phases('convert', source='test')
+        timing.enter('read')
+        timing.enter('parse')
+        timing.close()
+        timing.close()
+        with span('write'):
+            pass
+    jsonl.close()
+
+    assert sorted(memory.samples) == ['convert', 'convert.parse', 'convert.read', 'write']
+    assert memory.samples['convert'][0] >= memory.samples['convert.read'][0]
+    records = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    assert [r['name'] for r in records] == ['convert.read', 'convert.parse', 'convert', 'write']
+    assert records[0]['source'] == 'test'
+    assert not instrumentation.enabled()
+
+
+def test_summary_percentiles_and_thread_filter():
+    """Summaries use nearest-rank percentiles; thread-scoped sinks ignore other threads"""
+    values = [i / 100 for i in range(1, 101)]
+    assert (percentile(values, 0.5), percentile(values, 0.95), percentile(values, 0.99)) == (0.5, 0.95, 0.99)
+
+    sink = MemorySink(current_thread_only=True)
+    with collecting(sink):
+        instrumentation.emit('mine', 1.0)
+        other = threading.Thread(target=instrumentation.emit, args=('theirs', 1.0))
+        other.start()
+        other.join()
+    summary = sink.summary()
+    assert list(summary) == ['mine'] and summary['mine']['p99'] == 1.0
+
+
+def test_generate_invoice_reports_each_phase(tmp_path):
+    """generate_invoice emits a span per phase plus one for the whole call"""
+    from core.invoice_generator import generate_invoice
+    from utils.template_manager import get_template_manager
+
+    data = get_template_manager().get_template_preview_data()
+    with collecting(MemorySink()) as sink:
+        generate_invoice(data, str(tmp_path / "invoice.pdf"))
+    for phase in ('validate', 'styles', 'logo', 'items_table', 'build'):
+        assert f"generate_invoice.{phase}" in sink.samples
+    assert len(sink.samples['generate_invoice']) == 1
@@ -0,0 +1,78 @@
+"""
+Test PDF generation through generate_invoice
+"""
+
+import hashlib
+import io
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.invoice_generator import generate_invoice, GenerationCancelled
+from core.totals import compute_totals
+from utils.template_manager import get_template_manager
+
+
+def sample_data(item_count=1):
+    data = get_template_manager().get_template_preview_data()
+    data['items'] = data['items'] * item_count
+    return data
+
+
+def test_progress_is_reported(tmp_path):
+    """Progress runs from 0 to 1 while the invoice renders"""
+    fractions = []
+    output = tmp_path / 'invoice.pdf'
+    generate_invoice(sample_data(50), str(output), progress=lambda f, m: fractions.append(f))
+    assert output.stat().st_size > 0
+    assert fractions[0] == 0.0 and fractions[-1] == 1.0
+    assert fractions == sorted(fractions)
+
+
+def test_cancel_stops_generation(tmp_path):
+    """Setting the cancel event stops rendering without writing a PDF"""
+    cancel_event = threading.Event()
+
+    def progress(fraction, message):
+        if fraction >= 0.4:
+            cancel_event.set()
+
+    output = tmp_path / 'invoice.pdf'
+    with pytest.raises(GenerationCancelled):
+        generate_invoice(sample_data(500), str(output), progress=progress, cancel_event=cancel_event)
+    assert not output.exists()
+
+
+def test_deterministic_output_is_reproducible(tmp_path):
+    """The same invoice renders to identical bytes, whatever the output path"""
+    first, second = tmp_path / 'first.pdf', tmp_path / 'nested' / 'second.pdf'
+    second.parent.mkdir()
+    generate_invoice(sample_data(3), str(first), deterministic=True)
+    generate_invoice(sample_data(3), str(second), deterministic=True)
+    buffer = io.BytesIO()
+    generate_invoice(sample_data(3), buffer, deterministic=True)
+
+    digest = hashlib.sha256(first.read_bytes()).hexdigest()
+    assert hashlib.sha256(second.read_bytes()).hexdigest() == digest
+    assert hashlib.sha256(buffer.getvalue()).hexdigest() == digest
+    # Fixed timestamps instead of the time of rendering
+    assert b"/CreationDate (D:20000101000000" in first.read_bytes()
+
+
+def test_stale_totals_are_recomputed():
+    """Totals computed from other item values or another tax rate are not reused"""
+    data = sample_data(3)
+    edited = [dict(item, rate=item['rate'] + 1) for item in data['items']]
+    stale = [compute_totals(edited, data['tax_rate']), compute_totals(data['items'], 0.5)]
+    assert not any(totals.matches(data['items'], data['tax_rate']) for totals in stale)
+
+    expected = io.BytesIO()
+    generate_invoice(data, expected, deterministic=True)
+    for totals in stale:
+        buffer = io.BytesIO()
+        generate_invoice(data, buffer, totals=totals, deterministic=True)
+        assert buffer.getvalue() == expected.getvalue()
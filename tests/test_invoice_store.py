@@ -0,0 +1,103 @@
+"""
+Test the SQLite invoice store
+"""
+
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.invoice_store import InvoiceStore, iso_date
+
+
+def write_invoice(directory, number, client, date, due_date):
+    data = {
+        'invoice': {'number': number, 'date': date, 'due_date': due_date, 'month': 'January'},
+        'company': {'name': 'Sample Company'},
+        'client': {'name': client},
+        'items': [{'name': 'Service', 'quantity': 2, 'rate': 50.25}],
+        'tax_rate': 0.1,
+    }
+    path = Path(directory) / f"{number}.yaml"
+    path.write_text(yaml.safe_dump(data))
+    return path
+
+
+def test_import_and_query(tmp_path):
+    """Invoices are imported from a folder and found by client, number and date"""
+    write_invoice(tmp_path, 'INV-001', 'Astera Software', '2025-01-10', '2025-02-10')
+    write_invoice(tmp_path, 'INV-002', 'Astera Software', '2025-03-05', '2025-04-05')
+    write_invoice(tmp_path, 'INV-003', 'Other Client', '2025-03-20', '2025-04-20')
+    (tmp_path / 'INV-002.pdf').write_bytes(b'%PDF-1.4')
+    (tmp_path / 'notes.yaml').write_text('just: notes')
+
+    with InvoiceStore(str(tmp_path / 'invoices.db')) as store:
+        stats = store.import_directory(str(tmp_path))
+        assert stats['imported'] == 3
+        assert stats['skipped'] == 1
+
+        astera = list(store.iter_invoices(client='astera'))
+        assert [row['number'] for row in astera] == ['INV-001', 'INV-002']
+        assert astera[1]['pdf_path'].endswith('INV-002.pdf')
+        assert astera[0]['total_cents'] == 11055
+
+        march = list(store.iter_invoices(date_from='2025-03-01', date_to='2025-03-31'))
+        assert {row['number'] for row in march} == {'INV-002', 'INV-003'}
+
+        record = store.get_by_number('INV-003')
+        assert store.load_invoice(record)['client']['name'] == 'Other Client'
+
+
+def test_reimport_only_processes_changed_files(tmp_path):
+    """A second import skips files that have not changed"""
+    write_invoice(tmp_path, 'INV-001', 'Astera Software', '2025-01-10', '2025-02-10')
+    with InvoiceStore(str(tmp_path / 'invoices.db')) as store:
+        store.import_directory(str(tmp_path))
+        write_invoice(tmp_path, 'INV-002', 'Astera Software', '2025-01-11', '2025-02-11')
+        stats = store.import_directory(str(tmp_path))
+        assert stats['imported'] == 1
+        assert stats['unchanged'] == 1
+        assert store.count() == 2
+
+
+def test_dates_are_stored_as_iso(tmp_path):
+    """Date objects and other spellings are stored as YYYY-MM-DD so range filters work"""
+    assert [iso_date(value) for value in (date(2025, 1, 10), '10/01/2025', 'January 10, 2025',
+                                          '2025-01-10', 'on receipt', '30', None)] == [
+        '2025-01-10', '2025-01-10', '2025-01-10', '2025-01-10', 'on receipt', '30', '']
+
+    write_invoice(tmp_path, 'INV-001', 'Astera Software', '10 Jan 2025', '09/02/2025')
+    with InvoiceStore(str(tmp_path / 'invoices.db')) as store:
+        store.import_directory(str(tmp_path))
+        [row] = store.iter_invoices(date_from='2025-01-01', date_to='2025-01-31')
+        assert (row['date'], row['due_date']) == ('2025-01-10', '2025-02-09')
+
+
+def test_client_search_uses_index(tmp_path):
+    """The case-insensitive client prefix search is answered from the client index"""
+    with InvoiceStore(str(tmp_path / 'invoices.db')) as store:
+        plan = store.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM invoices WHERE client LIKE ? ESCAPE '\\'",
+            ('astera%',)).fetchall()
+        assert 'idx_invoices_client_nocase' in ' '.join(row['detail'] for row in plan)
+
+
+def test_old_databases_are_reindexed(tmp_path):
+    """Rows stored before dates were normalised are re-read by the next import"""
+    write_invoice(tmp_path, 'INV-001', 'Astera Software', '10 Jan 2025', '09/02/2025')
+    db_path = tmp_path / 'invoices.db'
+    with InvoiceStore(str(db_path)) as store:
+        store.import_directory(str(tmp_path))
+    connection = sqlite3.connect(db_path)
+    connection.execute("UPDATE invoices SET date = '10 Jan 2025'")
+    connection.execute("PRAGMA user_version = 1")
+    connection.commit()
+    connection.close()
+
+    with InvoiceStore(str(db_path)) as store:
+        assert store.import_directory(str(tmp_path))['imported'] == 1
+        assert store.get_by_number('INV-001')['date'] == '2025-01-10'
@@ -0,0 +1,80 @@
+"""
+Test bulk line-item import from CSV files and pasted spreadsheet text
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.item_import import ItemImportError, import_item_file, import_pasted_items, parse_number
+
+
+def test_csv_with_header_aliases_and_bad_rows(tmp_path):
+    """Header aliases map to item fields; invalid rows are reported, not fatal"""
+    path = tmp_path / "items.csv"
+    path.write_text(
+        "Task,Details,Hrs,Hourly Rate\n"
+        "Design,Mockups,2.5,\"$1,200.00\"\n"
+        "\n"
+        "Review,,one,80\n"
+        ",Missing name,1,80\n"
+        "Build,API,4,95\n",
+        encoding='utf-8-sig')
+
+    result = import_item_file(path)
+
+    assert result.rows == 4
+    assert result.items.to_dicts() == [
+        {'name': 'Design', 'description': 'Mockups', 'quantity': 2.5, 'rate': 1200.0},
+        {'name': 'Build', 'description': 'API', 'quantity': 4.0, 'rate': 95.0},
+    ]
+    assert result.errors == [(4, "invalid quantity 'one'"), (5, "missing item name")]
+
+
+def test_pasted_rows_without_header_use_positional_columns():
+    """Tab-separated rows copied from a spreadsheet import without a header row"""
+    text = "Consulting\t3\t85.5\nSupport\t1\t(20)\n"
+    result = import_pasted_items(text)
+    assert [(item['name'], item['quantity'], item['rate']) for item in result.items] == [
+        ('Consulting', 3.0, 85.5), ('Support', 1.0, -20.0)]
+    assert result.items.subtotal() == Decimal('236.50')
+
+
+def test_unrecognised_columns_are_rejected():
+    """Rows whose columns cannot be identified raise ItemImportError"""
+    with pytest.raises(ItemImportError):
+        import_pasted_items("a,b\nc,d\n")
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1,5", 1.5), ("12,50", 12.5), ("€1.234,56", 1234.56), ("$1,200.00", 1200.0),
+    ("1,200", 1200.0), ("(2,5)", -2.5),
+])
+def test_decimal_and_thousands_commas(text, expected):
+    """A lone comma before 1-2 digits is a decimal separator; groups of three are thousands"""
+    assert parse_number(text) == expected
+
+
+def test_ambiguous_commas_are_rejected():
+    """Commas that are neither thousands groups nor a decimal separator make the row invalid"""
+    with pytest.raises(ValueError):
+        parse_number("1,2345")
+    result = import_pasted_items("Name;Quantity;Rate\nDesign;1,5;80\nReview;12,34,5;80\n")
+    assert [(item['name'], item['quantity']) for item in result.items] == [('Design', 1.5)]
+    assert result.errors == [(3, "invalid quantity '12,34,5'")]
+
+
+def test_large_paste_is_chunked():
+    """A 10k-row timesheet imports in chunks, reporting progress per chunk"""
+    lines = ["Name\tDescription\tQuantity\tRate"]
+    lines += [f"Dev {i % 50}\tSprint work\t{i % 8 + 1}\t85.50" for i in range(10000)]
+    reported = []
+
+    result = import_pasted_items("\n".join(lines), chunk_size=2500, progress=reported.append)
+
+    assert len(result.items) == 10000 and not result.errors
+    assert reported == [2500, 5000, 7500, 10000, 10000]
@@ -0,0 +1,79 @@
+"""
+Test the columnar LineItems container
+"""
+
+import sys
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.line_items import LineItems
+from core.totals import compute_totals
+
+
+def make_items(count):
+    return [
+        {'name': 'Consulting', 'description': 'Development hours', 'unit': 'hour',
+         'quantity': float(i % 8 + 1), 'rate': 85.5}
+        for i in range(count)
+    ]
+
+
+def test_round_trip_and_yaml_dump():
+    """LineItems converts back to the YAML dict form and dumps as a plain list"""
+    items = make_items(3)
+    line_items = LineItems.from_dicts(items)
+    assert len(line_items) == 3
+    assert line_items.to_dicts() == items
+    assert line_items[1] == items[1]
+    assert yaml.safe_load(yaml.safe_dump({'items': line_items})) == {'items': items}
+
+
+def test_round_trip_keeps_numbers_and_extra_keys():
+    """Integer numbers stay ints, absent keys stay absent and unknown keys survive"""
+    items = [
+        {'name': 'Hosting', 'quantity': 3, 'rate': 20},
+        {'name': 'Design', 'description': '', 'unit': 'hour', 'quantity': 2.5, 'rate': 80,
+         'sku': 'D-1', 'tags': ['web']},
+        {'name': 'Support', 'description': None, 'quantity': 1, 'rate': 49.99, 'taxable': False},
+    ]
+    line_items = LineItems.from_dicts(items)
+    assert line_items.to_dicts() == items
+    assert [type(item['quantity']) for item in line_items] == [int, float, int]
+    assert line_items.copy().to_dicts() == items
+
+    del line_items[0]
+    line_items[0] = {'name': 'Design', 'quantity': 4, 'rate': 80, 'sku': 'D-2'}
+    assert line_items.to_dicts() == [{'name': 'Design', 'quantity': 4, 'rate': 80, 'sku': 'D-2'}, items[2]]
+
+
+def test_mutation_keeps_amounts_in_sync():
+    """Appending, replacing and deleting rows keeps the amount column exact"""
+    line_items = LineItems.from_dicts(make_items(2))
+    line_items.append({'name': 'Extra', 'quantity': 3, 'rate': 0.1})
+    line_items[0] = {'name': 'Fixed', 'quantity': 1, 'rate': 10}
+    del line_items[1]
+    assert [row[0] for row in line_items.rows()] == ['Fixed', 'Extra']
+    assert line_items.subtotal() == Decimal('10.30')
+    assert compute_totals(line_items, 0.1).total == Decimal('11.33')
+
+
+def test_memory_is_an_order_of_magnitude_smaller():
+    """The columnar form uses a tenth of the memory of YAML-loaded dicts"""
+    count = 5000
+    text = yaml.safe_dump(make_items(count))
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    as_dicts = yaml.load(text, Loader=loader)
+    dict_bytes = tracemalloc.get_traced_memory()[0] - before
+    before = tracemalloc.get_traced_memory()[0]
+    as_columns = LineItems(as_dicts)
+    column_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert len(as_columns) == count
+    assert column_bytes * 10 < dict_bytes
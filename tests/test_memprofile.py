@@ -0,0 +1,43 @@
+"""
+Test per-phase tracemalloc profiling of invoice generation
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.invoice_generator import generate_invoice
+from utils import instrumentation
+from utils.memprofile import MemoryProfiler
+from utils.template_manager import get_template_manager
+
+
+def test_profile_records_phases_and_peak(tmp_path):
+    """Each generate_invoice phase gets net/peak bytes and allocation sites; the report is stable text"""
+    data = get_template_manager().get_template_preview_data()
+    data['items'] = data['items'] * 50
+    profiler = MemoryProfiler(top=3)
+
+    with profiler.profile('large.yaml'):
+        generate_invoice(data, str(tmp_path / "large.pdf"), 'modern_blue')
+
+    assert not tracemalloc.is_tracing()
+    assert not instrumentation.enabled()
+    invoice, = profiler.invoices
+    names = [phase.name for phase in invoice.phases]
+    assert names[0] == 'generate_invoice.template_lookup'
+    assert names[-1] == 'generate_invoice.build'
+    assert invoice.peak_bytes >= max(phase.peak_bytes for phase in invoice.phases) > 0
+    build = invoice.phases[-1]
+    assert 0 < len(build.top) <= 3
+    assert all(':' in site['site'] and not site['site'].startswith('/') for site in build.top)
+
+    report_path = tmp_path / "memory.txt"
+    profiler.write(report_path)
+    report = report_path.read_text(encoding='utf-8')
+    assert "## large.yaml" in report
+    assert "generate_invoice.items_table" in report
+    assert "largest peak:" in report
+    assert str(tmp_path) not in report
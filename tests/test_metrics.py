@@ -0,0 +1,104 @@
+"""
+Test the metrics registry, multi-process merging and the HTTP endpoint
+"""
+
+import io
+import json
+import os
+import sys
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils import metrics
+from utils.metrics import (JsonDumper, MetricsRegistry, MetricsServer, merge_snapshots, render_all,
+                           render_prometheus)
+
+
+def make_registry():
+    registry = MetricsRegistry()
+    registry.counter('jobs_total', 'Jobs').inc(2, status='done')
+    registry.gauge('queue_depth', 'Depth').set(3)
+    latency = registry.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    return registry
+
+
+def test_prometheus_text_has_cumulative_buckets():
+    """Histograms are exposed with cumulative le buckets, sum and count"""
+    text = render_prometheus(merge_snapshots([make_registry().snapshot()]))
+    assert '# TYPE jobs_total counter' in text
+    assert 'jobs_total{status="done"} 2' in text
+    assert f'queue_depth{{pid="{os.getpid()}"}} 3' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert 'latency_seconds_sum 5.55' in text
+    assert 'latency_seconds_count 3' in text
+
+
+def test_worker_snapshots_are_merged(tmp_path):
+    """Snapshots dumped by other processes are summed into the endpoint output"""
+    worker = make_registry()
+    dumper = JsonDumper(tmp_path / "metrics-99999.json", registry=worker)
+    dumper.dump()
+    assert json.loads((tmp_path / "metrics-99999.json").read_text())['metrics']['jobs_total']
+
+    text = render_all(make_registry(), directory=tmp_path)
+    assert 'jobs_total{status="done"} 4' in text
+    assert 'latency_seconds_count 6' in text
+
+
+def test_gauges_are_not_summed_across_processes(tmp_path):
+    """Each process's gauges keep their own value under a pid label"""
+    worker = make_registry().snapshot()
+    worker['pid'] = 99999
+    (tmp_path / "metrics-99999.json").write_text(json.dumps(worker))
+
+    text = render_all(make_registry(), directory=tmp_path)
+    assert 'queue_depth{pid="99999"} 3' in text
+    assert f'queue_depth{{pid="{os.getpid()}"}} 3' in text
+
+
+def test_json_dump_merges_worker_snapshots(tmp_path):
+    """With a shared directory the JSON dump holds the merged view, not just this process"""
+    workers = tmp_path / "workers"
+    workers.mkdir()
+    worker = make_registry().snapshot()
+    worker['pid'] = 99999
+    (workers / "metrics-99999.json").write_text(json.dumps(worker))
+    JsonDumper(tmp_path / "merged.json", registry=MetricsRegistry(), directory=workers).dump()
+
+    dumped = json.loads((tmp_path / "merged.json").read_text())['metrics']
+    assert dumped['jobs_total']['values'] == [{'labels': {'status': 'done'}, 'value': 2}]
+    assert dumped['latency_seconds']['values'][0]['value']['count'] == 3
+    assert dumped['latency_seconds']['buckets'] == [0.1, 1.0]
+    assert dumped['queue_depth']['values'] == [{'labels': {'pid': '99999'}, 'value': 3}]
+
+
+def test_http_endpoint_serves_metrics():
+    """The local endpoint returns Prometheus text at /metrics"""
+    server = MetricsServer(port=0, registry=make_registry()).start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            assert 'jobs_total{status="done"} 2' in response.read().decode('utf-8')
+    finally:
+        server.stop()
+
+
+def test_generate_invoice_records_render_metrics():
+    """Rendering counts the invoice, its latency and the bytes produced"""
+    from core.invoice_generator import generate_invoice
+    from utils.template_manager import get_template_manager
+
+    rendered = metrics.INVOICES_RENDERED.value(template='classic_black')
+    written = metrics.PDF_BYTES_WRITTEN.value()
+    buffer = io.BytesIO()
+    generate_invoice(get_template_manager().get_template_preview_data(), buffer, 'classic_black')
+
+    assert metrics.INVOICES_RENDERED.value(template='classic_black') == rendered + 1
+    assert metrics.RENDER_SECONDS.count(template='classic_black') >= 1
+    assert metrics.PDF_BYTES_WRITTEN.value() == written + len(buffer.getvalue())
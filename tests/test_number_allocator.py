@@ -0,0 +1,72 @@
+"""
+Test the invoice number allocator
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.invoice_store import InvoiceStore
+from core.number_allocator import InvoiceNumberAllocator, default_sequence_db
+
+
+def allocate_in_process(db_path, count):
+    with InvoiceNumberAllocator(db_path, prefix="INV-", number_format="{prefix}{date}{suffix}",
+                                block_size=50) as allocator:
+        return allocator.allocate(count, date(2025, 1, 15))
+
+
+def test_numbers_follow_configured_format(tmp_path):
+    """Numbers use the prefix/format and count up per date"""
+    with InvoiceNumberAllocator(str(tmp_path / 'seq.db'), prefix="INV-",
+                                number_format="{prefix}{date}{suffix}") as allocator:
+        assert allocator.next_number(date(2025, 1, 15)) == "INV-20250115-001"
+        assert allocator.next_number(date(2025, 1, 15)) == "INV-20250115-002"
+        assert allocator.next_number(date(2025, 1, 16)) == "INV-20250116-001"
+
+    with InvoiceNumberAllocator(str(tmp_path / 'seq.db'), prefix="ACME/",
+                                number_format="{prefix}{seq:05d}") as allocator:
+        assert allocator.allocate(2) == ["ACME/00001", "ACME/00002"]
+
+
+def test_new_counters_start_after_stored_invoices(tmp_path):
+    """A lost sequence database doesn't reissue numbers already in the invoice store"""
+    store_path = str(tmp_path / 'invoices.db')
+    with InvoiceStore(store_path) as store:
+        for number in ("INV-20250115-001", "INV-20250115-007", "INV-20250116-002", "OTHER-20250115-050"):
+            store.add_invoice({'invoice': {'number': number, 'date': '2025-01-15'}, 'client': {'name': 'Acme'},
+                               'items': [], 'tax_rate': 0}, str(tmp_path / f"{number}.yaml"))
+
+    with InvoiceNumberAllocator(str(tmp_path / 'seq.db'), prefix="INV-", number_format="{prefix}{date}{suffix}",
+                                store_path=store_path) as allocator:
+        assert allocator.next_number(date(2025, 1, 15)) == "INV-20250115-008"
+        assert allocator.next_number(date(2025, 1, 16)) == "INV-20250116-003"
+        assert allocator.next_number(date(2025, 1, 17)) == "INV-20250117-001"
+
+
+def test_default_database_ignores_working_directory(tmp_path, monkeypatch):
+    """The sequence database is found from any working directory"""
+    expected = default_sequence_db()
+    monkeypatch.chdir(tmp_path)
+    assert Path(expected).is_absolute() and default_sequence_db() == expected
+
+
+def test_concurrent_allocation_is_unique(tmp_path):
+    """Threads and processes sharing one database never get the same number"""
+    db_path = str(tmp_path / 'seq.db')
+    with InvoiceNumberAllocator(db_path, prefix="INV-", number_format="{prefix}{date}{suffix}",
+                                block_size=25) as allocator:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            thread_numbers = [n for batch in pool.map(lambda _: allocator.allocate(40, date(2025, 1, 15)), range(8))
+                              for n in batch]
+
+    with ProcessPoolExecutor(max_workers=3) as pool:
+        process_numbers = [n for batch in pool.map(allocate_in_process, [db_path] * 3, [120] * 3)
+                           for n in batch]
+
+    numbers = thread_numbers + process_numbers
+    assert len(numbers) == 8 * 40 + 3 * 120
+    assert len(set(numbers)) == len(numbers)
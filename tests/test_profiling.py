@@ -0,0 +1,55 @@
+"""
+Test cProfile output, collapsed stacks and profile aggregation
+"""
+
+import pstats
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.profiling import aggregate_directory, new_run_directory, profile_name, profiled
+
+
+def leaf(n):
+    return sum(i * i for i in range(n))
+
+
+def branch(n):
+    return leaf(n) + leaf(n // 2)
+
+
+def test_profiles_are_written_and_aggregated(tmp_path):
+    """Each profiled block writes pstats and collapsed stacks; aggregation sums the calls"""
+    for index in range(2):
+        with profiled(tmp_path / profile_name(index, f"invoices/{index}.yaml")):
+            branch(20000)
+
+    assert (tmp_path / "0000-0.prof").exists()
+    merged_stats, merged_collapsed = aggregate_directory(tmp_path)
+    assert merged_stats.name == "aggregate.prof"
+
+    stats = pstats.Stats(str(merged_stats))
+    leaf_calls = [entry[1] for func, entry in stats.stats.items() if func[2] == 'leaf']
+    assert leaf_calls == [4]
+
+    lines = merged_collapsed.read_text(encoding='utf-8').splitlines()
+    assert lines
+    for line in lines:
+        stack, microseconds = line.rsplit(' ', 1)
+        assert int(microseconds) >= 1
+    leaf_stacks = [line for line in lines if 'branch (test_profiling.py' in line and ';leaf (' in line]
+    assert leaf_stacks
+
+
+def test_runs_are_aggregated_separately(tmp_path):
+    """Each run gets its own directory, so an aggregate ignores earlier runs' profiles"""
+    first, second = new_run_directory(tmp_path), new_run_directory(tmp_path)
+    assert first != second and first.parent == second.parent == tmp_path
+    for run in (first, second):
+        with profiled(run / profile_name(0, "invoice.yaml")):
+            branch(1000)
+
+    merged_stats, _ = aggregate_directory(second)
+    stats = pstats.Stats(str(merged_stats))
+    assert [entry[1] for func, entry in stats.stats.items() if func[2] == 'leaf'] == [2]
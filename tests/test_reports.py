@@ -0,0 +1,104 @@
+"""
+Test the aging and revenue reports
+"""
+
+import io
+import json
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.reports import CACHE_DIR, InvoiceLedger, aging_report, revenue_report, write_report
+
+
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    """Run from a scratch directory so the default report cache lands there"""
+    work = tmp_path / 'work'
+    work.mkdir()
+    monkeypatch.chdir(work)
+    return work
+
+
+def write_invoice(directory, number, client, date, due_date, rate, paid=False):
+    data = {
+        'invoice': {'number': number, 'date': date, 'due_date': due_date, 'paid': paid},
+        'client': {'name': client},
+        'items': [{'name': 'Service', 'quantity': 1, 'rate': rate}],
+        'tax_rate': 0.0,
+    }
+    (Path(directory) / f"{number}.yaml").write_text(yaml.safe_dump(data))
+
+
+def test_aging_and_revenue(tmp_path):
+    """Outstanding invoices land in the right bucket and revenue is grouped by month"""
+    write_invoice(tmp_path, 'INV-1', 'Acme', '2025-01-01', '2025-01-31', 100)
+    write_invoice(tmp_path, 'INV-2', 'Acme', '2025-01-15', '2025-03-20', 50.5)
+    write_invoice(tmp_path, 'INV-3', 'Beta', '2025-02-01', '2025-03-01', 75, paid=True)
+
+    ledger = InvoiceLedger()
+    ledger.scan(str(tmp_path))
+    aging = aging_report(ledger, as_of='2025-03-15')
+    assert aging == [{'client': 'Acme', 'current': Decimal('50.50'), '1-30': Decimal('0.00'),
+                      '31-60': Decimal('100.00'), '61-90': Decimal('0.00'), '90+': Decimal('0.00'),
+                      'unknown': Decimal('0.00'), 'total': Decimal('150.50')}]
+
+    revenue = revenue_report(ledger)
+    assert [(r['client'], r['month'], r['invoices'], r['revenue']) for r in revenue] == [
+        ('Acme', '2025-01', 2, Decimal('150.50')),
+        ('Beta', '2025-02', 1, Decimal('75.00')),
+    ]
+
+    output = io.StringIO()
+    write_report(revenue, output, 'csv')
+    assert output.getvalue().splitlines()[1] == 'Acme,2025-01,2,150.50'
+
+
+def test_unknown_due_dates_and_json_amounts(tmp_path):
+    """Unpaid invoices without a due date are aged as unknown and JSON keeps exact amounts"""
+    write_invoice(tmp_path, 'INV-1', 'Acme', '2025-01-01', 'on receipt', 0.1)
+    write_invoice(tmp_path, 'INV-2', 'Acme', '2025-01-02', '', 0.2)
+
+    ledger = InvoiceLedger()
+    ledger.scan(str(tmp_path))
+    row = aging_report(ledger, as_of='2025-03-15')[0]
+    assert (row['current'], row['unknown'], row['total']) == (Decimal('0.00'), Decimal('0.30'), Decimal('0.30'))
+
+    output = io.StringIO()
+    write_report([row], output, 'json')
+    written = json.loads(output.getvalue())[0]
+    assert (written['unknown'], written['total']) == ('0.30', '0.30')
+
+
+def test_rerun_only_parses_new_files(tmp_path):
+    """Cached facts are reused and only new invoices are parsed"""
+    write_invoice(tmp_path, 'INV-1', 'Acme', '2025-01-01', '2025-01-31', 100)
+    write_invoice(tmp_path, 'INV-2', 'Acme', '2025-01-15', '2025-02-14', 200)
+    assert InvoiceLedger().scan(str(tmp_path))['parsed'] == 2
+
+    write_invoice(tmp_path, 'INV-3', 'Acme', '2025-02-01', '2025-03-03', 300)
+    ledger = InvoiceLedger()
+    stats = ledger.scan(str(tmp_path))
+    assert (stats['parsed'], stats['cached']) == (1, 2)
+    assert revenue_report(ledger)[-1]['revenue'] == Decimal('300.00')
+
+
+def test_cache_stays_out_of_invoice_folder(tmp_path, work_dir):
+    """The default cache is written under output/temp, not next to the invoices"""
+    invoices = tmp_path / 'invoices'
+    invoices.mkdir()
+    write_invoice(invoices, 'INV-1', 'Acme', '2025-01-01', '2025-01-31', 100)
+    InvoiceLedger().scan(str(invoices))
+    assert [path.name for path in invoices.iterdir()] == ['INV-1.yaml']
+    assert len(list((work_dir / CACHE_DIR).glob('*.json'))) == 1
+
+
+def test_invalid_as_of_is_rejected(tmp_path):
+    """A malformed --as-of date fails with a readable message"""
+    with pytest.raises(ValueError, match='expected YYYY-MM-DD'):
+        aging_report(InvoiceLedger(), as_of='2025-13-01')
@@ -0,0 +1,63 @@
+"""
+Test per-job run report records
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.invoice_generator import generate_invoice
+from utils.run_report import RunReport, file_sha256, job_record, read_report, worker_id
+from utils.template_manager import get_template_manager
+
+
+def test_records_describe_outputs_and_failures(tmp_path):
+    """Done jobs record output size and pages; failures record the original error class"""
+    source = tmp_path / "invoice.yaml"
+    source.write_text("invoice: {}\n", encoding='utf-8')
+    output = tmp_path / "invoice.pdf"
+    generate_invoice(get_template_manager().get_template_preview_data(), str(output), 'modern_blue')
+
+    done = job_record('generate', source, output, 0.25, {'generate_invoice.build': [0.1, 0.05]},
+                      worker=worker_id(), template='modern_blue')
+    assert done['status'] == 'done'
+    assert done['input_sha256'] == file_sha256(source) and len(done['input_sha256']) == 64
+    assert done['output_bytes'] == output.stat().st_size and done['pages'] == 1
+    assert done['output_sha256'] == file_sha256(output)
+    assert done['phases_ms'] == {'generate_invoice.build': 150.0}
+    assert done['template'] == 'modern_blue' and done['error_class'] is None
+
+    try:
+        try:
+            raise KeyError('items')
+        except KeyError:
+            # pdf_to_yaml style: report, then exit
+            sys.exit(1)
+    except SystemExit as exc:
+        failed = job_record('convert', source, tmp_path / "missing.yaml", 0.01, None, exc, retries=1)
+    assert failed['status'] == 'failed' and failed['error_class'] == 'KeyError'
+    assert failed['output_bytes'] is None and failed['retries'] == 1 and failed['worker'] is None
+
+    report_path = tmp_path / "reports" / "runs.jsonl"
+    with RunReport(report_path) as report:
+        report.write(done)
+        report.write(failed)
+    with open(report_path, 'a', encoding='utf-8') as file:
+        file.write('{"truncated": ')
+    assert [record['status'] for record in read_report(report_path)] == ['done', 'failed']
+
+
+def test_generate_failure_records_underlying_error(tmp_path):
+    """generate_invoice's RuntimeError wrapper is unwrapped and its traceback left out"""
+    data = get_template_manager().get_template_preview_data()
+    del data['company']
+    source = tmp_path / "invoice.yaml"
+    source.write_text("invoice: {}\n", encoding='utf-8')
+    try:
+        generate_invoice(data, str(tmp_path / "invoice.pdf"))
+    except RuntimeError as exc:
+        assert '\n' in str(exc)
+        record = job_record('generate', source, tmp_path / "invoice.pdf", 0.01, None, exc, worker=worker_id())
+    assert record['error_class'] == 'ValueError'
+    assert 'company' in record['error'] and '\n' not in record['error']
@@ -0,0 +1,56 @@
+"""
+Test the cached template thumbnail gallery
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from gui.utils import template_gallery
+from gui.utils.pdf_preview import PYMUPDF_AVAILABLE
+from utils import template_manager as template_manager_module
+from utils.template_manager import TemplateManager
+
+CONFIG = Path(__file__).parent.parent / "assets" / "templates" / "template_configs.yaml"
+
+
+@pytest.mark.skipif(not PYMUPDF_AVAILABLE, reason="PyMuPDF not installed")
+def test_thumbnails_are_cached_and_invalidated(tmp_path, monkeypatch):
+    """Cached thumbnails are reused; editing a template re-renders only that template"""
+    config = tmp_path / "template_configs.yaml"
+    shutil.copy(CONFIG, config)
+    manager = TemplateManager(config)
+    monkeypatch.setattr(template_manager_module, 'get_template_manager', lambda: manager)
+
+    rendered = []
+    real_render = template_gallery.render_thumbnail
+
+    def counting_render(template_id, *args, **kwargs):
+        rendered.append(template_id)
+        return real_render(template_id, *args, **kwargs)
+
+    monkeypatch.setattr(template_gallery, 'render_thumbnail', counting_render)
+    cache = template_gallery.ThumbnailCache(tmp_path / "thumbnails")
+
+    first = template_gallery.load_thumbnails(cache)
+    assert sorted(rendered) == sorted(manager.templates)
+    assert all(png.startswith(b'\x89PNG') for png in first.values())
+
+    rendered.clear()
+    assert template_gallery.load_thumbnails(cache) == first
+    assert rendered == []
+
+    # Change one template's primary color on disk
+    text = config.read_text(encoding='utf-8')
+    config.write_text(text.replace('"#2c3e50"', '"#123456"', 1), encoding='utf-8')
+    stat = config.stat()
+    os.utime(config, (stat.st_atime, stat.st_mtime + 5))
+
+    template_gallery.load_thumbnails(cache)
+    assert rendered == ['modern_blue']
+    assert len(list((tmp_path / "thumbnails").glob('*.png'))) == len(manager.templates)
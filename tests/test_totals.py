@@ -0,0 +1,78 @@
+"""
+Test the Decimal totals engine
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core import totals as totals_module
+from core.totals import RunningTotals, amount_cents, compute_totals, line_amount, round_money
+
+
+def test_line_amount_rounds_half_up():
+    """Line amounts are rounded to cents with half-up rounding"""
+    assert line_amount(1, 0.125) == Decimal('0.13')
+    assert line_amount(3, 0.1) == Decimal('0.30')
+    assert line_amount(-1, 0.125) == Decimal('-0.13')
+    assert round_money('2.675') == Decimal('2.68')
+
+
+def test_totals_are_exact():
+    """Subtotal, tax and total avoid float drift"""
+    items = [{'quantity': 0.1, 'rate': 3}] * 10 + [{'quantity': 1, 'rate': 0.2}]
+    result = compute_totals(items, 0.08)
+    assert result.subtotal == Decimal('3.20')
+    assert result.tax == Decimal('0.26')
+    assert result.total == Decimal('3.46')
+    assert len(result.amounts) == 11
+
+
+def test_numpy_path_matches_decimal_path():
+    """The vectorized path gives the same amounts as the Decimal path"""
+    if not totals_module.NUMPY_AVAILABLE:
+        pytest.skip("NumPy not installed")
+    items = [{'quantity': (i % 37) / 8, 'rate': (i * 7919 % 100000) / 100} for i in range(5000)]
+    vectorized = compute_totals(items, 0.175, use_numpy=True)
+    exact = compute_totals(items, 0.175, use_numpy=False)
+    assert vectorized.amounts == exact.amounts
+    assert vectorized.total == exact.total
+
+
+def test_running_totals_match_full_recompute():
+    """Incremental add/replace/remove agrees with summing the items again"""
+    items = [{'quantity': (i % 7) / 4, 'rate': (i * 31 % 1000) / 100} for i in range(200)]
+    running = RunningTotals.from_items(items, 0.0825)
+
+    old = amount_cents(line_amount(items[10]['quantity'], items[10]['rate']))
+    items[10] = {'quantity': 3, 'rate': 19.99}
+    running.replace(old, amount_cents(line_amount(3, 19.99)))
+
+    removed = items.pop(50)
+    running.remove(amount_cents(line_amount(removed['quantity'], removed['rate'])))
+
+    items.append({'quantity': 0.5, 'rate': 0.05})
+    running.add(amount_cents(line_amount(0.5, 0.05)))
+
+    expected = compute_totals(items, 0.0825)
+    assert running.count == len(items)
+    assert (running.subtotal, running.tax, running.total) == (expected.subtotal, expected.tax, expected.total)
+
+
+def test_running_totals_draft_leaves_committed_totals_alone():
+    """A draft applies a pending edit to a copy of the running totals"""
+    items = [{'quantity': 2, 'rate': 10}, {'quantity': 1, 'rate': 5.5}]
+    running = RunningTotals.from_items(items, 0.1)
+
+    edited = running.draft(amount_cents(line_amount(1, 5.5)), amount_cents(line_amount(3, 5.5)))
+    assert edited.subtotal == compute_totals([items[0], {'quantity': 3, 'rate': 5.5}]).subtotal
+    assert edited.count == 2
+
+    added = running.draft(None, amount_cents(line_amount(1, 0.99)), tax_rate=0.2)
+    assert (added.count, added.subtotal, added.tax) == (3, Decimal('26.49'), Decimal('5.30'))
+
+    assert (running.count, running.subtotal, running.tax_rate) == (2, Decimal('25.50'), Decimal('0.1'))